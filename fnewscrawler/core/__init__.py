@@ -1,8 +1,24 @@
-from .browser import BrowserManager, browser_manager
-from .redis_manager import RedisManager, get_redis
-from .context import context_manager
-from .qr_login_base import QRLoginBase
-from .news_crawl import news_crawl_from_url
-from .tushare_data_provider import TushareDataProvider
-__all__ = ["BrowserManager", "RedisManager", "get_redis", "context_manager", "browser_manager", "news_crawl_from_url",
-           "QRLoginBase", "TushareDataProvider"]
+# 各子模块依赖较重（playwright、tushare、crawl4ai 等），访问对应名称时才导入
+from fnewscrawler.utils.lazy import lazy_package_getattr
+
+_LAZY_ATTRS = {
+    "BrowserManager": ".browser",
+    "browser_manager": ".browser",
+    "RedisManager": ".redis_manager",
+    "get_redis": ".redis_manager",
+    "context_manager": ".context",
+    "crawl_priority": ".crawl_scheduler",
+    "prefetch_scheduler": ".prefetch",
+    "QRLoginBase": ".qr_login_base",
+    "news_crawl_from_url": ".news_crawl",
+    "TushareDataProvider": ".tushare_data_provider",
+    "extract_table": ".table_extract",
+    "extract_main_content": ".content_extract",
+    "HttpClientManager": ".http_client",
+    "http_client_manager": ".http_client",
+}
+
+__getattr__ = lazy_package_getattr(__name__, _LAZY_ATTRS)
+
+__all__ = ["BrowserManager", "RedisManager", "get_redis", "context_manager", "crawl_priority", "prefetch_scheduler", "browser_manager", "news_crawl_from_url",
+           "QRLoginBase", "TushareDataProvider", "extract_table", "extract_main_content", "HttpClientManager", "http_client_manager"]
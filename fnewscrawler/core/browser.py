@@ -3,7 +3,7 @@ import os
 import time
 from typing import Optional
 
-from playwright.async_api import async_playwright, Browser, Playwright
+from playwright.async_api import async_playwright, Browser, CDPSession, Playwright
 
 from fnewscrawler.utils.logger import LOGGER
 
@@ -27,18 +27,28 @@ class BrowserManager:
         self._browser: Optional[Browser] = None
         self._playwright: Optional[Playwright] = None
         self._browser_lock = asyncio.Lock()
-        self._is_initializing = False
+        # 正在进行的初始化，并发调用者等待同一个 Future，而不是轮询标志位
+        self._init_future: Optional[asyncio.Future] = None
         self._last_health_check = 0
         self._health_check_interval = 30  # 30秒健康检查间隔
         self._max_retry_attempts = 3
         self._retry_delay = 2  # 重试延迟
+        # 后台健康探测：通过 CDP 会话请求浏览器版本，超时或失败达到阈值后重启浏览器
+        self._probe_interval = float(os.getenv("PW_BROWSER_PROBE_INTERVAL", 30))
+        self._probe_timeout = float(os.getenv("PW_BROWSER_PROBE_TIMEOUT", 3))
+        self._probe_failure_threshold = int(os.getenv("PW_BROWSER_PROBE_FAILURES", 2))
+        self._probe_failures = 0
+        self._probe_session: Optional[CDPSession] = None
+        # 关闭浏览器和 Playwright 的超时时间，浏览器卡死时 close() 可能一直不返回
+        self._close_timeout = float(os.getenv("PW_BROWSER_CLOSE_TIMEOUT", 10))
+        self._probe_task: Optional[asyncio.Task] = None
         self._init_done = True
         self._use_headless = True if os.getenv("PW_USE_HEADLESS", "true") == "true" else False
 
         LOGGER.info("BrowserManager 实例已创建")
 
     async def _is_browser_healthy(self) -> bool:
-        """检查浏览器是否健康可用"""
+        """检查浏览器是否健康可用，请求路径上只看连接状态和后台探测的结果"""
         try:
             if not self._browser:
                 return False
@@ -47,43 +57,82 @@ class BrowserManager:
             if not self._browser.is_connected():
                 return False
 
-            # 尝试获取浏览器版本作为健康检查
-            version =  self._browser
-            return bool(version)
+            return self._probe_failures < self._probe_failure_threshold
         except Exception as e:
             LOGGER.warning(f"浏览器健康检查失败: {e}")
             return False
 
+    async def probe(self) -> bool:
+        """真正与浏览器通信的探测：在缓存的 CDP 会话上请求版本信息，带超时"""
+        if not self._browser or not self._browser.is_connected():
+            return False
+        try:
+            if self._probe_session is None:
+                self._probe_session = await asyncio.wait_for(
+                    self._browser.new_browser_cdp_session(), self._probe_timeout)
+            await asyncio.wait_for(self._probe_session.send("Browser.getVersion"), self._probe_timeout)
+            return True
+        except Exception as e:
+            LOGGER.warning(f"浏览器健康探测失败: {e!r}")
+            self._probe_session = None
+            return False
+
+    async def _probe_worker(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self._probe_interval)
+                # 浏览器尚未启动或已关闭时不探测，由 get_browser 按需启动
+                if not self._browser:
+                    continue
+                if await self.probe():
+                    self._probe_failures = 0
+                    self._last_health_check = time.time()
+                    continue
+                self._probe_failures += 1
+                if self._probe_failures >= self._probe_failure_threshold:
+                    LOGGER.error(f"浏览器连续 {self._probe_failures} 次健康探测失败，强制重启")
+                    await self.force_restart()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                LOGGER.error(f"浏览器健康探测任务异常: {e}")
+
+    def _start_probe_task(self) -> None:
+        """浏览器启动后开始后台探测"""
+        if self._probe_interval > 0 and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.create_task(self._probe_worker())
+
     async def _cleanup_browser_resources(self) -> None:
         """清理浏览器资源"""
         if self._browser:
             try:
                 if self._browser.is_connected():
-                    await self._browser.close()
+                    await asyncio.wait_for(self._browser.close(), self._close_timeout)
                     LOGGER.info("浏览器实例已关闭")
             except Exception as e:
-                LOGGER.warning(f"关闭浏览器时发生错误: {e}")
+                LOGGER.warning(f"关闭浏览器时发生错误: {e!r}")
             finally:
                 self._browser = None
+                self._probe_session = None
 
         if self._playwright:
             try:
-                await self._playwright.stop()
+                await asyncio.wait_for(self._playwright.stop(), self._close_timeout)
                 LOGGER.info("Playwright 实例已停止")
             except Exception as e:
-                LOGGER.warning(f"停止 Playwright 时发生错误: {e}")
+                LOGGER.warning(f"停止 Playwright 时发生错误: {e!r}")
             finally:
                 self._playwright = None
 
     async def _initialize_browser(self) -> None:
-        """内部浏览器初始化方法"""
-        if self._is_initializing:
-            # 如果正在初始化，等待完成
-            while self._is_initializing:
-                await asyncio.sleep(0.1)
+        """内部浏览器初始化方法，并发调用时只启动一次，其余调用者共享结果（包括失败）"""
+        if self._init_future is not None:
+            await asyncio.shield(self._init_future)
             return
 
-        self._is_initializing = True
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._init_future = future
         try:
             LOGGER.info("正在启动 Playwright 浏览器...")
 
@@ -104,19 +153,28 @@ class BrowserManager:
                 ]
             )
 
+            # 新浏览器不继承旧浏览器的探测失败次数，否则强制重启后会被自己的健康检查判定为不健康
+            self._probe_failures = 0
             # 验证浏览器是否正常工作
             if not await self._is_browser_healthy():
                 raise RuntimeError("浏览器启动后健康检查失败")
 
             self._last_health_check = time.time()
+            self._start_probe_task()
             LOGGER.info("Playwright 浏览器启动成功")
+            future.set_result(None)
 
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("浏览器初始化被取消"))
+            await self._cleanup_browser_resources()
+            raise
         except Exception as e:
             LOGGER.error(f"初始化浏览器失败: {e}")
+            future.set_exception(e)
             await self._cleanup_browser_resources()
             raise
         finally:
-            self._is_initializing = False
+            self._init_future = None
 
     async def initialize(self) -> None:
         """公共初始化方法"""
@@ -127,6 +185,12 @@ class BrowserManager:
 
     async def get_browser(self) -> Browser:
         """获取浏览器实例，支持自动重连和错误恢复"""
+        # 快速路径：未到健康检查时间且浏览器可用时无需排队获取锁
+        if (self._browser is not None and self._browser.is_connected()
+                and self._probe_failures < self._probe_failure_threshold
+                and time.time() - self._last_health_check <= self._health_check_interval):
+            return self._browser
+
         async with self._browser_lock:
             current_time = time.time()
 
@@ -175,6 +239,7 @@ class BrowserManager:
                 "version": version,
                 "context_count": len(contexts),
                 "last_health_check": self._last_health_check,
+                "probe_failures": self._probe_failures,
                 "is_connected": self._browser.is_connected()
             }
         except Exception as e:
@@ -192,7 +257,9 @@ class BrowserManager:
         """优雅关闭浏览器管理器"""
         async with self._browser_lock:
             LOGGER.info("正在关闭 BrowserManager...")
-            self._is_initializing = False
+            if self._probe_task:
+                self._probe_task.cancel()
+                self._probe_task = None
             await self._cleanup_browser_resources()
             LOGGER.info("BrowserManager 已关闭")
 
@@ -0,0 +1,245 @@
+"""
+按交易日历计算缓存过期时间
+
+各类数据的更新节奏不同：日线在收盘后约16点入库，筹码数据在17~18点更新，资金流排名等页面盘中实时变化。
+固定的 TTL 要么让历史数据被反复拉取，要么让盘中数据过期不及时。这里按数据集配置每个交易日的数据更新时间，
+缓存在下一次数据更新时过期：
+
+1. 查询区间在最近一个已完成更新的交易日之前（纯历史数据）且数据集不会回溯修改时，缓存 CACHE_HISTORY_EXPIRED_TIME 天；
+2. 盘中会变化的数据集在交易时段内使用 CACHE_INTRADAY_TTL 秒的短 TTL；
+3. 数据更新时间之后的一段时间内上游可能还没入库，使用短 TTL，避免把旧数据缓存到下一个交易日；
+4. 其他情况缓存到下一个交易日的数据更新时间。
+
+交易日历通过 TushareDataProvider.get_trade_cal 获取，在进程内缓存，每天刷新一次；
+Tushare 不可用或日历还没加载完成时按工作日计算（不考虑节假日）。在事件循环中使用时不会同步请求 Tushare，
+而是通过数据接口线程池在后台刷新，应用启动时预先加载。
+"""
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Optional, Set
+
+from fnewscrawler.utils.logger import LOGGER
+
+# 北京时间，没有夏令时，直接使用固定时区
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+# 纯历史数据的缓存时间，单位天
+HISTORY_TTL = int(os.getenv("CACHE_HISTORY_EXPIRED_TIME", 30)) * 86400
+# 盘中会变化的数据在交易时段内的缓存时间（秒）
+INTRADAY_TTL = int(os.getenv("CACHE_INTRADAY_TTL", 300))
+# 数据更新时间之后，上游可能延迟入库的时长和这段时间内的缓存时间（秒）
+UPDATE_GRACE = 2 * 3600
+GRACE_TTL = 600
+# 最短缓存时间（秒）
+MIN_TTL = 60
+# 交易日历加载失败后重试的间隔（秒），期间沿用已加载的日历或按工作日计算
+CALENDAR_RETRY_INTERVAL = 300
+
+# 交易时段：9:15 集合竞价开始到 15:00 收盘
+SESSION_START = dt_time(9, 15)
+SESSION_END = dt_time(15, 0)
+
+
+@dataclass(frozen=True)
+class DatasetPolicy:
+    """数据集的缓存策略"""
+    # 每个交易日数据更新完成的时间（北京时间）
+    update_time: Optional[dt_time] = None
+    # 盘中是否会变化，会变化的在交易时段内使用短 TTL
+    intraday: bool = False
+    # 历史区间的数据是否固定不变，可以长期缓存
+    immutable_history: bool = False
+    # 不依赖交易日历的固定 TTL（秒）
+    fixed_ttl: Optional[int] = None
+
+
+DATASET_POLICIES: Dict[str, DatasetPolicy] = {
+    # Tushare 日线，收盘后约16点入库
+    "daily": DatasetPolicy(update_time=dt_time(16, 0), immutable_history=True),
+    # 前复权日线，除权除息后历史价格会整体调整，不能按历史数据长期缓存
+    "daily_qfq": DatasetPolicy(update_time=dt_time(16, 0)),
+    # 股票列表，新股上市、退市在交易日开盘前生效
+    "stock_basic": DatasetPolicy(update_time=dt_time(9, 0)),
+    # 交易日历，基本不变
+    "trade_cal": DatasetPolicy(fixed_ttl=7 * 86400),
+    # Tushare 筹码分布和胜率，每天17~18点更新
+    "cyq": DatasetPolicy(update_time=dt_time(18, 0), immutable_history=True),
+    # 问财概念、行业多日资金流排名，盘中实时变化
+    "fund_rank": DatasetPolicy(update_time=dt_time(15, 30), intraday=True),
+    # 同花顺个股历史资金流，盘中实时变化，收盘后定格
+    "fund_flow": DatasetPolicy(update_time=dt_time(15, 30), intraday=True),
+    # 东方财富个股基本信息，包含实时行情
+    "stock_quote": DatasetPolicy(update_time=dt_time(15, 30), intraday=True),
+}
+
+
+def beijing_now() -> datetime:
+    return datetime.now(BEIJING_TZ).replace(tzinfo=None)
+
+
+class TradeCalendar:
+    """交易日历，进程内缓存开市日期"""
+
+    def __init__(self):
+        self._open_dates: Set[date] = set()
+        # 已加载的日历覆盖的日期范围
+        self._range: Optional[tuple] = None
+        self._loaded_on: Optional[date] = None
+        # 加载失败后，下一次重试的时间（time.monotonic）
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _load(self, today: date) -> None:
+        start = date(today.year - 1, 12, 1)
+        end = date(today.year + 1, 1, 31)
+        try:
+            from fnewscrawler.core.tushare_data_provider import TushareDataProvider
+            df = TushareDataProvider().get_trade_cal(start.strftime("%Y%m%d"), end.strftime("%Y%m%d"))
+        except Exception as e:
+            LOGGER.warning(f"获取交易日历失败: {e}")
+            df = None
+        if df is None or df.empty:
+            # 不记录为已加载，保留之前的日历（没有时按工作日计算），过一段时间再重试
+            self._retry_at = time.monotonic() + CALENDAR_RETRY_INTERVAL
+            LOGGER.warning(f"未能加载交易日历，{CALENDAR_RETRY_INTERVAL}秒后重试")
+            return
+        self._loaded_on = today
+        open_dates = df[df["is_open"].astype(int) == 1]["cal_date"]
+        self._open_dates = {datetime.strptime(str(value), "%Y%m%d").date() for value in open_dates}
+        all_dates = [datetime.strptime(str(value), "%Y%m%d").date() for value in df["cal_date"]]
+        self._range = (min(all_dates), max(all_dates))
+
+    def _is_stale(self, today: date) -> bool:
+        return self._loaded_on != today and time.monotonic() >= self._retry_at
+
+    def _load_if_stale(self, today: date) -> None:
+        with self._lock:
+            if self._is_stale(today):
+                self._load(today)
+
+    async def refresh(self) -> None:
+        """在数据接口线程池中加载当天的交易日历，不阻塞事件循环"""
+        from fnewscrawler.core.data_provider import data_provider
+        try:
+            await data_provider.tushare(self._load_if_stale, beijing_now().date())
+        except Exception as e:
+            LOGGER.warning(f"后台加载交易日历失败: {e}")
+
+    def refresh_in_background(self) -> asyncio.Task:
+        """启动后台刷新，已有刷新任务在执行时直接返回该任务"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh())
+        return self._refresh_task
+
+    def _ensure_loaded(self, today: date) -> None:
+        if not self._is_stale(today):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环线程中（如数据接口线程池），可以直接同步加载
+            self._load_if_stale(today)
+            return
+        # 在事件循环中不能同步请求 Tushare，后台刷新，刷新完成前使用已加载的日历或按工作日计算
+        self.refresh_in_background()
+
+    def is_trade_date(self, day: date) -> bool:
+        self._ensure_loaded(beijing_now().date())
+        if self._range is None or not self._range[0] <= day <= self._range[1]:
+            # 日历范围之外按工作日计算
+            return day.weekday() < 5
+        return day in self._open_dates
+
+    def next_trade_date(self, day: date, include: bool = True) -> date:
+        """day 当天或之后（include 为 False 时不含当天）的第一个交易日"""
+        day = day if include else day + timedelta(days=1)
+        while not self.is_trade_date(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_trade_date(self, day: date, include: bool = True) -> date:
+        """day 当天或之前（include 为 False 时不含当天）的最后一个交易日"""
+        day = day if include else day - timedelta(days=1)
+        while not self.is_trade_date(day):
+            day -= timedelta(days=1)
+        return day
+
+
+class CachePolicy:
+    """按数据集和交易日历计算缓存 TTL"""
+
+    def __init__(self, calendar: Optional[TradeCalendar] = None):
+        self.calendar = calendar or TradeCalendar()
+
+    def is_trading_session(self, moment: Optional[datetime] = None) -> bool:
+        """是否处于交易日的交易时段（9:15-15:00，含午间休市）"""
+        moment = moment or beijing_now()
+        return (self.calendar.is_trade_date(moment.date())
+                and SESSION_START <= moment.time() <= SESSION_END)
+
+    def last_updated_trade_date(self, dataset: str, moment: Optional[datetime] = None) -> date:
+        """数据集最近一个已完成更新的交易日"""
+        moment = moment or beijing_now()
+        policy = DATASET_POLICIES[dataset]
+        day = self.calendar.previous_trade_date(moment.date())
+        if day == moment.date() and policy.update_time and moment.time() < policy.update_time:
+            day = self.calendar.previous_trade_date(day, include=False)
+        return day
+
+    def next_update_at(self, dataset: str, moment: Optional[datetime] = None) -> datetime:
+        """数据集下一次数据更新的时间"""
+        moment = moment or beijing_now()
+        policy = DATASET_POLICIES[dataset]
+        day = self.calendar.next_trade_date(moment.date())
+        update_at = datetime.combine(day, policy.update_time)
+        if update_at <= moment:
+            update_at = datetime.combine(self.calendar.next_trade_date(day, include=False), policy.update_time)
+        return update_at
+
+    def ttl(self, dataset: str, end_date: Optional[str] = None, moment: Optional[datetime] = None) -> int:
+        """
+        计算缓存 TTL
+
+        Args:
+            dataset: 数据集名称，见 DATASET_POLICIES
+            end_date: 查询区间的结束日期，格式'YYYYMMDD'，为空表示查询最新数据
+            moment: 计算时间（北京时间），默认为当前时间
+
+        Returns:
+            int: 缓存秒数
+        """
+        policy = DATASET_POLICIES.get(dataset)
+        if policy is None:
+            raise ValueError(f"未知的数据集: {dataset}，支持: {list(DATASET_POLICIES)}")
+        if policy.fixed_ttl is not None:
+            return policy.fixed_ttl
+
+        moment = moment or beijing_now()
+        try:
+            last_updated = self.last_updated_trade_date(dataset, moment)
+            if policy.immutable_history and end_date:
+                if datetime.strptime(end_date, "%Y%m%d").date() < last_updated:
+                    return HISTORY_TTL
+
+            if policy.intraday and self.is_trading_session(moment):
+                return INTRADAY_TTL
+
+            if self.calendar.is_trade_date(moment.date()):
+                update_at = datetime.combine(moment.date(), policy.update_time)
+                if update_at <= moment < update_at + timedelta(seconds=UPDATE_GRACE):
+                    # 上游可能还没入库，短时间后再确认
+                    return GRACE_TTL
+
+            return max(int((self.next_update_at(dataset, moment) - moment).total_seconds()), MIN_TTL)
+        except Exception as e:
+            LOGGER.warning(f"计算 {dataset} 缓存时间失败，使用短 TTL: {e}")
+            return GRACE_TTL
+
+
+# 模块级实例，所有缓存写入方共用
+cache_policy = CachePolicy()
@@ -0,0 +1,243 @@
+"""
+未知站点的正文提取与选择器学习
+
+news_selector_map 中没有配置的站点，在页面内通过一次 evaluate 运行 readability 风格的打分：
+按段落文字长度、逗号数量给父级和祖父级块元素加分，按链接密度和 class/id 中的导航、评论、广告等关键词扣分，
+选出文字最密集的块作为正文，并为其生成稳定的 CSS 选择器（唯一的 id 或唯一的 class 组合）。
+同一站点多次得到相同的高置信度选择器后写入 Redis，之后该站点的文章直接走选择器快速路径。
+"""
+import os
+import time
+from typing import Dict, Optional
+
+from playwright.async_api import Page
+
+from fnewscrawler.core.redis_manager import get_redis
+from fnewscrawler.utils.logger import LOGGER
+
+# 已学习的选择器：域名 -> 选择器
+LEARNED_SELECTOR_KEY = "news:learned_selectors"
+# 选择器投票：每个域名一个哈希，选择器 -> 票数
+SELECTOR_VOTES_KEY = "news:selector_votes:{domain}"
+# 已学习的选择器失效计数：域名 -> 连续失败次数
+SELECTOR_MISSES_KEY = "news:learned_selector_misses"
+
+# 同一选择器获得多少次高置信度结果后才学习
+LEARN_MIN_VOTES = int(os.getenv("NEWS_SELECTOR_LEARN_VOTES", 3))
+# 已学习的选择器连续多少次取不到内容后作废
+LEARNED_MAX_MISSES = 3
+# 判定为高置信度的条件：正文长度和链接密度
+CONFIDENT_MIN_TEXT_LENGTH = 200
+CONFIDENT_MAX_LINK_DENSITY = 0.3
+CONFIDENT_MIN_SCORE = 0.6
+
+# 在浏览器内执行的正文打分脚本，返回正文文本、选择器和置信度
+_READABILITY_JS = """
+() => {
+    const NEGATIVE = /comment|footer|footnote|\\bnav|menu|sidebar|sponsor|\\bads?\\b|advert|banner|share|social|recommend|related|\\bhot|rank|login|copyright|breadcrumb|pager|pagination|popup|modal/i;
+    const POSITIVE = /article|content|post|text|body|detail|main|entry|story|news/i;
+    // CSS Modules、styled-components 等生成的带哈希的类名，换一篇文章或重新构建后就会变化
+    const DYNAMIC = /\\d{3,}|__|_[A-Za-z]*\\d[A-Za-z0-9]*$|^(css|sc|jsx|svelte)-/;
+    const textLength = (el) => (el.innerText || '').replace(/\\s+/g, '').length;
+    const linkDensity = (el, length) => {
+        if (!length) {
+            return 1;
+        }
+        let linkLength = 0;
+        for (const a of el.querySelectorAll('a')) {
+            linkLength += (a.innerText || '').replace(/\\s+/g, '').length;
+        }
+        return linkLength / length;
+    };
+    const classWeight = (el) => {
+        const hint = `${el.id || ''} ${typeof el.className === 'string' ? el.className : ''}`;
+        let weight = 0;
+        if (NEGATIVE.test(hint)) {
+            weight -= 25;
+        }
+        if (POSITIVE.test(hint)) {
+            weight += 25;
+        }
+        return weight;
+    };
+    const isUnique = (selector) => {
+        try {
+            return document.querySelectorAll(selector).length === 1;
+        } catch (e) {
+            return false;
+        }
+    };
+    // 只生成不依赖位置的选择器：唯一的 id，或唯一的 tag + class 组合，否则返回 null
+    const stableSelector = (el) => {
+        if (el.id && !DYNAMIC.test(el.id)) {
+            const selector = `#${CSS.escape(el.id)}`;
+            if (isUnique(selector)) {
+                return selector;
+            }
+        }
+        const classes = Array.from(el.classList).filter(c => !DYNAMIC.test(c));
+        if (classes.length) {
+            const selector = '.' + classes.map(c => CSS.escape(c)).join('.');
+            if (isUnique(selector)) {
+                return selector;
+            }
+            const tagged = el.tagName.toLowerCase() + selector;
+            if (isUnique(tagged)) {
+                return tagged;
+            }
+        }
+        if (['ARTICLE', 'MAIN'].includes(el.tagName) && isUnique(el.tagName.toLowerCase())) {
+            return el.tagName.toLowerCase();
+        }
+        return null;
+    };
+
+    const scores = new Map();
+    const addScore = (el, score) => {
+        if (!el || el === document.body || el === document.documentElement) {
+            return;
+        }
+        if (!scores.has(el)) {
+            scores.set(el, classWeight(el));
+        }
+        scores.set(el, scores.get(el) + score);
+    };
+    for (const p of document.querySelectorAll('p, pre, td, section > div, article > div')) {
+        const text = (p.innerText || '').trim();
+        if (text.length < 25) {
+            continue;
+        }
+        const commas = (text.match(/[,，。；;、]/g) || []).length;
+        const score = 1 + commas + Math.min(Math.floor(text.length / 100), 3);
+        addScore(p.parentElement, score);
+        if (p.parentElement) {
+            addScore(p.parentElement.parentElement, score / 2);
+        }
+    }
+
+    const adjustedScores = new Map();
+    let best = null;
+    let bestScore = 0;
+    for (const [el, score] of scores) {
+        const adjusted = score * (1 - linkDensity(el, textLength(el)));
+        adjustedScores.set(el, adjusted);
+        if (adjusted > bestScore) {
+            bestScore = adjusted;
+            best = el;
+        }
+    }
+    if (!best) {
+        return null;
+    }
+    // 正文块的父级和子级分数往往接近，只和不相互包含的候选块比较
+    let competitor = 0;
+    for (const [el, adjusted] of adjustedScores) {
+        if (el !== best && !el.contains(best) && !best.contains(el)) {
+            competitor = Math.max(competitor, adjusted);
+        }
+    }
+    const length = textLength(best);
+    return {
+        text: best.innerText,
+        selector: stableSelector(best),
+        textLength: length,
+        linkDensity: linkDensity(best, length),
+        bodyRatio: length / Math.max(textLength(document.body), 1),
+        score: bestScore / (bestScore + competitor),
+    };
+}
+"""
+
+# 已学习选择器的进程内缓存，只缓存命中的结果
+_learned_selector_cache: Dict[str, str] = {}
+
+
+def get_learned_selector(domain: str) -> Optional[str]:
+    """读取已学习的站点选择器"""
+    selector = _learned_selector_cache.get(domain)
+    if selector:
+        return selector
+    try:
+        value = get_redis().get_client().hget(LEARNED_SELECTOR_KEY, domain)
+    except Exception as e:
+        LOGGER.warning(f"读取 {domain} 已学习的选择器失败: {e}")
+        return None
+    if value:
+        selector = value.decode("utf-8")
+        _learned_selector_cache[domain] = selector
+        return selector
+    return None
+
+
+def _is_confident(result: Dict) -> bool:
+    return (bool(result.get("selector"))
+            and result["textLength"] >= CONFIDENT_MIN_TEXT_LENGTH
+            and result["linkDensity"] <= CONFIDENT_MAX_LINK_DENSITY
+            and result["score"] >= CONFIDENT_MIN_SCORE)
+
+
+def record_extraction(domain: str, result: Dict) -> None:
+    """为高置信度的提取结果投票，同一选择器票数达到 LEARN_MIN_VOTES 后学习为该站点的选择器"""
+    if not domain or not _is_confident(result):
+        return
+    selector = result["selector"]
+    try:
+        client = get_redis().get_client()
+        votes_key = SELECTOR_VOTES_KEY.format(domain=domain)
+        pipe = client.pipeline()
+        pipe.hincrby(votes_key, selector, 1)
+        pipe.expire(votes_key, 7 * 86400)
+        votes = pipe.execute()[0]
+        if votes < LEARN_MIN_VOTES:
+            return
+        pipe = client.pipeline()
+        pipe.hset(LEARNED_SELECTOR_KEY, domain, selector)
+        pipe.hdel(SELECTOR_MISSES_KEY, domain)
+        pipe.delete(votes_key)
+        pipe.execute()
+        _learned_selector_cache[domain] = selector
+        LOGGER.info(f"已为 {domain} 学习正文选择器: {selector}（{votes} 次一致）")
+    except Exception as e:
+        LOGGER.warning(f"记录 {domain} 正文选择器失败: {e}")
+
+
+def record_learned_selector_miss(domain: str) -> None:
+    """已学习的选择器取不到内容时计数，连续失败达到上限后作废，重新学习"""
+    try:
+        client = get_redis().get_client()
+        misses = client.hincrby(SELECTOR_MISSES_KEY, domain, 1)
+        if misses >= LEARNED_MAX_MISSES:
+            client.hdel(LEARNED_SELECTOR_KEY, domain)
+            client.hdel(SELECTOR_MISSES_KEY, domain)
+            _learned_selector_cache.pop(domain, None)
+            LOGGER.info(f"{domain} 已学习的选择器连续 {misses} 次失效，已作废")
+    except Exception as e:
+        LOGGER.warning(f"记录 {domain} 选择器失效失败: {e}")
+
+
+def record_learned_selector_hit(domain: str) -> None:
+    """已学习的选择器取到内容时清零失效计数"""
+    try:
+        get_redis().get_client().hdel(SELECTOR_MISSES_KEY, domain)
+    except Exception as e:
+        LOGGER.debug(f"清零 {domain} 选择器失效计数失败: {e}")
+
+
+async def extract_main_content(page: Page) -> Optional[Dict]:
+    """
+    在页面内运行正文打分，返回得分最高的块
+
+    Returns:
+        dict | None: text（正文）、selector（稳定选择器，可能为 None）、textLength、linkDensity、
+        bodyRatio（占全文比例）、score（与其他候选相比的领先程度，0~1）；页面没有可用段落时返回 None
+    """
+    start = time.perf_counter()
+    try:
+        result = await page.evaluate(_READABILITY_JS)
+    except Exception as e:
+        LOGGER.warning(f"正文打分失败: {e}")
+        return None
+    if result:
+        LOGGER.debug(f"正文打分耗时 {time.perf_counter() - start:.3f} 秒，选择器 {result['selector']}，"
+                     f"长度 {result['textLength']}，置信度 {result['score']:.2f}")
+    return result
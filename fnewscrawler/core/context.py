@@ -1,17 +1,29 @@
-import json
 import asyncio
+import hashlib
 import json
 import os
 import time
-from typing import Dict, Any, Optional, Set
+import zlib
+from collections import Counter, deque
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-from playwright.async_api import BrowserContext, Error
+from playwright.async_api import BrowserContext, Error, Page
 
 from fnewscrawler.core.browser import browser_manager
 from fnewscrawler.core.redis_manager import get_redis
 from fnewscrawler.utils import get_random_user_agent
 from fnewscrawler.utils.logger import LOGGER
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 登录状态存放在 Redis 哈希中：state 为 zlib 压缩后的 JSON，digest 为其 sha256，作为版本号
+STORAGE_STATE_KEY = "playwright:auth_state:{site_name}"
+# 旧版本直接以字符串保存完整 JSON，读取时自动迁移
+LEGACY_STORAGE_STATE_KEY = "playwright:auth:{site_name}"
+
 
 class ContextManager:
     """
@@ -25,11 +37,36 @@ class ContextManager:
         self._context_creation_time: Dict[str, float] = {}
         self._context_last_used: Dict[str, float] = {}
         self._context_usage_count: Dict[str, int] = {}
-        self._creating_contexts: Set[str] = set()  # 正在创建的上下文
+        # 正在创建的上下文：并发请求同一站点时，等待者共享创建者的 Future，不会重复创建
+        self._pending_contexts: Dict[str, asyncio.Future] = {}
+        # 已解析的登录状态缓存：site_name -> (digest, storage_state)
+        self._storage_state_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
 
         # 配置参数
         self._max_idle_time = int(os.environ.get("PW_CONTEXT_MAX_IDLE_TIME", 3600))  # 最大空闲时间（秒）
         self._health_check_interval = int(os.environ.get("PW_CONTEXT_HEALTH_CHECK_TIME", 300))  # 健康检查间隔（秒）
+        self._max_contexts = int(os.environ.get("PW_MAX_CONTEXTS", 8))  # 最多同时保留的上下文数量，小于等于0表示不限制
+        self._max_pages_per_context = int(os.environ.get("PW_MAX_PAGES_PER_CONTEXT", 20))  # 单个上下文最多打开的页面数
+        self._browser_memory_limit = int(os.environ.get("PW_BROWSER_MEMORY_LIMIT_MB", 0))  # Chromium 进程总内存上限（MB）
+        # 需要登录的上下文不参与淘汰，否则会丢失登录状态
+        self._protected_contexts = {
+            name.strip() for name in os.environ.get("PW_PROTECTED_CONTEXTS", "iwencai,eastmoney").split(",")
+            if name.strip()
+        }
+
+        # 后台健康探测：每个上下文缓存一个空白页，定期在其中执行一次 evaluate，超时视为渲染进程卡死
+        self._probe_interval = float(os.environ.get("PW_CONTEXT_PROBE_INTERVAL", 30))  # 探测间隔（秒），小于等于0表示关闭
+        self._probe_timeout = float(os.environ.get("PW_CONTEXT_PROBE_TIMEOUT", 3))  # 单次探测超时（秒）
+        self._probe_failure_threshold = int(os.environ.get("PW_CONTEXT_PROBE_FAILURES", 2))  # 连续失败多少次后熔断
+        self._probe_pages: Dict[str, Page] = {}
+        self._probe_failures: Dict[str, int] = {}
+        # 已熔断的上下文，请求路径上直接视为不健康
+        self._tripped_contexts: Set[BrowserContext] = set()
+        self._probe_task = None
+
+        # 淘汰统计：按原因计数，并保留最近的淘汰记录
+        self._eviction_counts: Counter = Counter()
+        self._recent_evictions = deque(maxlen=50)
 
         # 清理任务相关
         self._cleanup_task = None
@@ -51,12 +88,15 @@ class ContextManager:
                     try:
                         await asyncio.sleep(self._health_check_interval)
                         await self._cleanup_expired_contexts()
+                        await self._enforce_resource_budget()
                     except asyncio.CancelledError:
                         break
                     except Exception as e:
                         LOGGER.error(f"清理任务异常: {e}")
 
             self._cleanup_task = asyncio.create_task(cleanup_worker())
+            if self._probe_interval > 0:
+                self._probe_task = asyncio.create_task(self._probe_worker())
             self._cleanup_task_started = True
             LOGGER.info("后台清理任务已启动")
 
@@ -76,6 +116,8 @@ class ContextManager:
 
         async with self._global_lock:
             for site_name in list(self._contexts.keys()):
+                if site_name in self._protected_contexts:
+                    continue
                 # creation_time = self._context_creation_time.get(site_name, 0)
                 last_used = self._context_last_used.get(site_name, 0)
 
@@ -95,6 +137,76 @@ class ContextManager:
             except Exception as e:
                 LOGGER.error(f"清理过期上下文 {site_name} 失败: {e}")
 
+    def _open_pages(self, site_name: str) -> List[Page]:
+        """上下文中业务打开的页面，不包括健康探测用的空白页"""
+        probe_page = self._probe_pages.get(site_name)
+        return [page for page in self._contexts[site_name].pages if page is not probe_page]
+
+    def _eviction_candidates(self, exclude: Optional[str] = None) -> List[str]:
+        """可以淘汰的上下文，按最近使用时间从旧到新排列；受保护的和正在打开页面的上下文不参与淘汰"""
+        candidates = [
+            site_name for site_name in self._contexts
+            if site_name != exclude and site_name not in self._protected_contexts and not self._open_pages(site_name)
+        ]
+        return sorted(candidates, key=lambda name: self._context_last_used.get(name, 0))
+
+    async def _evict_for_capacity(self, site_name: str) -> None:
+        """新建上下文前检查数量上限，超出时按 LRU 淘汰空闲的上下文"""
+        if self._max_contexts <= 0:
+            return
+        overflow = len(self._contexts) + 1 - self._max_contexts
+        if overflow <= 0:
+            return
+        candidates = self._eviction_candidates(exclude=site_name)
+        for victim in candidates[:overflow]:
+            await self._force_close_context(victim, reason="lru")
+        if overflow > len(candidates):
+            LOGGER.warning(f"上下文数量已达上限 {self._max_contexts}，但没有可淘汰的空闲上下文")
+
+    @staticmethod
+    def _get_browser_memory_mb() -> Optional[float]:
+        """统计当前进程派生的 Chromium 进程常驻内存总和（MB），未安装 psutil 时返回 None"""
+        if psutil is None:
+            return None
+        total = 0
+        for proc in psutil.Process().children(recursive=True):
+            try:
+                name = proc.name().lower()
+                if "chrom" in name or "headless_shell" in name:
+                    total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / 1024 / 1024
+
+    async def _enforce_resource_budget(self) -> None:
+        """
+        按资源预算淘汰上下文：
+        1. 打开页面数超过上限的上下文视为页面泄漏，直接关闭
+        2. 设置了内存上限且 Chromium 内存超出时，按 LRU 逐个淘汰空闲上下文直到回到预算以内
+        """
+        if self._max_pages_per_context > 0:
+            for site_name in list(self._contexts):
+                page_count = len(self._open_pages(site_name))
+                if page_count <= self._max_pages_per_context:
+                    continue
+                if site_name in self._protected_contexts:
+                    LOGGER.warning(f"受保护的上下文 {site_name} 打开了 {page_count} 个页面，超过上限 {self._max_pages_per_context}")
+                    continue
+                await self._force_close_context(site_name, reason="page_limit")
+
+        if self._browser_memory_limit <= 0:
+            return
+        memory_mb = self._get_browser_memory_mb()
+        if memory_mb is None:
+            LOGGER.warning("设置了 PW_BROWSER_MEMORY_LIMIT_MB 但未安装 psutil，无法统计浏览器内存")
+            return
+        for victim in self._eviction_candidates():
+            if memory_mb <= self._browser_memory_limit:
+                break
+            LOGGER.info(f"浏览器内存 {memory_mb:.0f}MB 超过上限 {self._browser_memory_limit}MB，淘汰上下文 {victim}")
+            await self._force_close_context(victim, reason="memory")
+            memory_mb = self._get_browser_memory_mb()
+
     async def _get_site_lock(self, site_name: str) -> asyncio.Lock:
         """获取站点专用锁"""
         if site_name not in self._context_locks:
@@ -103,26 +215,73 @@ class ContextManager:
                     self._context_locks[site_name] = asyncio.Lock()
         return self._context_locks[site_name]
 
-    async def _get_storage_state(self, site_name: str) -> Optional[Dict[str, Any]]:
-        """从Redis加载指定网站的登录状态，支持连接池和超时"""
-        try:
-            r = get_redis()
-            state_json = r.get(f'playwright:auth:{site_name}')
-            if state_json:
-                LOGGER.info(f"从Redis加载 {site_name} 的登录状态")
-                return json.loads(state_json)
+    @staticmethod
+    def _encode_storage_state(state: Dict[str, Any]) -> Tuple[str, bytes]:
+        """规范化序列化登录状态，返回 (digest, 压缩后的数据)"""
+        state_json = json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(state_json).hexdigest(), zlib.compress(state_json)
+
+    def _migrate_legacy_storage_state(self, client, site_name: str) -> Optional[Dict[str, Any]]:
+        """把旧版字符串键中的登录状态迁移到哈希中"""
+        legacy_key = LEGACY_STORAGE_STATE_KEY.format(site_name=site_name)
+        state_json = client.get(legacy_key)
+        if not state_json:
+            return None
+        # 旧版通过 RedisManager.set 保存已经 dumps 过的字符串，默认的 json 序列化又编码了一次
+        state = json.loads(state_json)
+        if isinstance(state, str):
+            state = json.loads(state)
+        if not isinstance(state, dict):
+            LOGGER.warning(f"{site_name} 的旧版登录状态格式无效，已忽略: {type(state).__name__}")
             return None
+        digest, blob = self._encode_storage_state(state)
+        pipe = client.pipeline()
+        pipe.hset(STORAGE_STATE_KEY.format(site_name=site_name), mapping={"digest": digest, "state": blob})
+        pipe.delete(legacy_key)
+        pipe.execute()
+        self._storage_state_cache[site_name] = (digest, state)
+        LOGGER.info(f"{site_name} 的登录状态已迁移为压缩哈希存储")
+        return state
+
+    async def _get_storage_state(self, site_name: str) -> Optional[Dict[str, Any]]:
+        """
+        加载指定网站的登录状态
 
-        except json.JSONDecodeError as e:
-            LOGGER.error(f"解析 {site_name} 登录状态JSON失败: {e}")
+        先只读取 Redis 中的 digest 字段，与内存缓存的版本一致时直接复用已解析的结果，
+        不一致（其他进程保存过新状态）时才读取并解压完整数据。
+        """
+        try:
+            client = get_redis().get_client()
+            key = STORAGE_STATE_KEY.format(site_name=site_name)
+            digest = client.hget(key, "digest")
+            if digest is None:
+                self._storage_state_cache.pop(site_name, None)
+                return self._migrate_legacy_storage_state(client, site_name)
+
+            digest = digest.decode("utf-8")
+            cached = self._storage_state_cache.get(site_name)
+            if cached and cached[0] == digest:
+                LOGGER.debug(f"{site_name} 的登录状态未变化，使用内存缓存")
+                return cached[1]
+
+            digest, blob = client.hmget(key, ["digest", "state"])
+            if blob is None:
+                return None
+            state = json.loads(zlib.decompress(blob))
+            self._storage_state_cache[site_name] = (digest.decode("utf-8"), state)
+            LOGGER.info(f"从Redis加载 {site_name} 的登录状态")
+            return state
+
+        except (json.JSONDecodeError, zlib.error) as e:
+            LOGGER.error(f"解析 {site_name} 登录状态失败: {e}")
         except Exception as e:
             LOGGER.warning(f"从Redis加载 {site_name} 登录状态失败: {e}")
         return None
 
     async def _is_context_healthy(self, context: BrowserContext) -> bool:
-        """检查上下文是否健康"""
+        """检查上下文是否健康，只做不涉及浏览器通信的检查，真正的探测由后台任务完成"""
         try:
-            if not context:
+            if not context or context in self._tripped_contexts:
                 return False
 
             # 检查浏览器连接状态
@@ -138,6 +297,55 @@ class ContextManager:
             LOGGER.debug(f"上下文健康检查失败: {e}")
             return False
 
+    async def _probe_context(self, site_name: str, context: BrowserContext) -> bool:
+        """在缓存的空白页中执行一次 evaluate，超时或出错视为探测失败"""
+        try:
+            page = self._probe_pages.get(site_name)
+            if page is None or page.is_closed():
+                page = await asyncio.wait_for(context.new_page(), self._probe_timeout)
+                self._probe_pages[site_name] = page
+            return await asyncio.wait_for(page.evaluate("1 + 1"), self._probe_timeout) == 2
+        except Exception as e:
+            LOGGER.debug(f"上下文 {site_name} 健康探测失败: {e!r}")
+            return False
+
+    async def _probe_contexts(self) -> None:
+        """探测所有上下文，连续失败达到阈值时熔断并替换"""
+        for site_name, context in list(self._contexts.items()):
+            # 正在创建或浏览器已断开的上下文交给请求路径处理
+            if site_name in self._pending_contexts or not context.browser or not context.browser.is_connected():
+                continue
+            if await self._probe_context(site_name, context):
+                self._probe_failures.pop(site_name, None)
+                continue
+
+            failures = self._probe_failures.get(site_name, 0) + 1
+            self._probe_failures[site_name] = failures
+            if failures < self._probe_failure_threshold or self._contexts.get(site_name) is not context:
+                continue
+
+            LOGGER.error(f"上下文 {site_name} 连续 {failures} 次健康探测失败，熔断并替换")
+            self._tripped_contexts.add(context)
+            if site_name in self._protected_contexts:
+                # 需要登录的上下文立即重建，从Redis恢复登录状态
+                await self.get_context(site_name)
+            else:
+                # 其他上下文直接关闭，下次使用时再创建
+                site_lock = await self._get_site_lock(site_name)
+                async with site_lock:
+                    if self._contexts.get(site_name) is context:
+                        await self._force_close_context(site_name, reason="hung")
+
+    async def _probe_worker(self):
+        while True:
+            try:
+                await asyncio.sleep(self._probe_interval)
+                await self._probe_contexts()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                LOGGER.error(f"上下文健康探测任务异常: {e}")
+
     async def _create_new_context(self, site_name: str) -> BrowserContext:
         """创建新的浏览器上下文"""
         browser = await browser_manager.get_browser()
@@ -229,10 +437,18 @@ class ContextManager:
             LOGGER.error(f"创建 {site_name} 上下文时发生未知错误: {e}")
             raise
 
+    def _touch_context(self, site_name: str) -> None:
+        """更新上下文的使用时间和计数"""
+        self._context_last_used[site_name] = time.time()
+        self._context_usage_count[site_name] = self._context_usage_count.get(site_name, 0) + 1
+
     async def get_context(self, site_name: str, force_new: bool = False) -> BrowserContext:
         """
         获取指定网站的浏览器上下文，支持高并发和自动恢复
 
+        同一站点同一时刻只有一个协程负责创建（或重建）上下文，其余协程等待它的 Future，
+        上下文不健康时也只会被关闭和重建一次。
+
         Args:
             site_name: 网站名称
             force_new: 是否强制创建新上下文
@@ -240,70 +456,64 @@ class ContextManager:
         # 确保清理任务已启动
         await self._ensure_cleanup_task_started()
 
-        current_time = time.time()
-
-        # 如果不强制创建新上下文，先检查现有上下文
-        if not force_new and site_name in self._contexts:
-            context = self._contexts[site_name]
-            if await self._is_context_healthy(context):
-                # 更新使用时间和计数
-                self._context_last_used[site_name] = current_time
-                self._context_usage_count[site_name] = self._context_usage_count.get(site_name, 0) + 1
+        # 快速路径：已有健康的上下文直接返回
+        if not force_new:
+            context = self._contexts.get(site_name)
+            if context is not None and await self._is_context_healthy(context):
+                self._touch_context(site_name)
                 return context
-            else:
-                # 上下文不健康，标记为需要重建
-                LOGGER.warning(f"{site_name} 的上下文不健康，将重新创建")
-                await self._force_close_context(site_name, reason="unhealthy")
 
-        # 获取站点专用锁
-        site_lock = await self._get_site_lock(site_name)
+        # 已经有协程在创建，等待其结果；shield 避免等待者被取消时连带取消创建
+        pending = self._pending_contexts.get(site_name)
+        if pending is not None:
+            context = await asyncio.shield(pending)
+            self._touch_context(site_name)
+            return context
 
-        async with site_lock:
-            # 双重检查，防止并发创建
-            if not force_new and site_name in self._contexts:
-                context = self._contexts[site_name]
-                if await self._is_context_healthy(context):
-                    self._context_last_used[site_name] = current_time
-                    self._context_usage_count[site_name] = self._context_usage_count.get(site_name, 0) + 1
-                    return context
-
-            # 检查是否正在创建中
-            if site_name in self._creating_contexts:
-                # 等待创建完成
-                retry_count = 0
-                while site_name in self._creating_contexts and retry_count < 50:  # 最多等待5秒
-                    await asyncio.sleep(0.1)
-                    retry_count += 1
-
-                # 如果创建完成，返回结果
-                if site_name in self._contexts:
-                    context = self._contexts[site_name]
-                    if await self._is_context_healthy(context):
-                        self._context_last_used[site_name] = current_time
-                        self._context_usage_count[site_name] = self._context_usage_count.get(site_name, 0) + 1
-                        return context
-
-            # 标记正在创建
-            self._creating_contexts.add(site_name)
+        # 检查和登记之间没有 await，保证只有一个创建者
+        future = asyncio.get_running_loop().create_future()
+        # 没有等待者时也取走异常，避免 "exception was never retrieved" 警告
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending_contexts[site_name] = future
 
-            try:
-                LOGGER.info(f"正在为 {site_name} 创建新的浏览器上下文...")
+        try:
+            site_lock = await self._get_site_lock(site_name)
+            async with site_lock:
+                old_context = self._contexts.get(site_name)
+                if old_context is not None:
+                    if not force_new and await self._is_context_healthy(old_context):
+                        self._touch_context(site_name)
+                        future.set_result(old_context)
+                        return old_context
+                    if not force_new:
+                        LOGGER.warning(f"{site_name} 的上下文不健康，将重新创建")
+                    await self._force_close_context(site_name, reason="refresh" if force_new else "unhealthy")
+                else:
+                    # 新站点的上下文先检查数量上限，为其腾出位置
+                    await self._evict_for_capacity(site_name)
 
-                # 创建新上下文
+                LOGGER.info(f"正在为 {site_name} 创建新的浏览器上下文...")
                 context = await self._create_new_context(site_name)
 
                 # 保存上下文和元数据
+                current_time = time.time()
                 self._contexts[site_name] = context
                 self._context_creation_time[site_name] = current_time
                 self._context_last_used[site_name] = current_time
                 self._context_usage_count[site_name] = 1
 
-                LOGGER.info(f"{site_name} 上下文创建成功，当前管理 {len(self._contexts)} 个上下文")
-                return context
+            LOGGER.info(f"{site_name} 上下文创建成功，当前管理 {len(self._contexts)} 个上下文")
+            future.set_result(context)
+            return context
 
-            finally:
-                # 移除创建标记
-                self._creating_contexts.discard(site_name)
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError(f"{site_name} 上下文创建被取消"))
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._pending_contexts.pop(site_name, None)
 
     async def _force_close_context(self, site_name: str, reason: str = "manual"):
         """强制关闭指定站点的上下文"""
@@ -311,16 +521,27 @@ class ContextManager:
             if site_name in self._contexts:
                 context = self._contexts[site_name]
                 try:
-                    await context.close()
+                    # 渲染进程卡死时 close 也可能挂起，限制等待时间
+                    await asyncio.wait_for(context.close(), timeout=10)
                     LOGGER.info(f"上下文 {site_name} 已关闭 (原因: {reason})")
                 except Exception as e:
                     LOGGER.warning(f"关闭上下文 {site_name} 时发生错误: {e}")
 
+                self._eviction_counts[reason] += 1
+                self._recent_evictions.append({
+                    "site_name": site_name,
+                    "reason": reason,
+                    "time": time.time(),
+                })
+
                 # 清理元数据
                 self._contexts.pop(site_name, None)
                 self._context_creation_time.pop(site_name, None)
                 self._context_last_used.pop(site_name, None)
                 self._context_usage_count.pop(site_name, None)
+                self._probe_pages.pop(site_name, None)
+                self._probe_failures.pop(site_name, None)
+                self._tripped_contexts.discard(context)
 
         except Exception as e:
             LOGGER.error(f"强制关闭上下文 {site_name} 失败: {e}")
@@ -338,15 +559,21 @@ class ContextManager:
                 LOGGER.warning(f"上下文 {site_name} 不健康，跳过状态保存")
                 return False
 
-            # 获取存储状态
+            # 获取存储状态，cookies 和 localStorage 没有变化时不重复写入
             state_dict = await context.storage_state()
-            state_json = json.dumps(state_dict, ensure_ascii=False)
-
-            # 异步保存到Redis
-            r = get_redis()
-            r.set(f'playwright:auth:{site_name}', state_json)  # 24小时过期
-
-            LOGGER.info(f"上下文状态已保存到Redis: {site_name}")
+            digest, blob = self._encode_storage_state(state_dict)
+            cached = self._storage_state_cache.get(site_name)
+            if cached and cached[0] == digest:
+                LOGGER.debug(f"{site_name} 的登录状态未变化，跳过保存")
+                return True
+
+            client = get_redis().get_client()
+            key = STORAGE_STATE_KEY.format(site_name=site_name)
+            remote_digest = client.hget(key, "digest")
+            if remote_digest is None or remote_digest.decode("utf-8") != digest:
+                client.hset(key, mapping={"digest": digest, "state": blob})
+                LOGGER.info(f"上下文状态已保存到Redis: {site_name}，压缩后 {len(blob)} 字节")
+            self._storage_state_cache[site_name] = (digest, state_dict)
             return True
 
         except Exception as e:
@@ -356,11 +583,13 @@ class ContextManager:
 
     async def delete_context_state(self, site_name: str) -> int:
         """删除指定网站的登录状态"""
+        self._storage_state_cache.pop(site_name, None)
         try:
             r = get_redis()
-            flag =  r.delete(f'playwright:auth:{site_name}')
+            key = STORAGE_STATE_KEY.format(site_name=site_name)
+            flag = r.delete(key, LEGACY_STORAGE_STATE_KEY.format(site_name=site_name))
 
-            LOGGER.info(f"已从Redis删除键 playwright:auth:{site_name}")
+            LOGGER.info(f"已从Redis删除键 {key}")
             return flag
 
         except asyncio.TimeoutError:
@@ -372,7 +601,6 @@ class ContextManager:
     async def refresh_context(self, site_name: str) -> BrowserContext:
         """刷新指定站点的上下文"""
         LOGGER.info(f"刷新 {site_name} 的上下文")
-        await self._force_close_context(site_name, reason="refresh")
         return await self.get_context(site_name, force_new=True)
 
     async def get_context_stats(self) -> Dict[str, Any]:
@@ -380,7 +608,13 @@ class ContextManager:
         current_time = time.time()
         stats = {
             "total_contexts": len(self._contexts),
-            "creating_contexts": len(self._creating_contexts),
+            "creating_contexts": len(self._pending_contexts),
+            "max_contexts": self._max_contexts,
+            "protected_contexts": sorted(self._protected_contexts),
+            "browser_memory_mb": self._get_browser_memory_mb(),
+            "browser_memory_limit_mb": self._browser_memory_limit,
+            "evictions": dict(self._eviction_counts),
+            "recent_evictions": list(self._recent_evictions),
             "contexts": {}
         }
 
@@ -393,6 +627,9 @@ class ContextManager:
                 "age_seconds": int(current_time - creation_time),
                 "idle_seconds": int(current_time - last_used),
                 "usage_count": usage_count,
+                "page_count": len(self._open_pages(site_name)),
+                "probe_failures": self._probe_failures.get(site_name, 0),
+                "protected": site_name in self._protected_contexts,
                 "is_healthy": await self._is_context_healthy(self._contexts[site_name]),
                 "last_used": last_used,
                 "creation_time": creation_time
@@ -407,13 +644,17 @@ class ContextManager:
 
     async def close_all(self):
         """关闭所有管理的浏览器上下文实例"""
-        # 停止清理任务
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        # 停止清理任务和健康探测任务
+        for task in (self._cleanup_task, self._probe_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._cleanup_task = None
+        self._probe_task = None
+        self._cleanup_task_started = False
 
         async with self._global_lock:
             LOGGER.info("正在关闭所有浏览器上下文...")
@@ -435,7 +676,10 @@ class ContextManager:
             self._context_creation_time.clear()
             self._context_last_used.clear()
             self._context_usage_count.clear()
-            self._creating_contexts.clear()
+            self._pending_contexts.clear()
+            self._probe_pages.clear()
+            self._probe_failures.clear()
+            self._tripped_contexts.clear()
 
             LOGGER.info("所有上下文已清理完毕")
 
@@ -0,0 +1,164 @@
+"""
+新闻抓取失败的负缓存
+
+抓取失败时按失败类型记录到 Redis：超时、HTTP 错误、正文为空、其他异常分别使用不同的基础 TTL，
+同一 URL 连续失败时 TTL 按 2 的幂次递增（有上限）。同一域名短时间内多个 URL 因超时或被拦截
+（403/429/5xx）而失败时，整个域名进入冷却期。冷却期内的请求直接返回"最近失败"，不再打开浏览器页面等待超时。
+抓取成功后清除该 URL 的失败记录。
+"""
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from fnewscrawler.core.redis_manager import get_redis
+from fnewscrawler.utils import canonicalize_url, extract_second_level_domain
+from fnewscrawler.utils.logger import LOGGER
+
+# 失败类型
+FAILURE_TIMEOUT = "timeout"
+FAILURE_HTTP = "http_error"
+FAILURE_EMPTY = "empty"
+FAILURE_ERROR = "error"
+
+# 各失败类型的基础 TTL（秒）
+FAILURE_BASE_TTL = {
+    FAILURE_TIMEOUT: 60,
+    FAILURE_HTTP: 300,
+    FAILURE_EMPTY: 600,
+    FAILURE_ERROR: 60,
+}
+# 页面不存在，短时间内不会恢复
+GONE_STATUS_CODES = {404, 410}
+GONE_BASE_TTL = 3600
+# 会连带影响同域名其他 URL 的 HTTP 状态码：拦截、限流、服务端故障
+DOMAIN_BLOCK_STATUS_CODES = {403, 429, 500, 502, 503, 504}
+
+# 负缓存 TTL 上限（秒）
+FAILURE_MAX_TTL = int(os.getenv("NEWS_FAILURE_MAX_TTL", 6 * 3600))
+# 同一域名在 DOMAIN_FAILURE_WINDOW 秒内失败多少个 URL 后进入冷却期
+DOMAIN_FAILURE_THRESHOLD = int(os.getenv("NEWS_DOMAIN_FAILURE_THRESHOLD", 5))
+DOMAIN_FAILURE_WINDOW = 300
+# 失败次数的记忆时长，超过后重新从基础 TTL 开始
+FAILURE_COUNT_TTL = 86400
+
+FAILED_URL_KEY = "news:failed:url:{url}"
+FAILED_URL_COUNT_KEY = "news:failed:url_count:{url}"
+FAILED_DOMAIN_KEY = "news:failed:domain:{domain}"
+FAILED_DOMAIN_COUNT_KEY = "news:failed:domain_count:{domain}"
+DOMAIN_FAILURE_WINDOW_KEY = "news:failed:domain_window:{domain}"
+
+_FAILURE_DESCRIPTIONS = {
+    FAILURE_TIMEOUT: "访问超时",
+    FAILURE_HTTP: "HTTP错误",
+    FAILURE_EMPTY: "未提取到正文",
+    FAILURE_ERROR: "抓取异常",
+}
+
+
+def classify_exception(e: Exception) -> str:
+    """把抓取过程中的异常归类为失败类型"""
+    # playwright 的 TimeoutError 不是内置 TimeoutError 的子类，按类名判断
+    if isinstance(e, TimeoutError) or type(e).__name__ == "TimeoutError":
+        return FAILURE_TIMEOUT
+    return FAILURE_ERROR
+
+
+def _escalated_ttl(base_ttl: int, count: int) -> int:
+    return min(base_ttl * 2 ** (count - 1), FAILURE_MAX_TTL)
+
+
+def record_failure(url: str, kind: str, status: Optional[int] = None, message: str = "") -> int:
+    """
+    记录一次抓取失败
+
+    Args:
+        url: 失败的URL
+        kind: 失败类型，FAILURE_* 常量之一
+        status: HTTP 状态码，kind 为 FAILURE_HTTP 时提供
+        message: 错误信息，便于排查
+
+    Returns:
+        int: 该 URL 本次进入负缓存的秒数，Redis 不可用时返回 0
+    """
+    try:
+        client = get_redis().get_client()
+        url_key = canonicalize_url(url)
+        count = client.incr(FAILED_URL_COUNT_KEY.format(url=url_key))
+        base_ttl = GONE_BASE_TTL if status in GONE_STATUS_CODES else FAILURE_BASE_TTL[kind]
+        ttl = _escalated_ttl(base_ttl, count)
+        record = {"kind": kind, "status": status, "message": message[:200], "count": count,
+                  "time": int(time.time()), "ttl": ttl}
+        pipe = client.pipeline()
+        pipe.expire(FAILED_URL_COUNT_KEY.format(url=url_key), FAILURE_COUNT_TTL)
+        pipe.set(FAILED_URL_KEY.format(url=url_key), json.dumps(record, ensure_ascii=False), ex=ttl)
+        pipe.execute()
+        LOGGER.info(f"{url} 抓取失败（{kind}，第{count}次），{ttl}秒内不再重试")
+
+        if kind == FAILURE_TIMEOUT or status in DOMAIN_BLOCK_STATUS_CODES:
+            _record_domain_failure(client, url, kind, status)
+        return ttl
+    except Exception as e:
+        LOGGER.warning(f"记录 {url} 抓取失败时出错: {e}")
+        return 0
+
+
+def _record_domain_failure(client, url: str, kind: str, status: Optional[int]) -> None:
+    """同一域名短时间内失败的 URL 达到阈值后，整个域名进入冷却期"""
+    domain = extract_second_level_domain(url)
+    if not domain:
+        return
+    window_key = DOMAIN_FAILURE_WINDOW_KEY.format(domain=domain)
+    pipe = client.pipeline()
+    pipe.incr(window_key)
+    pipe.expire(window_key, DOMAIN_FAILURE_WINDOW)
+    failures = pipe.execute()[0]
+    if failures < DOMAIN_FAILURE_THRESHOLD:
+        return
+
+    count_key = FAILED_DOMAIN_COUNT_KEY.format(domain=domain)
+    count = client.incr(count_key)
+    ttl = _escalated_ttl(FAILURE_BASE_TTL[kind], count)
+    record = {"kind": kind, "status": status, "message": f"{failures}个URL在{DOMAIN_FAILURE_WINDOW}秒内失败",
+              "count": count, "time": int(time.time()), "ttl": ttl, "domain": domain}
+    pipe = client.pipeline()
+    pipe.expire(count_key, FAILURE_COUNT_TTL)
+    pipe.set(FAILED_DOMAIN_KEY.format(domain=domain), json.dumps(record, ensure_ascii=False), ex=ttl)
+    pipe.delete(window_key)
+    pipe.execute()
+    LOGGER.warning(f"域名 {domain} 短时间内多次抓取失败，冷却 {ttl} 秒")
+
+
+def get_recent_failure(url: str) -> Optional[Dict]:
+    """查询 URL 或其域名是否处于失败冷却期，返回失败记录，不在冷却期时返回 None"""
+    try:
+        client = get_redis().get_client()
+        domain = extract_second_level_domain(url)
+        keys = [FAILED_URL_KEY.format(url=canonicalize_url(url))]
+        if domain:
+            keys.append(FAILED_DOMAIN_KEY.format(domain=domain))
+        for value in client.mget(keys):
+            if value:
+                return json.loads(value)
+    except Exception as e:
+        LOGGER.warning(f"查询 {url} 抓取失败记录时出错: {e}")
+    return None
+
+
+def clear_failure(url: str) -> None:
+    """抓取成功后清除 URL 的失败记录"""
+    try:
+        url_key = canonicalize_url(url)
+        get_redis().get_client().delete(FAILED_URL_KEY.format(url=url_key), FAILED_URL_COUNT_KEY.format(url=url_key))
+    except Exception as e:
+        LOGGER.debug(f"清除 {url} 抓取失败记录时出错: {e}")
+
+
+def describe_failure(failure: Dict) -> str:
+    """把失败记录转成给调用方看的说明"""
+    reason = _FAILURE_DESCRIPTIONS.get(failure.get("kind"), "抓取失败")
+    if failure.get("status"):
+        reason = f"{reason} {failure['status']}"
+    target = f"域名 {failure['domain']}" if failure.get("domain") else "该链接"
+    remaining = max(failure.get("time", 0) + failure.get("ttl", 0) - int(time.time()), 0)
+    return f"{target}最近抓取失败（{reason}），约{remaining}秒后可重试"
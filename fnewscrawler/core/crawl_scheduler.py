@@ -0,0 +1,221 @@
+"""
+浏览器页面的优先级调度
+
+所有爬虫通过 crawl_scheduler.new_page 打开页面，同时打开的页面数受 PW_MAX_CONCURRENT_PAGES 限制，
+超出时按优先级排队：interactive（对话中单次调用，默认）、batch（批量抓取、问财新闻查询等扇出任务）、
+background（后台预取）。各类别按权重做加权公平调度（stride 调度），等待超过 CRAWL_STARVATION_TIMEOUT
+秒的请求无论类别都优先放行，避免低优先级任务饿死。页面关闭时自动归还名额。
+
+优先级通过 contextvars 传递：在 `with crawl_priority(PRIORITY_BATCH):` 中创建的任务都按 batch 排队。
+已经持有页面的任务（如问财新闻查询先打开列表页，再并发抓取每条新闻）派生的子任务，
+每个父任务至少可以有一个子任务不受上限约束直接打开页面，避免父任务占满名额后互相等待造成死锁。
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Deque, Dict, Optional
+
+from fnewscrawler.utils.logger import LOGGER
+
+if TYPE_CHECKING:
+    # 只用于类型标注，MCP 工具导入 crawl_priority 时不需要加载 playwright
+    from playwright.async_api import BrowserContext, Page
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_BACKGROUND = "background"
+
+# 各类别的调度权重，权重越大分到的名额越多
+PRIORITY_WEIGHTS = {
+    PRIORITY_INTERACTIVE: 6,
+    PRIORITY_BATCH: 3,
+    PRIORITY_BACKGROUND: 1,
+}
+
+_current_priority: ContextVar[str] = ContextVar("crawl_priority", default=PRIORITY_INTERACTIVE)
+# 当前任务持有的页面名额，子任务通过它判断父任务是否已经持有名额
+_current_slot: ContextVar[Optional["_Slot"]] = ContextVar("crawl_slot", default=None)
+
+
+@contextmanager
+def crawl_priority(priority: str):
+    """在该上下文中打开的页面（包括其中创建的子任务）按指定优先级排队"""
+    if priority not in PRIORITY_WEIGHTS:
+        raise ValueError(f"不支持的优先级: {priority}，支持: {list(PRIORITY_WEIGHTS)}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class _Slot:
+    """一个页面名额"""
+
+    __slots__ = ("priority", "parent", "children", "released", "overflow")
+
+    def __init__(self, priority: str, parent: Optional["_Slot"] = None, overflow: bool = False):
+        self.priority = priority
+        self.parent = parent
+        # 正在使用的子任务名额数
+        self.children = 0
+        self.released = False
+        # 是否为超出上限放行的名额
+        self.overflow = overflow
+
+
+class CrawlScheduler:
+    """按优先级分配浏览器页面名额"""
+
+    def __init__(self):
+        self._capacity = int(os.getenv("PW_MAX_CONCURRENT_PAGES", 10))
+        self._starvation_timeout = float(os.getenv("CRAWL_STARVATION_TIMEOUT", 15))
+        self._active = 0
+        self._waiters: Dict[str, Deque] = {priority: deque() for priority in PRIORITY_WEIGHTS}
+        # stride 调度：每个类别的虚拟时间，每放行一次增加 1/权重，优先放行虚拟时间最小的类别
+        self._pass: Dict[str, float] = {priority: 0.0 for priority in PRIORITY_WEIGHTS}
+        self._granted: Dict[str, int] = {priority: 0 for priority in PRIORITY_WEIGHTS}
+        self._wait_time: Dict[str, float] = {priority: 0.0 for priority in PRIORITY_WEIGHTS}
+        self._starvation_grants = 0
+        self._overflow_grants = 0
+
+    def _parent_slot(self) -> Optional[_Slot]:
+        slot = _current_slot.get()
+        return slot if slot is not None and not slot.released else None
+
+    def _grant(self, slot: _Slot, enqueued_at: float) -> None:
+        self._active += 1
+        if slot.parent is not None:
+            slot.parent.children += 1
+        self._granted[slot.priority] += 1
+        self._wait_time[slot.priority] += time.perf_counter() - enqueued_at
+        self._pass[slot.priority] += 1.0 / PRIORITY_WEIGHTS[slot.priority]
+
+    def _next_priority(self) -> Optional[str]:
+        """选出下一个放行的类别：先处理等待过久的请求，再按虚拟时间最小的类别"""
+        now = time.perf_counter()
+        oldest_priority, oldest_time = None, None
+        for priority, waiters in self._waiters.items():
+            if waiters and (oldest_time is None or waiters[0][2] < oldest_time):
+                oldest_priority, oldest_time = priority, waiters[0][2]
+        if oldest_priority is None:
+            return None
+        if now - oldest_time >= self._starvation_timeout:
+            self._starvation_grants += 1
+            LOGGER.debug(f"{oldest_priority} 类请求已等待 {now - oldest_time:.1f} 秒，优先放行")
+            return oldest_priority
+        return min((p for p, waiters in self._waiters.items() if waiters), key=lambda p: self._pass[p])
+
+    def _dispatch(self) -> None:
+        """有空闲名额时按调度顺序唤醒等待者"""
+        while self._active < self._capacity:
+            priority = self._next_priority()
+            if priority is None:
+                return
+            future, slot, enqueued_at = self._waiters[priority].popleft()
+            if future.done():
+                continue
+            self._grant(slot, enqueued_at)
+            future.set_result(slot)
+
+        # 名额已满时，父任务没有子任务在运行的，放行它排在最前面的一个子任务
+        for waiters in self._waiters.values():
+            for entry in list(waiters):
+                future, slot, enqueued_at = entry
+                if future.done():
+                    waiters.remove(entry)
+                elif slot.parent is not None and not slot.parent.released and slot.parent.children == 0:
+                    waiters.remove(entry)
+                    slot.overflow = True
+                    self._overflow_grants += 1
+                    self._grant(slot, enqueued_at)
+                    future.set_result(slot)
+
+    async def acquire(self, priority: Optional[str] = None) -> _Slot:
+        """获取一个页面名额，没有空闲名额时按优先级排队"""
+        priority = priority or _current_priority.get()
+        parent = self._parent_slot()
+        enqueued_at = time.perf_counter()
+
+        # 父任务还没有子任务占用名额时直接放行，保证扇出任务总能推进
+        if parent is not None and parent.children == 0 and self._active >= self._capacity:
+            slot = _Slot(priority, parent, overflow=True)
+            self._overflow_grants += 1
+            self._grant(slot, enqueued_at)
+            return slot
+
+        slot = _Slot(priority, parent)
+        if self._active < self._capacity and not any(self._waiters.values()):
+            self._grant(slot, enqueued_at)
+            return slot
+
+        waiters = self._waiters[priority]
+        if not waiters:
+            # 空闲过的类别不能积攒额度，虚拟时间至少追上当前排队类别中的最小值
+            busy = [self._pass[p] for p, w in self._waiters.items() if w]
+            if busy:
+                self._pass[priority] = max(self._pass[priority], min(busy))
+        future = asyncio.get_running_loop().create_future()
+        waiters.append((future, slot, enqueued_at))
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # 已经被分配名额但调用方被取消，归还名额
+            if future.done() and not future.cancelled():
+                self.release(slot)
+            raise
+
+    def release(self, slot: _Slot) -> None:
+        """归还页面名额"""
+        if slot.released:
+            return
+        slot.released = True
+        self._active -= 1
+        if slot.parent is not None:
+            slot.parent.children -= 1
+        self._dispatch()
+
+    async def new_page(self, context: "BrowserContext", priority: Optional[str] = None) -> "Page":
+        """
+        按优先级获取名额后在上下文中打开页面，页面关闭时自动归还名额
+
+        Args:
+            context: 浏览器上下文
+            priority: 优先级，默认使用 crawl_priority 设置的值，未设置时为 interactive
+        """
+        slot = await self.acquire(priority)
+        try:
+            page = await context.new_page()
+        except BaseException:
+            self.release(slot)
+            raise
+        page.once("close", lambda _: self.release(slot))
+        _current_slot.set(slot)
+        return page
+
+    def get_stats(self) -> Dict:
+        """调度统计：各类别排队数、放行数和平均等待时间（毫秒）"""
+        return {
+            "capacity": self._capacity,
+            "active": self._active,
+            "starvation_grants": self._starvation_grants,
+            "overflow_grants": self._overflow_grants,
+            "classes": {
+                priority: {
+                    "weight": PRIORITY_WEIGHTS[priority],
+                    "waiting": len(self._waiters[priority]),
+                    "granted": self._granted[priority],
+                    "avg_wait_ms": round(self._wait_time[priority] / self._granted[priority] * 1000, 1)
+                    if self._granted[priority] else 0.0,
+                }
+                for priority in PRIORITY_WEIGHTS
+            },
+        }
+
+
+# 模块级实例，所有爬虫共用
+crawl_scheduler = CrawlScheduler()
@@ -0,0 +1,190 @@
+"""
+数据接口的异步调用
+
+Tushare、akshare 的接口都是阻塞的 HTTP 请求加 pandas 处理，直接在异步爬虫和 MCP 工具里调用会卡住事件循环，
+一次慢请求就会拖慢所有正在进行的浏览器抓取和工具调用。这里把这些调用放到专用的有界线程池中执行：
+
+1. 每个数据源（tushare、akshare）单独限制并发数，避免某个数据源的慢请求占满线程池；
+2. 参数完全相同的并发请求合并为一次调用，结果共享；
+3. 每次调用有超时时间，超时后调用方立即返回，线程中的请求结束后才归还该数据源的并发名额，
+   上游卡住时不会无限堆积线程。
+"""
+import asyncio
+import functools
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fnewscrawler.utils.lazy import LazyImport
+from fnewscrawler.utils.logger import LOGGER
+
+PROVIDER_TUSHARE = "tushare"
+PROVIDER_AKSHARE = "akshare"
+
+# 线程池大小
+MAX_WORKERS = int(os.getenv("DATA_PROVIDER_MAX_WORKERS", 8))
+# 未配置的数据源使用的默认并发数和超时时间（秒）
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 60.0
+
+
+def _parse_provider_config(value: str, cast: Callable) -> Dict[str, Any]:
+    """解析 "tushare=4,akshare=4" 形式的配置"""
+    config = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, number = item.split("=", 1)
+            config[name.strip()] = cast(number.strip())
+    return config
+
+
+# 各数据源的并发数和超时时间。超时包含线程内的限流等待：Tushare 触发频率限制后要等到下一分钟重试（见 tushare_limiter），
+# 超时时间需要大于重试的等待时间，否则被限流的调用都会以超时结束
+PROVIDER_CONCURRENCY = _parse_provider_config(os.getenv("DATA_PROVIDER_CONCURRENCY", "tushare=4,akshare=4"), int)
+PROVIDER_TIMEOUT = _parse_provider_config(os.getenv("DATA_PROVIDER_TIMEOUT", "tushare=150,akshare=60"), float)
+
+
+def _call_name(func: Callable) -> str:
+    """调用的函数名称，用于合并请求和日志，延迟导入的函数不触发导入"""
+    if isinstance(func, LazyImport):
+        return func.target
+    if isinstance(func, functools.partial):
+        return f"{_call_name(func.func)}{func.args}"
+    name = getattr(func, "__qualname__", None)
+    return f"{getattr(func, '__module__', '')}.{name}" if name else repr(func)
+
+
+class AsyncDataProvider:
+    """在专用线程池中执行阻塞的数据接口调用"""
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # 正在执行的调用：调用键 -> Future，相同参数的并发请求共享结果
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._calls = Counter()
+        self._coalesced = Counter()
+        self._timeouts = Counter()
+        self._errors = Counter()
+        self._total_time = Counter()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="data-provider")
+        return self._executor
+
+    def _get_semaphore(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def _run(self, provider: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        semaphore = self._get_semaphore(provider)
+        timeout = PROVIDER_TIMEOUT.get(provider, DEFAULT_TIMEOUT)
+        name = _call_name(func)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                await semaphore.acquire()
+                try:
+                    future = asyncio.get_running_loop().run_in_executor(
+                        self._get_executor(), functools.partial(func, *args, **kwargs))
+                except BaseException:
+                    semaphore.release()
+                    raise
+
+                def on_done(f: asyncio.Future) -> None:
+                    # 线程中的调用真正结束后才归还名额，超时的调用结果直接丢弃
+                    semaphore.release()
+                    if not f.cancelled():
+                        f.exception()
+
+                future.add_done_callback(on_done)
+                return await asyncio.shield(future)
+        except TimeoutError:
+            self._timeouts[provider] += 1
+            LOGGER.warning(f"{provider} 接口 {name} 调用超时（{timeout}秒）")
+            raise TimeoutError(f"{provider} 接口 {name} 调用超时（{timeout}秒）") from None
+        except Exception:
+            self._errors[provider] += 1
+            raise
+        finally:
+            self._total_time[provider] += time.perf_counter() - start
+
+    async def call(self, provider: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        在线程池中执行阻塞调用，参数完全相同的并发请求只执行一次
+
+        Args:
+            provider: 数据源名称，用于并发限制和超时配置，如 PROVIDER_TUSHARE、PROVIDER_AKSHARE
+            func: 阻塞的函数
+            *args, **kwargs: 函数参数
+
+        Returns:
+            函数返回值，多个请求合并时共享同一个返回值，调用方不要原地修改返回的 DataFrame
+
+        Raises:
+            TimeoutError: 调用超时
+        """
+        self._calls[provider] += 1
+        key = (provider, _call_name(func), repr(args), repr(sorted(kwargs.items())))
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._coalesced[provider] += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        # 没有其他请求等待时异常不会被取走，避免"exception was never retrieved"警告
+        pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = pending
+        try:
+            result = await self._run(provider, func, args, kwargs)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            if not pending.done():
+                if isinstance(e, asyncio.CancelledError):
+                    pending.cancel()
+                else:
+                    pending.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def tushare(self, func: Callable, *args, **kwargs) -> Any:
+        """执行 Tushare 调用"""
+        return await self.call(PROVIDER_TUSHARE, func, *args, **kwargs)
+
+    async def akshare(self, func: Callable, *args, **kwargs) -> Any:
+        """执行 akshare 调用"""
+        return await self.call(PROVIDER_AKSHARE, func, *args, **kwargs)
+
+    def close(self) -> None:
+        """关闭线程池，正在执行的调用不再等待"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict:
+        """各数据源的调用、合并、超时、失败次数和平均耗时（毫秒）"""
+        providers = {}
+        for provider in sorted(set(self._calls) | set(PROVIDER_CONCURRENCY)):
+            executed = self._calls[provider] - self._coalesced[provider]
+            providers[provider] = {
+                "concurrency": PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY),
+                "timeout": PROVIDER_TIMEOUT.get(provider, DEFAULT_TIMEOUT),
+                "calls": self._calls[provider],
+                "coalesced": self._coalesced[provider],
+                "timeouts": self._timeouts[provider],
+                "errors": self._errors[provider],
+                "avg_ms": round(self._total_time[provider] / executed * 1000, 1) if executed else 0.0,
+            }
+        return {"max_workers": MAX_WORKERS, "inflight": len(self._inflight), "providers": providers}
+
+
+# 模块级实例，所有异步爬虫和 MCP 工具共用
+data_provider = AsyncDataProvider()
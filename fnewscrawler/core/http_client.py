@@ -0,0 +1,124 @@
+"""
+应用级共享的 httpx 客户端
+
+所有基于接口的爬虫共用这里的连接池：保持长连接、可用时启用 HTTP/2、按域名限制并发连接数、
+对网络错误和 429/5xx 响应做带随机抖动的指数退避重试，并根据已安装的解码库声明 gzip/brotli 压缩。
+不同站点需要的请求头各不相同，由调用方在请求时传入。应用关闭时在 lifespan 中统一关闭。
+"""
+import asyncio
+import importlib.util
+import os
+import random
+from typing import Dict, Optional
+
+import httpx
+
+from fnewscrawler.utils.logger import LOGGER
+
+# 需要重试的响应状态码
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 安装了 h2 才能启用 HTTP/2，安装了 brotli 才能解码 br 压缩
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+BROTLI_AVAILABLE = (importlib.util.find_spec("brotli") is not None
+                    or importlib.util.find_spec("brotlicffi") is not None)
+
+
+class HttpClientManager:
+    """
+    共享 httpx.AsyncClient 管理器，按名称缓存客户端，默认所有爬虫使用同一个 "default" 客户端
+    """
+
+    def __init__(self):
+        self._timeout = float(os.getenv("HTTP_CLIENT_TIMEOUT", 30))
+        self._max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+        self._max_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+        self._max_retries = int(os.getenv("HTTP_MAX_RETRIES", 2))
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get_client(self, name: str = "default") -> httpx.AsyncClient:
+        """获取指定名称的共享客户端，第一次调用时创建，保证在事件循环中创建"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=self._max_connections,
+                                    max_keepalive_connections=self._max_connections,
+                                    keepalive_expiry=60),
+                headers={"Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"},
+                follow_redirects=True,
+            )
+            self._clients[name] = client
+            LOGGER.info(f"共享HTTP客户端 {name} 已创建，HTTP/2: {HTTP2_AVAILABLE}，brotli: {BROTLI_AVAILABLE}")
+        return client
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """每个域名一个信号量，限制对同一站点的并发连接数"""
+        host = httpx.URL(url).host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """指数退避加随机抖动，避免并发请求同时重试"""
+        return min(0.5 * 2 ** attempt, 8.0) + random.uniform(0, 0.5)
+
+    async def request(self, method: str, url: str, client_name: str = "default",
+                      retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        发送请求，网络错误或 429/5xx 响应时自动重试
+
+        Args:
+            method: 请求方法
+            url: 请求地址
+            client_name: 使用的共享客户端名称
+            retries: 最大重试次数，默认读取 HTTP_MAX_RETRIES
+            **kwargs: 透传给 httpx 的参数，如 params、headers、json
+
+        Returns:
+            httpx.Response: 最后一次请求的响应，调用方自行 raise_for_status
+
+        Raises:
+            httpx.TransportError: 重试耗尽后仍然网络错误
+        """
+        retries = self._max_retries if retries is None else retries
+        client = self.get_client(client_name)
+        semaphore = self._get_host_semaphore(url)
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+                LOGGER.warning(f"请求 {url} 返回 {response.status_code}，第{attempt + 1}次重试")
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                LOGGER.warning(f"请求 {url} 网络错误: {e}，第{attempt + 1}次重试")
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """发送GET请求，参数同 request"""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """发送POST请求，参数同 request"""
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """关闭所有共享客户端"""
+        for name, client in list(self._clients.items()):
+            if not client.is_closed:
+                await client.aclose()
+                LOGGER.info(f"共享HTTP客户端 {name} 已关闭")
+        self._clients.clear()
+        self._host_semaphores.clear()
+
+
+# 模块级实例，所有基于接口的爬虫共用
+http_client_manager = HttpClientManager()
@@ -2,7 +2,13 @@ import asyncio
 
 from playwright.async_api import TimeoutError
 
+from fnewscrawler.core.content_extract import (extract_main_content, get_learned_selector, record_extraction,
+                                                record_learned_selector_hit, record_learned_selector_miss)
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.crawl_failures import (FAILURE_EMPTY, FAILURE_HTTP, classify_exception, clear_failure,
+                                              get_recent_failure, record_failure)
+from fnewscrawler.core.redirect_map import resolve_redirect, save_redirect
 from fnewscrawler.core.redis_manager import get_cached_news_content, cache_news_content
 from fnewscrawler.utils import extract_second_level_domain, LOGGER
 
@@ -155,13 +161,19 @@ async def news_crawl_from_url(url: str, context_type: str = "common") -> tuple:
 
        该函数会首先检查缓存中是否存在对应URL的新闻内容。如果存在则直接返回缓存内容，
        否则会使用浏览器访问URL并提取新闻内容。对于不同网站，使用预定义的CSS选择器
-       来定位新闻正文。如果选择器无法获取内容，则返回整个页面内容。最后将获取的内容
-       缓存以供后续使用。
+       来定位新闻正文；没有预定义选择器的网站使用已学习的选择器，或在页面内对正文打分提取，
+       并为该网站学习选择器。都无法获取内容时返回整个页面内容。最后将获取的内容缓存以供后续使用。
 
        Args:
            url: 需要爬取的新闻URL。
            context_type: 浏览器上下文类型，默认为"common"。
 
+       缓存以规范化后的URL为键。跳转链接的最终地址会记录到跳转映射中，再次请求时在打开浏览器之前
+       就能命中最终地址的缓存，缓存过期时也直接访问最终地址；问财、同花顺等域名的未知链接先用HTTP请求解析跳转。
+
+       抓取失败时按失败类型（超时、HTTP错误、正文为空）写入负缓存，冷却期内再次请求该URL或该域名时
+       直接返回空内容，不再打开浏览器页面，可以通过 get_recent_failure 查询失败原因。
+
        Returns:
            tuple: 包含新闻URL和新闻内容的元组。如果新闻内容为空，则返回空字符串。
            新闻URL是指实际访问的URL，可能与输入的URL不同，比如带了跳转链接的URL。
@@ -176,27 +188,49 @@ async def news_crawl_from_url(url: str, context_type: str = "common") -> tuple:
         if news_content:
             return url, news_content
 
+        # 最近抓取失败过的URL或域名直接返回，避免再次等待超时，也不再发出解析跳转的请求
+        if get_recent_failure(url):
+            LOGGER.debug(f"{url} 处于抓取失败冷却期，跳过")
+            return url, ""
+
+        # 已知跳转的链接直接查最终地址的缓存，未知的先用HTTP请求解析服务端跳转
+        final_url = await resolve_redirect(url)
+        if final_url:
+            news_content = get_cached_news_content(final_url)
+            if news_content:
+                return final_url, news_content
+
         context = await context_manager.get_context(context_type)
         # 可以考虑在这里设置一个全局的默认超时，比如 10 秒
         # context.set_default_timeout(10000)
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
 
-        await page.goto(url, wait_until="domcontentloaded")
-        await page.reload()
+        # 已知最终地址时直接访问，省去跳转
+        target_url = final_url or url
+        response = await page.goto(target_url, wait_until="domcontentloaded")
+        response = await page.reload() or response
+        if response is not None and response.status >= 400:
+            record_failure(url, FAILURE_HTTP, status=response.status)
+            return url, ""
 
-        # 获取当前url (可能因为跳转而改变)
-        current_url = await get_real_url(page, url)
-        # print("current url:" , current_url)
-        # 再次尝试获取缓存内容，主要是针对url是带有跳转的情况
-        news_content = get_cached_news_content(current_url)
-        if news_content:
-            return current_url, news_content
+        # 获取当前url (可能因为跳转而改变)，已经是最终地址时不再等待跳转
+        current_url = page.url if final_url else await get_real_url(page, url)
+        if current_url != url:
+            save_redirect(url, current_url)
+            # 再次尝试获取缓存内容，主要是针对url是带有跳转的情况
+            news_content = get_cached_news_content(current_url)
+            if news_content:
+                return current_url, news_content
 
         # 获取二级域名
         second_level_domain = extract_second_level_domain(current_url)
 
-        # 获取新闻选择器
+        # 获取新闻选择器，没有预定义的选择器时使用为该网站学习到的选择器
         news_selector = news_selector_map.get(second_level_domain, None)
+        learned_selector = None
+        if news_selector is None:
+            learned_selector = get_learned_selector(second_level_domain)
+            news_selector = learned_selector
         # 用一个更明确的变量名
         fail_to_get_specific_content = False
 
@@ -221,18 +255,36 @@ async def news_crawl_from_url(url: str, context_type: str = "common") -> tuple:
         else:  # 如果没有定义选择器
             fail_to_get_specific_content = True
 
-        # 如果通过特定选择器未能获取内容，则获取整个页面的文本内容
+        if learned_selector:
+            if fail_to_get_specific_content or not news_content.strip():
+                fail_to_get_specific_content = True
+                record_learned_selector_miss(second_level_domain)
+            else:
+                record_learned_selector_hit(second_level_domain)
+
+        # 如果通过特定选择器未能获取内容，在页面内对正文打分，选出文字最密集的块
         if fail_to_get_specific_content:
-            news_content = await page.locator("body").inner_text()  # 这个也会有默认超时
+            extracted = await extract_main_content(page)
+            if extracted and extracted["text"].strip():
+                news_content = extracted["text"]
+                if second_level_domain not in news_selector_map:
+                    record_extraction(second_level_domain, extracted)
+            else:
+                # 打分也失败时获取整个页面的文本内容
+                news_content = await page.locator("body").inner_text()  # 这个也会有默认超时
+
+        if not news_content or not news_content.strip():
+            record_failure(url, FAILURE_EMPTY)
+            return current_url, ""
+        clear_failure(url)
 
-        # 将html内容缓存，如果url不同就缓存两份，主要是假设能尽快的获取到跳转后的内容
-        if url != current_url:
-            cache_news_content(url, news_content)
+        # 只按最终地址缓存一份，源链接通过跳转映射找到这份缓存
         cache_news_content(current_url, news_content)
 
         return current_url, news_content
     except Exception as e:
         LOGGER.error(f"从URL {url} 爬取新闻内容时发生错误: {e}")
+        record_failure(url, classify_exception(e), message=str(e))
         return url, ""
     finally:
         if page:
@@ -0,0 +1,153 @@
+"""
+爬虫页面等待工具
+
+用事件驱动的等待替代固定时长的 sleep：等待指定的XHR响应、等待表格行数或文本变化、
+在限定时间内等待网络空闲。同时记录使用这些等待的爬虫每次调用的耗时，在监控接口中查看。
+"""
+import functools
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional
+
+from playwright.async_api import Locator, Page, Response, TimeoutError as PlaywrightTimeoutError
+
+from fnewscrawler.utils.logger import LOGGER
+
+# 默认等待超时（毫秒）
+DEFAULT_WAIT_TIMEOUT = 10000
+
+_TEXT_CHANGED_JS = """
+([selector, oldText]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.innerText !== oldText;
+}
+"""
+
+_ROW_COUNT_JS = """
+([selector, minCount]) => document.querySelectorAll(selector).length >= minCount
+"""
+
+
+async def wait_for_response(page: Page, url_part: str,
+                            action: Optional[Callable[[], Awaitable]] = None,
+                            timeout: int = DEFAULT_WAIT_TIMEOUT) -> Optional[Response]:
+    """
+    执行动作并等待URL中包含 url_part 的XHR响应
+
+    Args:
+        page: 页面对象
+        url_part: 响应URL需要包含的片段
+        action: 触发请求的动作，如点击翻页，为空时只等待
+        timeout: 超时时间（毫秒）
+
+    Returns:
+        Optional[Response]: 匹配到的响应，超时返回None
+    """
+    try:
+        async with page.expect_response(lambda response: url_part in response.url, timeout=timeout) as response_info:
+            if action is not None:
+                await action()
+        return await response_info.value
+    except PlaywrightTimeoutError:
+        LOGGER.warning(f"等待响应 {url_part} 超时")
+        return None
+
+
+async def get_inner_text(page: Page, selector: str) -> str:
+    """获取第一个匹配元素的文本，元素不存在时返回空字符串，不会等待"""
+    return await page.evaluate(
+        "(selector) => { const el = document.querySelector(selector); return el ? el.innerText : ''; }",
+        selector,
+    )
+
+
+async def wait_for_text_change(page: Page, selector: str, old_text: str,
+                               timeout: int = DEFAULT_WAIT_TIMEOUT) -> bool:
+    """等待元素文本与 old_text 不同，常用于翻页、切换排行后等待表格刷新，超时返回False"""
+    try:
+        await page.wait_for_function(_TEXT_CHANGED_JS, arg=[selector, old_text], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        LOGGER.warning(f"等待 {selector} 内容变化超时")
+        return False
+
+
+async def wait_for_row_count(page: Page, row_selector: str, min_count: int = 1,
+                             timeout: int = DEFAULT_WAIT_TIMEOUT) -> bool:
+    """等待匹配的行数达到 min_count，超时返回False"""
+    try:
+        await page.wait_for_function(_ROW_COUNT_JS, arg=[row_selector, min_count], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        LOGGER.warning(f"等待 {row_selector} 行数达到 {min_count} 超时")
+        return False
+
+
+async def click_and_wait_for_change(page: Page, target: Locator, watch_selector: str,
+                                    timeout: int = DEFAULT_WAIT_TIMEOUT,
+                                    response_url: Optional[str] = None) -> bool:
+    """
+    点击元素后等待 watch_selector 的内容发生变化
+
+    response_url 不为空时先等待点击触发的、URL包含该片段的数据接口响应，响应没有返回时直接返回False，
+    不再等待内容变化的超时
+    """
+    old_text = await get_inner_text(page, watch_selector)
+    if response_url is None:
+        await target.click()
+    elif await wait_for_response(page, response_url, action=target.click, timeout=timeout) is None:
+        return False
+    return await wait_for_text_change(page, watch_selector, old_text, timeout=timeout)
+
+
+async def wait_for_network_quiet(page: Page, timeout: int = 3000) -> bool:
+    """在限定时间内等待网络空闲，超时不抛错，返回是否真正达到空闲"""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# ==================== 耗时统计 ====================
+
+_latency_stats: Dict[str, Dict[str, float]] = {}
+
+
+@asynccontextmanager
+async def timed_step(name: str):
+    """记录代码块的耗时，汇总到耗时报告中"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        cost = time.perf_counter() - start
+        stat = _latency_stats.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+        stat["count"] += 1
+        stat["total"] += cost
+        stat["max"] = max(stat["max"], cost)
+        stat["last"] = cost
+
+
+def timed(name: str):
+    """装饰器，记录异步爬虫函数每次调用的耗时"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with timed_step(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_latency_report() -> Dict[str, Dict[str, float]]:
+    """获取各爬虫的耗时报告，单位毫秒"""
+    return {
+        name: {
+            "count": int(stat["count"]),
+            "avg_ms": round(stat["total"] / stat["count"] * 1000, 1),
+            "max_ms": round(stat["max"] * 1000, 1),
+            "last_ms": round(stat["last"] * 1000, 1),
+        }
+        for name, stat in _latency_stats.items()
+    }
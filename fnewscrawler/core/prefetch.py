@@ -0,0 +1,406 @@
+"""
+后台预取调度
+
+问财新闻列表等 MCP 工具每次调用都要打开浏览器页面，耗时数秒。预取调度器在后台按类 cron 规则定时刷新这些列表页
+（默认交易时段每2分钟、其他时间每30分钟），把结果快照保存在内存和 Redis 中，并以 background 优先级把列表中
+文章的正文预取到新闻缓存。工具调用时快照没有超过允许的陈旧时间（交易时段和非交易时段分别配置）就直接返回快照，
+否则现场抓取并更新快照。华尔街见闻快讯已有后台轮询，调度器启动时拉起配置的频道即可。
+
+cron 规则为5个字段：分 时 日 月 周（周日为0），支持 *、*/n、a、a-b、a-b/n 以及逗号分隔的列表，各字段同时满足才执行，
+时间按北京时间计算。一个任务可以配置多条规则，满足任意一条即执行。多进程部署时通过 Redis 锁保证同一时刻只有一个进程执行任务。
+"""
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, time as dt_time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from fnewscrawler.core.cache_policy import BEIJING_TZ, cache_policy
+from fnewscrawler.core.crawl_scheduler import PRIORITY_BACKGROUND, crawl_priority
+from fnewscrawler.core.redis_manager import get_redis
+from fnewscrawler.utils import lazy_import
+from fnewscrawler.utils.logger import LOGGER
+
+# 交易时段和非交易时段的刷新规则，多条规则用分号分隔，交易时段的规则在11:30午间休市后停止
+MARKET_CRON = os.getenv("PREFETCH_MARKET_CRON", "*/2 9-10,13-14 * * 1-5;0-30/2 11 * * 1-5")
+OFF_HOURS_CRON = os.getenv("PREFETCH_OFF_HOURS_CRON", "*/30 * * * *")
+# 午间休市，期间不按交易时段的规则刷新，陈旧时间按非交易时段计算
+LUNCH_BREAK = (dt_time(11, 30), dt_time(13, 0))
+# 快照允许的陈旧时间（秒），超过后工具调用现场抓取
+MAX_STALE = int(os.getenv("PREFETCH_MAX_STALE", 300))
+OFF_HOURS_MAX_STALE = int(os.getenv("PREFETCH_OFF_HOURS_MAX_STALE", 3600))
+# 每次刷新列表后预取正文的文章数量和并发数，数量为0表示不预取正文
+ARTICLE_LIMIT = int(os.getenv("PREFETCH_ARTICLE_LIMIT", 10))
+ARTICLE_CONCURRENCY = int(os.getenv("PREFETCH_ARTICLE_CONCURRENCY", 2))
+# 预取的问财新闻列表，名称见 IWENCAI_LIST_JOBS
+IWENCAI_LISTS = [
+    name.strip() for name in os.getenv(
+        "PREFETCH_IWENCAI_LISTS",
+        "financial_quick,macro_economic,financial_market,company,international_economic").split(",")
+    if name.strip()
+]
+# 需要保持后台轮询的华尔街见闻快讯频道
+WALLSTREETCN_CATEGORIES = [
+    category.strip() for category in os.getenv("PREFETCH_WALLSTREETCN_CATEGORIES", "global").split(",")
+    if category.strip()
+]
+
+# 问财新闻列表：简称 -> (快照名称，即对应的 MCP 工具名, 爬虫函数)
+IWENCAI_LIST_JOBS = {
+    "financial_quick": ("iwencai_financial_quick_news", "financial_quick_news_info"),
+    "financial_people": ("iwencai_financial_people_news", "financial_people_news_info"),
+    "financial_market": ("iwencai_financial_market_news", "financial_market_news_info"),
+    "comment": ("iwencai_comment_news", "comment_news_info"),
+    "macro_economic": ("iwencai_macro_economic_news", "macro_economic_news_info"),
+    "product_economic": ("iwencai_product_economic_news", "product_economic_news_info"),
+    "international_economic": ("iwencai_international_economic_news", "international_economic_news_info"),
+    "region": ("iwencai_region_news", "region_news_info"),
+    "company": ("iwencai_company_news", "company_news_info"),
+}
+
+SNAPSHOT_KEY = "prefetch:snapshot:{name}"
+JOB_LOCK_KEY = "prefetch:lock:{name}"
+# 快照在 Redis 中最多保留的时间，过期后必须现场抓取
+SNAPSHOT_TTL = 86400
+# 记录已预取过正文的链接数量上限，避免每次刷新都重复检查缓存
+PREFETCHED_URLS_SIZE = 2000
+
+_CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            # 5/10 表示从5开始每10个单位
+            start = int(part)
+            end = high if step > 1 else start
+        if step <= 0 or start < low or end > high or start > end:
+            raise ValueError(f"cron 字段 {field} 超出范围 {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronRule:
+    """类 cron 的执行规则：分 时 日 月 周"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 规则需要5个字段（分 时 日 月 周）: {expression}")
+        self.expression = expression
+        self._fields = [_parse_cron_field(field, low, high) for field, (low, high) in zip(fields, _CRON_RANGES)]
+
+    def matches(self, moment: datetime) -> bool:
+        minutes, hours, days, months, weekdays = self._fields
+        # datetime.weekday 周一为0，cron 周日为0
+        return (moment.minute in minutes and moment.hour in hours and moment.day in days
+                and moment.month in months and (moment.weekday() + 1) % 7 in weekdays)
+
+    def __repr__(self) -> str:
+        return f"CronRule({self.expression!r})"
+
+
+def parse_cron_rules(expressions: str) -> List[CronRule]:
+    """解析分号分隔的多条 cron 规则"""
+    return [CronRule(expression.strip()) for expression in expressions.split(";") if expression.strip()]
+
+
+def beijing_now() -> datetime:
+    return datetime.now(BEIJING_TZ)
+
+
+def is_market_hours(moment: Optional[datetime] = None) -> bool:
+    """是否处于A股连续交易时段（按交易日历判断交易日，9:15-15:00，不含午间休市）"""
+    moment = moment or beijing_now()
+    if LUNCH_BREAK[0] < moment.time() < LUNCH_BREAK[1]:
+        return False
+    return cache_policy.is_trading_session(moment.replace(tzinfo=None))
+
+
+def current_max_stale() -> int:
+    """当前时段快照允许的陈旧时间（秒）"""
+    return MAX_STALE if is_market_hours() else OFF_HOURS_MAX_STALE
+
+
+class PrefetchJob:
+    """一个预取任务"""
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Any]], rules: List[CronRule],
+                 article_urls: Optional[Callable[[Any], List[str]]] = None,
+                 is_valid: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            name: 任务名称，同时作为快照名称
+            fetch: 抓取数据的协程函数，返回值需要可以 JSON 序列化，不满足 is_valid 时不更新快照
+            rules: 执行规则，满足任意一条即执行
+            article_urls: 从抓取结果中取出需要预取正文的链接，为空表示不预取正文
+            is_valid: 判断抓取结果是否可以作为快照，抓取失败时爬虫可能返回空列表而不是抛出异常，
+                不可用的结果不会覆盖之前的快照；为空表示返回值非空即可用
+        """
+        self.name = name
+        self.fetch = fetch
+        self.rules = rules
+        self.article_urls = article_urls
+        self.is_valid = is_valid or bool
+        self.runs = 0
+        self.failures = 0
+        self.last_run_at: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def is_due(self, moment: datetime) -> bool:
+        return any(rule.matches(moment) for rule in self.rules)
+
+
+def _news_list_urls(data: Dict) -> List[str]:
+    return [item["url"] for item in data.get("news_list", []) if item.get("url")]
+
+
+def _has_news_list(data: Any) -> bool:
+    """问财列表抓取失败时返回 {"news_list": [], ...}，只有列表不为空才算抓取成功"""
+    return isinstance(data, dict) and bool(data.get("news_list"))
+
+
+class PrefetchScheduler:
+    """后台预取调度器"""
+
+    def __init__(self):
+        self._jobs: Dict[str, PrefetchJob] = {}
+        # 快照：名称 -> {"fetched_at": 时间戳, "data": 数据}
+        self._snapshots: Dict[str, Dict] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._article_semaphore: Optional[asyncio.Semaphore] = None
+        self._prefetched_urls: "OrderedDict[str, None]" = OrderedDict()
+        self._node = f"{os.getenv('DEPLOY_NODE_NAME', 'default')}:{os.getpid()}"
+        self._snapshot_hits = 0
+        self._snapshot_misses = 0
+        self._articles_prefetched = 0
+
+    def register(self, job: PrefetchJob) -> None:
+        """注册预取任务，同名任务会被替换"""
+        self._jobs[job.name] = job
+
+    def register_default_jobs(self) -> None:
+        """注册默认的问财新闻列表预取任务"""
+        rules = parse_cron_rules(MARKET_CRON) + parse_cron_rules(OFF_HOURS_CRON)
+        for list_name in IWENCAI_LISTS:
+            if list_name not in IWENCAI_LIST_JOBS:
+                LOGGER.warning(f"未知的问财新闻列表: {list_name}，支持: {list(IWENCAI_LIST_JOBS)}")
+                continue
+            job_name, spider_name = IWENCAI_LIST_JOBS[list_name]
+            spider = lazy_import("fnewscrawler.spiders.iwencai", spider_name)
+            self.register(PrefetchJob(job_name, lambda spider=spider: spider(1), rules, _news_list_urls,
+                                     _has_news_list))
+
+    # ---------------- 快照 ----------------
+
+    def _store_snapshot(self, name: str, data: Any) -> None:
+        snapshot = {"fetched_at": time.time(), "data": data}
+        self._snapshots[name] = snapshot
+        try:
+            get_redis().get_client().set(SNAPSHOT_KEY.format(name=name),
+                                         json.dumps(snapshot, ensure_ascii=False), ex=SNAPSHOT_TTL)
+        except Exception as e:
+            LOGGER.warning(f"保存预取快照 {name} 失败: {e}")
+
+    def _load_snapshot(self, name: str) -> Optional[Dict]:
+        snapshot = self._snapshots.get(name)
+        try:
+            # 其他进程可能刷新了更新的快照
+            value = get_redis().get_client().get(SNAPSHOT_KEY.format(name=name))
+        except Exception as e:
+            LOGGER.debug(f"读取预取快照 {name} 失败: {e}")
+            return snapshot
+        if value:
+            stored = json.loads(value)
+            if snapshot is None or stored["fetched_at"] > snapshot["fetched_at"]:
+                snapshot = self._snapshots[name] = stored
+        return snapshot
+
+    def get_snapshot(self, name: str, max_stale: Optional[int] = None) -> Optional[Any]:
+        """
+        读取快照数据
+
+        Args:
+            name: 快照名称
+            max_stale: 允许的陈旧时间（秒），默认按当前是否为交易时段取 PREFETCH_MAX_STALE 或 PREFETCH_OFF_HOURS_MAX_STALE
+
+        Returns:
+            快照数据，不存在或已经超过陈旧时间时返回 None
+        """
+        snapshot = self._load_snapshot(name)
+        if snapshot is None:
+            return None
+        max_stale = current_max_stale() if max_stale is None else max_stale
+        if time.time() - snapshot["fetched_at"] > max_stale:
+            return None
+        return snapshot["data"]
+
+    async def serve(self, name: str, fetch: Callable[[], Awaitable[Any]], max_stale: Optional[int] = None) -> Any:
+        """
+        快照足够新时直接返回快照，否则调用 fetch 现场抓取，结果满足任务的 is_valid 时更新快照
+
+        没有启用预取（name 不是已注册的任务）时直接调用 fetch，保持现场抓取的行为。
+        """
+        if name not in self._jobs:
+            return await fetch()
+        data = self.get_snapshot(name, max_stale)
+        if data is not None:
+            self._snapshot_hits += 1
+            return data
+        self._snapshot_misses += 1
+        data = await fetch()
+        if self._jobs[name].is_valid(data):
+            self._store_snapshot(name, data)
+        return data
+
+    # ---------------- 调度 ----------------
+
+    def _acquire_job_lock(self, name: str) -> bool:
+        """多进程部署时同一分钟内只允许一个进程执行任务，Redis 不可用时直接执行"""
+        try:
+            return bool(get_redis().get_client().set(JOB_LOCK_KEY.format(name=name), self._node, nx=True, ex=55))
+        except Exception as e:
+            LOGGER.debug(f"获取预取任务锁 {name} 失败: {e}")
+            return True
+
+    async def _prefetch_article(self, url: str) -> None:
+        from fnewscrawler.core.news_crawl import news_crawl_from_url
+        async with self._article_semaphore:
+            try:
+                _, content = await news_crawl_from_url(url)
+            except Exception as e:
+                LOGGER.debug(f"预取正文 {url} 失败: {e}")
+                return
+        if content:
+            self._articles_prefetched += 1
+
+    async def _prefetch_articles(self, urls: List[str]) -> None:
+        """预取还没有预取过的文章正文，已缓存或处于失败冷却期的链接由 news_crawl_from_url 直接返回"""
+        new_urls = [url for url in urls[:ARTICLE_LIMIT] if url not in self._prefetched_urls]
+        if not new_urls:
+            return
+        for url in new_urls:
+            self._prefetched_urls[url] = None
+        while len(self._prefetched_urls) > PREFETCHED_URLS_SIZE:
+            self._prefetched_urls.popitem(last=False)
+        await asyncio.gather(*[self._prefetch_article(url) for url in new_urls])
+
+    async def run_job(self, job: PrefetchJob) -> None:
+        """执行一次预取任务"""
+        start = time.perf_counter()
+        job.last_run_at = time.time()
+        job.runs += 1
+        try:
+            with crawl_priority(PRIORITY_BACKGROUND):
+                data = await job.fetch()
+                if job.is_valid(data):
+                    self._store_snapshot(job.name, data)
+                    job.last_error = None
+                    if job.article_urls and ARTICLE_LIMIT > 0:
+                        await self._prefetch_articles(job.article_urls(data))
+                else:
+                    # 抓取结果不可用，保留之前的快照
+                    job.failures += 1
+                    job.last_error = "抓取结果为空，未更新快照"
+                    LOGGER.warning(f"预取任务 {job.name} 抓取结果为空，保留之前的快照")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            LOGGER.warning(f"预取任务 {job.name} 执行失败: {e}")
+        finally:
+            job.last_duration = time.perf_counter() - start
+
+    def _run_due_jobs(self, moment: datetime) -> None:
+        for job in self._jobs.values():
+            running = self._running.get(job.name)
+            if running is not None and not running.done():
+                # 上一次还没执行完，跳过本次
+                continue
+            if job.is_due(moment) and self._acquire_job_lock(job.name):
+                self._running[job.name] = asyncio.create_task(self.run_job(job))
+
+    async def _run(self) -> None:
+        while True:
+            # 对齐到下一分钟的开始
+            now = beijing_now()
+            await asyncio.sleep(60 - now.second - now.microsecond / 1e6)
+            try:
+                self._run_due_jobs(beijing_now())
+            except Exception as e:
+                LOGGER.warning(f"预取调度出错: {e}")
+
+    async def _start_wallstreetcn(self) -> None:
+        from fnewscrawler.spiders.wallstreetcn.live_poller import wallstreetcn_live_poller
+        for category in WALLSTREETCN_CATEGORIES:
+            try:
+                await wallstreetcn_live_poller.ensure_started(category)
+            except Exception as e:
+                LOGGER.warning(f"启动华尔街见闻({category})快讯轮询失败: {e}")
+
+    async def start(self) -> None:
+        """注册默认任务并启动调度，启动时对没有可用快照的任务立即执行一次"""
+        if self._task is not None and not self._task.done():
+            return
+        if not self._jobs:
+            self.register_default_jobs()
+        self._article_semaphore = asyncio.Semaphore(max(ARTICLE_CONCURRENCY, 1))
+        self._running["_wallstreetcn"] = asyncio.create_task(self._start_wallstreetcn())
+        for job in self._jobs.values():
+            if self.get_snapshot(job.name) is None and self._acquire_job_lock(job.name):
+                self._running[job.name] = asyncio.create_task(self.run_job(job))
+        self._task = asyncio.create_task(self._run())
+        LOGGER.info(f"后台预取调度已启动，任务: {list(self._jobs)}")
+
+    async def stop(self) -> None:
+        """停止调度和正在执行的任务"""
+        tasks = [task for task in self._running.values() if not task.done()]
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
+        self._task = None
+
+    def get_stats(self) -> Dict:
+        """预取统计：快照命中情况和各任务的执行情况"""
+        now = time.time()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "market_hours": is_market_hours(),
+            "max_stale": current_max_stale(),
+            "snapshot_hits": self._snapshot_hits,
+            "snapshot_misses": self._snapshot_misses,
+            "articles_prefetched": self._articles_prefetched,
+            "jobs": {
+                name: {
+                    "rules": [rule.expression for rule in job.rules],
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_duration": round(job.last_duration, 3) if job.last_duration is not None else None,
+                    "last_error": job.last_error,
+                    "snapshot_age": round(now - self._snapshots[name]["fetched_at"], 1)
+                    if name in self._snapshots else None,
+                }
+                for name, job in self._jobs.items()
+            },
+        }
+
+
+# 模块级实例
+prefetch_scheduler = PrefetchScheduler()
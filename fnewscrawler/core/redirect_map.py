@@ -0,0 +1,102 @@
+"""
+新闻链接跳转映射
+
+问财、同花顺等来源的新闻链接很多是跳转或带统计参数的链接，真实地址要在浏览器打开后才能拿到。
+这里把"规范化后的源链接 -> 最终链接"持久化到 Redis：已知跳转的链接在打开浏览器之前就能命中内容缓存，
+缓存过期时也可以直接访问最终链接，省去跳转和等待地址变化的时间。对于配置的跳转域名，
+未知链接先用一次轻量的 HTTP HEAD（不支持时用 GET）解析服务端跳转，没有跳转的结果也短期记录（映射到自身），
+避免每次抓取都重复请求。
+"""
+import os
+from typing import Optional
+
+import httpx
+
+from fnewscrawler.core.http_client import http_client_manager
+from fnewscrawler.core.redis_manager import get_redis
+from fnewscrawler.utils import canonicalize_url, extract_second_level_domain, get_random_user_agent
+from fnewscrawler.utils.logger import LOGGER
+
+REDIRECT_KEY = "news:redirect:{url}"
+# 跳转关系基本不会变化，保留30天
+REDIRECT_TTL = 30 * 86400
+# 需要先用 HTTP 请求解析跳转的域名（二级域名）
+REDIRECT_RESOLVE_DOMAINS = {
+    domain.strip() for domain in os.getenv("NEWS_REDIRECT_RESOLVE_DOMAINS", "10jqka,iwencai").split(",")
+    if domain.strip()
+}
+# HTTP 解析没有发现跳转的记录保留1天，页面改版后可以重新解析
+NO_REDIRECT_TTL = 86400
+# HTTP 解析跳转的超时时间（秒）
+REDIRECT_RESOLVE_TIMEOUT = 3.0
+
+
+def _get_redirect_entry(source_key: str) -> Optional[str]:
+    """读取跳转记录，值等于 source_key 表示已解析过且没有跳转"""
+    try:
+        value = get_redis().get_client().get(REDIRECT_KEY.format(url=source_key))
+        return value.decode("utf-8") if value else None
+    except Exception as e:
+        LOGGER.warning(f"查询 {source_key} 的跳转记录失败: {e}")
+        return None
+
+
+def get_known_redirect(url: str) -> Optional[str]:
+    """查询已知的跳转目标，没有记录或已知没有跳转时返回 None"""
+    source_key = canonicalize_url(url)
+    final_url = _get_redirect_entry(source_key)
+    return None if final_url == source_key else final_url
+
+
+def save_redirect(source_url: str, final_url: str) -> None:
+    """记录跳转关系，源链接和最终链接规范化后相同时不记录"""
+    source_key = canonicalize_url(source_url)
+    if source_key == canonicalize_url(final_url):
+        return
+    try:
+        get_redis().get_client().set(REDIRECT_KEY.format(url=source_key), final_url, ex=REDIRECT_TTL)
+        LOGGER.debug(f"记录跳转: {source_url} -> {final_url}")
+    except Exception as e:
+        LOGGER.warning(f"记录 {source_url} 的跳转失败: {e}")
+
+
+def _save_no_redirect(source_key: str) -> None:
+    try:
+        get_redis().get_client().set(REDIRECT_KEY.format(url=source_key), source_key, ex=NO_REDIRECT_TTL)
+    except Exception as e:
+        LOGGER.warning(f"记录 {source_key} 没有跳转失败: {e}")
+
+
+async def resolve_redirect(url: str) -> Optional[str]:
+    """
+    查询跳转映射，没有记录时用 HTTP 请求解析服务端跳转，只解析 REDIRECT_RESOLVE_DOMAINS 中的域名
+
+    Returns:
+        str | None: 已知或解析到跳转时返回最终链接，解析到的跳转写入跳转映射；没有跳转、不在解析范围内或请求失败时
+        返回 None，没有跳转的结果记录 NO_REDIRECT_TTL 秒，期间不再发出 HTTP 请求。
+        页面内通过 JavaScript 完成的跳转无法解析，仍由浏览器处理。
+    """
+    source_key = canonicalize_url(url)
+    final_url = _get_redirect_entry(source_key)
+    if final_url is not None:
+        return None if final_url == source_key else final_url
+    if extract_second_level_domain(url) not in REDIRECT_RESOLVE_DOMAINS:
+        return None
+    headers = {"User-Agent": get_random_user_agent()}
+    try:
+        response = await http_client_manager.request("HEAD", url, retries=0, headers=headers,
+                                                     timeout=REDIRECT_RESOLVE_TIMEOUT)
+        if response.status_code in (403, 405, 501):
+            # 部分站点不支持 HEAD
+            response = await http_client_manager.get(url, retries=0, headers=headers,
+                                                     timeout=REDIRECT_RESOLVE_TIMEOUT)
+    except httpx.HTTPError as e:
+        LOGGER.debug(f"HTTP 解析 {url} 的跳转失败: {e}")
+        return None
+
+    final_url = str(response.url)
+    if response.status_code >= 400 or not response.history:
+        _save_no_redirect(source_key)
+        return None
+    save_redirect(url, final_url)
+    return final_url
@@ -6,6 +6,7 @@ from threading import Lock
 from typing import Any, Optional, Union
 import redis
 from fnewscrawler.utils.logger import LOGGER
+from fnewscrawler.utils.url import canonicalize_url
 
 
 class RedisManager:
@@ -378,8 +379,8 @@ def get_redis() -> RedisManager:
 
 
 def cache_news_content(url: str, content: str) -> bool:
-    """缓存新闻内容"""
-    key = f"news:content:{url}"
+    """缓存新闻内容，以规范化后的URL为键"""
+    key = f"news:content:{canonicalize_url(url)}"
     # 从环境变量获取过期时间,单位天,默认3天
     expired_time = int(os.environ.get("NEWS_CONTENT_EXPIRED_TIME", 3)) * 86400
     return redis_manager.set(key, content, ex=expired_time, serializer='str')
@@ -387,5 +388,5 @@ def cache_news_content(url: str, content: str) -> bool:
 
 def get_cached_news_content(url: str) -> Optional[str]:
     """获取缓存的新闻内容"""
-    key = f"news:content:{url}"
+    key = f"news:content:{canonicalize_url(url)}"
     return redis_manager.get(key, serializer='str')
@@ -0,0 +1,118 @@
+"""
+浏览器内表格提取
+
+在页面内通过一次 evaluate 把表格单元格序列化成 JSON 数组，再直接构造 DataFrame，
+替代 inner_html + pandas.read_html 的方式，避免把整段 HTML 传回 Python 再用 lxml/html5lib 解析。
+"""
+from typing import Dict, List, Optional
+
+import pandas as pd
+from playwright.async_api import Locator
+
+# 在浏览器内执行的表格序列化脚本，处理 rowspan/colspan，返回表头行和数据行
+_TABLE_TO_JSON_JS = """
+(el, attrColumns) => {
+    const table = el.tagName === 'TABLE' ? el : el.querySelector('table');
+    if (!table) {
+        return null;
+    }
+    const cellText = (cell) => cell.textContent.replace(/\\s+/g, ' ').trim();
+    const toGrid = (rows, isBody) => {
+        const grid = rows.map(() => []);
+        rows.forEach((tr, r) => {
+            let c = 0;
+            for (const cell of tr.cells) {
+                while (grid[r][c] !== undefined) {
+                    c++;
+                }
+                let value = cellText(cell);
+                if (isBody) {
+                    if (attrColumns && attrColumns[c] !== undefined) {
+                        const link = cell.querySelector('a');
+                        value = link ? link.getAttribute(attrColumns[c]) : null;
+                    } else if (value === '') {
+                        value = null;
+                    }
+                }
+                const rowSpan = Math.max(cell.rowSpan || 1, 1);
+                const colSpan = Math.max(cell.colSpan || 1, 1);
+                for (let i = 0; i < rowSpan && r + i < rows.length; i++) {
+                    for (let j = 0; j < colSpan; j++) {
+                        grid[r + i][c + j] = value;
+                    }
+                }
+                c += colSpan;
+            }
+        });
+        return grid;
+    };
+
+    let headerRows = table.tHead ? Array.from(table.tHead.rows) : [];
+    let bodyRows = Array.from(table.tBodies).flatMap(tbody => Array.from(tbody.rows));
+    if (!table.tHead && table.tBodies.length === 0) {
+        bodyRows = Array.from(table.rows);
+    }
+    // 没有thead时，与read_html一致，把开头全部由th组成的行当作表头
+    if (headerRows.length === 0) {
+        while (bodyRows.length > 0 && bodyRows[0].cells.length > 0
+               && Array.from(bodyRows[0].cells).every(cell => cell.tagName === 'TH')) {
+            headerRows.push(bodyRows.shift());
+        }
+    }
+    return {
+        headers: toGrid(headerRows, false),
+        rows: toGrid(bodyRows, true),
+    };
+}
+"""
+
+
+def _infer_column_types(df: pd.DataFrame) -> pd.DataFrame:
+    """按列推断数值类型，整列都能解析为数字时才转换（千分位逗号会被去掉），与read_html的行为保持一致"""
+    # 按位置遍历，避免多级表头展开后出现重名列
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if series.dtype != object or series.isna().all():
+            continue
+        try:
+            df.isetitem(i, pd.to_numeric(series.str.replace(",", "", regex=False)))
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return df
+
+
+async def extract_table(locator: Locator,
+                        attr_columns: Optional[Dict[int, str]] = None,
+                        infer_types: bool = True) -> pd.DataFrame:
+    """
+    通过一次 evaluate 在浏览器内提取表格数据并构造 DataFrame
+
+    Args:
+        locator: 表格元素本身，或包含表格的容器元素（取其中第一个 table）
+        attr_columns: 需要读取属性而非文本的列，键为列序号(从0开始)，值为单元格内第一个a标签的属性名，
+                      例如 {16: "title"} 用于获取被截断文字的完整内容
+        infer_types: 是否推断数值列类型
+
+    Returns:
+        pd.DataFrame: 表格数据，表头宽度与数据列数一致时使用表头（多级表头取最后一级），否则使用默认列号；
+                      未找到表格时返回空的 DataFrame
+    """
+    js_attr_columns = {str(k): v for k, v in (attr_columns or {}).items()}
+    data = await locator.evaluate(_TABLE_TO_JSON_JS, js_attr_columns)
+    if not data or not data["rows"]:
+        return pd.DataFrame()
+
+    rows: List[list] = data["rows"]
+    width = max(len(row) for row in rows)
+    rows = [row + [None] * (width - len(row)) for row in rows]
+
+    columns = None
+    if data["headers"]:
+        last_header = data["headers"][-1]
+        if len(last_header) == width:
+            columns = last_header
+
+    df = pd.DataFrame(rows, columns=columns)
+    if infer_types:
+        df = _infer_column_types(df)
+    return df
@@ -6,9 +6,15 @@ import pandas as pd
 import tushare as ts
 
 from fnewscrawler.utils import LOGGER
+from .cache_policy import cache_policy
+from .data_provider import data_provider
 from .redis_manager import redis_manager
+from .tushare_limiter import tushare_batcher, tushare_limiter
 import threading
 
+# 日线接口返回的字段
+DAILY_FIELDS = ["ts_code", "trade_date", "open", "high", "low", "close", "pre_close", "change", "pct_chg", "vol", "amount"]
+
 
 class TushareDataProvider:
     _instance = None
@@ -41,9 +47,20 @@ class TushareDataProvider:
                 self.pro = None
             self._initialized = True
 
-    def cache_dataframe(self, query_key: str, df: pd.DataFrame, expired_time: int = None) -> bool:
-        """缓存股票数据"""
+    def cache_dataframe(self, query_key: str, df: pd.DataFrame, expired_time: int = None,
+                        dataset: str = None, end_date: str = None) -> bool:
+        """缓存股票数据
+
+        Args:
+            query_key: 查询键
+            df: 数据
+            expired_time: 过期时间（秒），优先级最高
+            dataset: 数据集名称，按交易日历在下一次数据更新时过期，见 cache_policy.DATASET_POLICIES
+            end_date: 查询区间的结束日期，格式'YYYYMMDD'，纯历史区间的数据缓存更久
+        """
         key = f"stock:dataframe:{query_key}"
+        if expired_time is None and dataset is not None:
+            expired_time = cache_policy.ttl(dataset, end_date)
         # 从环境变量获取过期时间,单位天,默认3天
         if expired_time is None:
             expired_time = int(os.environ.get("STOCK_DATAFRAME_EXPIRED_TIME", 3)) * 86400
@@ -70,6 +87,35 @@ class TushareDataProvider:
         else:
             raise ValueError(f"未知股票代码类型: {stock_code}")
 
+    def query(self, api_name: str, **params) -> pd.DataFrame:
+        """调用 Tushare 接口，按接口限流，有行数上限的接口自动翻页
+
+        Args:
+            api_name: 接口名称，如'daily'、'cyq_perf'
+            **params: 接口参数
+
+        Returns:
+            所有分页合并后的DataFrame
+        """
+        if not self.pro:
+            raise ValueError("Tushare API未初始化")
+        return tushare_limiter.query(self.pro, api_name, **params)
+
+    @staticmethod
+    def _daily_range(start_date: str = None, end_date: str = None) -> tuple:
+        # 默认获取最近30天数据
+        if not end_date:
+            end_date = datetime.now().strftime('%Y%m%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
+        return start_date, end_date
+
+    def _cache_daily(self, querry_key: str, df: pd.DataFrame, adjfactor: bool, end_date: str) -> None:
+        if not df.empty:
+            # 当天数据收盘后才进入tushare数据库，缓存到下一次数据更新，纯历史区间缓存更久
+            self.cache_dataframe(querry_key, df, dataset="daily_qfq" if adjfactor else "daily",
+                                 end_date=end_date)
+
     def get_stock_daily(self, ts_code: str, start_date: str = None, end_date: str = None, adjfactor=False) -> pd.DataFrame:
         """获取股票日线数据
 
@@ -85,44 +131,58 @@ class TushareDataProvider:
             raise ValueError("Tushare API未初始化")
 
         try:
-            # 默认获取最近30天数据
-            if not end_date:
-                end_date = datetime.now().strftime('%Y%m%d')
-            if not start_date:
-                start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
-
+            start_date, end_date = self._daily_range(start_date, end_date)
             querry_key = f"{ts_code}_{start_date}_{end_date}_{adjfactor}"
             df = self.get_cached_dataframe(querry_key)
             if df is not None:
                 LOGGER.info(f"adjfactor={adjfactor}，从缓存获取{ts_code}日线数据成功，共{len(df)}条记录")
                 return df
             if adjfactor:
+                # pro_bar 内部分别调用日线和复权因子接口
+                tushare_limiter.acquire("daily")
+                tushare_limiter.acquire("adj_factor")
                 # adj: 复权类型, None不复权, qfq: 前复权, hfq: 后复权
                 df = ts.pro_bar(ts_code=ts_code, start_date=start_date, end_date=end_date, adj='qfq', adjfactor=adjfactor)
             else:
-                df = self.pro.daily(ts_code=ts_code, start_date=start_date, end_date=end_date, fields=[
-                "ts_code",
-                "trade_date",
-                "open",
-                "high",
-                "low",
-                "close",
-                "pre_close",
-                "change",
-                "pct_chg",
-                "vol",
-                "amount"
-            ])
+                df = self.query("daily", ts_code=ts_code, start_date=start_date, end_date=end_date,
+                                fields=",".join(DAILY_FIELDS))
             LOGGER.info(f"获取{ts_code}日线数据成功，共{len(df)}条记录")
-            if not df.empty:
-                #10分钟缓存，主要是考虑到当天数据可能没进入tushare数据库，缓存太久可能导致不能获取最新的数据
-                self.cache_dataframe(querry_key, df, expired_time=60 * 10)
+            self._cache_daily(querry_key, df, adjfactor, end_date)
             return df
 
         except Exception as e:
             LOGGER.error(f"获取股票日线数据失败: {e}")
             return pd.DataFrame()
 
+    async def get_stock_daily_async(self, ts_code: str, start_date: str = None, end_date: str = None,
+                                    adjfactor=False) -> pd.DataFrame:
+        """异步获取股票日线数据，参数和返回值同 get_stock_daily
+
+        在数据接口线程池中执行，不阻塞事件循环。查询不复权日线时，同一时间窗口内日期区间相同的
+        其他股票请求（如各指标工具默认的最近30天）合并为一次多股票调用，合并后超过行数上限时自动翻页。
+        前复权（adjfactor=True）由 pro_bar 按单只股票计算，不参与合并。
+        """
+        if not self.pro:
+            raise ValueError("Tushare API未初始化")
+        start_date, end_date = self._daily_range(start_date, end_date)
+        if adjfactor:
+            return await data_provider.tushare(self.get_stock_daily, ts_code, start_date, end_date, adjfactor)
+
+        querry_key = f"{ts_code}_{start_date}_{end_date}_{adjfactor}"
+        df = self.get_cached_dataframe(querry_key)
+        if df is not None:
+            LOGGER.info(f"adjfactor={adjfactor}，从缓存获取{ts_code}日线数据成功，共{len(df)}条记录")
+            return df
+        try:
+            df = await tushare_batcher.fetch(self.query, "daily", ts_code, start_date=start_date, end_date=end_date,
+                                             fields=",".join(DAILY_FIELDS))
+        except Exception as e:
+            LOGGER.error(f"获取股票日线数据失败: {e}")
+            return pd.DataFrame()
+        LOGGER.info(f"获取{ts_code}日线数据成功，共{len(df)}条记录")
+        self._cache_daily(querry_key, df, adjfactor, end_date)
+        return df
+
     def get_stock_basic(self, exchange: str = None) -> pd.DataFrame:
         """获取股票基本信息
 
@@ -142,10 +202,10 @@ class TushareDataProvider:
                 LOGGER.info(f"从缓存获取股票基本信息成功，共{len(df)}只股票")
                 return df
 
-            df = self.pro.stock_basic(exchange=exchange, list_status='L')
+            df = self.query("stock_basic", exchange=exchange, list_status='L')
             LOGGER.info(f"获取股票基本信息成功，共{len(df)}只股票")
             if not df.empty:
-                self.cache_dataframe(querry_key, df)
+                self.cache_dataframe(querry_key, df, dataset="stock_basic")
             return df
 
         except Exception as e:
@@ -176,10 +236,10 @@ class TushareDataProvider:
                 end_date = datetime.now().strftime('%Y%m%d')
             if not start_date:
                 start_date = (datetime.now() - timedelta(days=365)).strftime('%Y%m%d')
-            df = self.pro.trade_cal(start_date=start_date, end_date=end_date)
+            df = self.query("trade_cal", start_date=start_date, end_date=end_date)
             LOGGER.info(f"获取交易日历成功，共{len(df)}条记录")
             if not df.empty:
-                self.cache_dataframe(querry_key, df)
+                self.cache_dataframe(querry_key, df, dataset="trade_cal")
             return df
 
         except Exception as e:
@@ -0,0 +1,262 @@
+"""
+Tushare 接口限流、分页和合并请求
+
+Tushare 按接口限制每分钟的调用次数和单次返回的行数（cyq_perf 5000 行、cyq_chips 2000 行、daily 6000 行），
+突发的指标计算请求超过每分钟次数后会直接报错，区间过长时返回的数据会被截断。
+
+1. 限流：每个接口一个令牌桶，桶容量为每分钟次数的 1/5，其余按速率补充，任意 60 秒内的调用不超过配置的次数。
+   令牌不足时在调用线程中等待（调用都在数据接口线程池中执行，不会卡住事件循环）。
+   仍然触发 Tushare 的频率限制时等到下一分钟重试。
+2. 分页：有行数上限的接口按 limit/offset 自动翻页，直到返回的行数少于上限；
+   某一页与上一页完全相同时说明接口忽略了 offset，立即停止，避免白白消耗 MAX_PAGES 次调用。
+3. 合并：支持逗号分隔多个股票代码的接口，日期参数相同的单只股票并发请求在一个很短的时间窗口内合并为一次多股票调用，
+   结果按 ts_code 拆分返回给各个请求。
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Set
+
+import pandas as pd
+
+from fnewscrawler.core.data_provider import data_provider
+from fnewscrawler.utils.logger import LOGGER
+
+# 各接口单次调用返回的最大行数
+ROW_LIMITS = {
+    "cyq_perf": 5000,
+    "cyq_chips": 2000,
+    "daily": 6000,
+}
+# 支持 ts_code 传入多个股票代码（逗号分隔）的接口
+MULTI_CODE_APIS = {"daily"}
+# 自动翻页的最大页数，避免参数错误时无限翻页
+MAX_PAGES = 50
+# 合并请求的等待窗口（秒）和单次合并的最大股票数
+BATCH_WINDOW = 0.05
+BATCH_MAX_CODES = 100
+# 触发 Tushare 频率限制后的最大重试次数
+RATE_LIMIT_RETRIES = 2
+# Tushare 频率限制的报错信息
+RATE_LIMIT_MESSAGE = "每分钟最多访问"
+
+
+def _parse_rate_limits(value: str) -> Dict[str, int]:
+    """解析 "default=200,daily=500" 形式的配置"""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, number = item.split("=", 1)
+            limits[name.strip()] = int(number.strip())
+    return limits
+
+
+# 各接口每分钟调用次数上限，default 为未单独配置的接口
+RATE_LIMITS = _parse_rate_limits(os.getenv("TUSHARE_RATE_LIMITS", "default=200"))
+
+
+class TokenBucket:
+    """线程安全的令牌桶，任意 60 秒内发放的令牌不超过 per_minute 个"""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = max(per_minute, 1)
+        self.capacity = max(self.per_minute // 5, 1)
+        # 容量加上一分钟的补充量等于每分钟上限
+        self.rate = max(self.per_minute - self.capacity, 1) / 60
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.waits = 0
+        self.wait_time = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """预占一个令牌，返回需要等待的秒数，令牌可以预占为负数，保证先到先得"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            wait = -self.tokens / self.rate
+            self.waits += 1
+            self.wait_time += wait
+            return wait
+
+    def acquire(self) -> None:
+        """获取一个令牌，不足时阻塞等待"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TushareRateLimiter:
+    """按接口限流并自动翻页的 Tushare 调用"""
+
+    def __init__(self, limits: Dict[str, int] = None):
+        self._limits = RATE_LIMITS if limits is None else limits
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._pages: Dict[str, int] = {}
+        self._rate_limited = 0
+
+    def _bucket(self, api_name: str) -> TokenBucket:
+        bucket = self._buckets.get(api_name)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(api_name)
+                if bucket is None:
+                    per_minute = self._limits.get(api_name, self._limits.get("default", 200))
+                    bucket = self._buckets[api_name] = TokenBucket(per_minute)
+        return bucket
+
+    def acquire(self, api_name: str) -> None:
+        """调用接口前获取令牌，ts.pro_bar 等封装接口需要为其内部调用的每个接口获取令牌"""
+        self._bucket(api_name).acquire()
+        self._calls[api_name] = self._calls.get(api_name, 0) + 1
+
+    def _call(self, pro, api_name: str, **params) -> pd.DataFrame:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.acquire(api_name)
+            try:
+                return pro.query(api_name, **params)
+            except Exception as e:
+                if RATE_LIMIT_MESSAGE not in str(e) or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                self._rate_limited += 1
+                wait = 61 - time.time() % 60
+                LOGGER.warning(f"Tushare 接口 {api_name} 触发频率限制，{wait:.0f} 秒后重试")
+                time.sleep(wait)
+
+    def query(self, pro, api_name: str, **params) -> pd.DataFrame:
+        """
+        限流调用 Tushare 接口，有行数上限的接口自动翻页
+
+        Args:
+            pro: ts.pro_api() 返回的客户端
+            api_name: 接口名称，如 "daily"、"cyq_perf"
+            **params: 接口参数
+
+        Returns:
+            所有分页合并后的 DataFrame
+        """
+        row_limit = ROW_LIMITS.get(api_name)
+        if row_limit is None or "limit" in params:
+            return self._call(pro, api_name, **params)
+
+        frames: List[pd.DataFrame] = []
+        offset = 0
+        for _ in range(MAX_PAGES):
+            df = self._call(pro, api_name, limit=row_limit, offset=offset, **params)
+            if df is None or df.empty:
+                break
+            if frames and df.reset_index(drop=True).equals(frames[-1].reset_index(drop=True)):
+                LOGGER.warning(f"Tushare 接口 {api_name} 不支持 offset 翻页，返回的数据可能被截断，"
+                               f"请缩短查询区间: {params}")
+                break
+            frames.append(df)
+            self._pages[api_name] = self._pages.get(api_name, 0) + 1
+            if len(df) < row_limit:
+                break
+            offset += row_limit
+        else:
+            LOGGER.warning(f"Tushare 接口 {api_name} 翻页超过 {MAX_PAGES} 页，数据可能不完整: {params}")
+
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+        LOGGER.info(f"Tushare 接口 {api_name} 分 {len(frames)} 页获取，共 {sum(len(f) for f in frames)} 条记录")
+        return pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+
+    def get_stats(self) -> Dict:
+        return {
+            "rate_limited": self._rate_limited,
+            "apis": {
+                api_name: {
+                    "per_minute": bucket.per_minute,
+                    "calls": self._calls.get(api_name, 0),
+                    "pages": self._pages.get(api_name, 0),
+                    "waits": bucket.waits,
+                    "wait_seconds": round(bucket.wait_time, 1),
+                }
+                for api_name, bucket in self._buckets.items()
+            },
+        }
+
+
+class TushareBatcher:
+    """把日期参数相同的单只股票并发请求合并为一次多股票调用"""
+
+    def __init__(self, window: float = BATCH_WINDOW, max_codes: int = BATCH_MAX_CODES):
+        self.window = window
+        self.max_codes = max_codes
+        # 等待中的批次：(接口, 参数) -> {股票代码: [Future, ...]}
+        self._pending: Dict[tuple, Dict[str, List[asyncio.Future]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._requests = 0
+
+    async def fetch(self, query: Callable, api_name: str, ts_code: str, **params) -> pd.DataFrame:
+        """
+        获取单只股票的数据，与同一时间窗口内参数相同的其他股票请求合并调用
+
+        Args:
+            query: 执行调用的阻塞函数，签名同 TushareDataProvider.query(api_name, **params)
+            api_name: 接口名称，必须在 MULTI_CODE_APIS 中
+            ts_code: 单个股票代码
+            **params: 除 ts_code 外的接口参数，一般为 start_date/end_date 或 trade_date
+        """
+        if api_name not in MULTI_CODE_APIS:
+            raise ValueError(f"接口 {api_name} 不支持多股票合并调用")
+        self._requests += 1
+        loop = asyncio.get_running_loop()
+        key = (api_name, repr(sorted(params.items())))
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {}
+            loop.call_later(self.window, self._flush, key, query, api_name, params)
+        future = loop.create_future()
+        batch.setdefault(ts_code, []).append(future)
+        if len(batch) >= self.max_codes:
+            self._flush(key, query, api_name, params)
+        return await future
+
+    def _flush(self, key: tuple, query: Callable, api_name: str, params: dict) -> None:
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.create_task(self._execute(query, api_name, params, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, query: Callable, api_name: str, params: dict,
+                       batch: Dict[str, List[asyncio.Future]]) -> None:
+        self._batches += 1
+        codes = list(batch)
+        try:
+            df = await data_provider.tushare(query, api_name, ts_code=",".join(codes), **params)
+            parts = {code: df[df["ts_code"] == code].reset_index(drop=True) if not df.empty else df
+                     for code in codes}
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        if len(codes) > 1:
+            LOGGER.debug(f"Tushare 接口 {api_name} 合并 {len(codes)} 只股票为一次调用: {params}")
+        for code, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(parts[code])
+
+    def get_stats(self) -> Dict:
+        return {"requests": self._requests, "batches": self._batches}
+
+
+# 模块级实例
+tushare_limiter = TushareRateLimiter()
+tushare_batcher = TushareBatcher()
@@ -1,8 +1,11 @@
-from fnewscrawler.spiders.akshare import stock_cyq_em
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+stock_cyq_em = lazy_import("fnewscrawler.spiders.akshare", "stock_cyq_em")
 
 @mcp_server.tool(title="akshare股票筹码分布获取工具")
-def get_stock_cyq_em(stock_code: str, adjust: str = "") -> str:
+async def get_stock_cyq_em(stock_code: str, adjust: str = "") -> str:
     """获取股票的筹码分布数据。
 
     该函数通过调用akshare接口获取指定股票近90个交易日的筹码分布数据，并以markdown表格格式返回。
@@ -19,9 +22,9 @@ def get_stock_cyq_em(stock_code: str, adjust: str = "") -> str:
         str: 包含筹码分布数据的markdown格式表格字符串。
 
     Examples:
-        >>> result =  get_stock_cyq_em("600519")
+        >>> result = await get_stock_cyq_em("600519")
         >>> print(result)
         | 日期 | 获利比例 | 平均成本 | ...
     """
-    markdown_table = stock_cyq_em(stock_code, adjust)
+    markdown_table = await data_provider.akshare(stock_cyq_em, stock_code, adjust)
     return markdown_table
@@ -1,11 +1,11 @@
-
-
-
-from fnewscrawler.spiders.akshare import ak_daily
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+ak_daily = lazy_import("fnewscrawler.spiders.akshare", "ak_daily")
 
 @mcp_server.tool(title="akshare股票日线数据获取工具")
-def get_stock_daily(stock_code: str, start_date: str, end_date: str, adjust: str = "") -> str:
+async def get_stock_daily(stock_code: str, start_date: str, end_date: str, adjust: str = "") -> str:
     """获取股票的日线数据。
 
     Args:
@@ -17,7 +17,7 @@ def get_stock_daily(stock_code: str, start_date: str, end_date: str, adjust: str
     Returns:
         包含股票日线数据的markdown格式表格字符串，列名包括：日期、股票代码、开盘价、收盘价、最高价、最低价、成交量、成交额、振幅(%)、涨跌幅(%)、涨跌额(元)、换手率(%)
     """
-    daily_table = ak_daily(stock_code, start_date, end_date, adjust)
+    daily_table = await data_provider.akshare(ak_daily, stock_code, start_date, end_date, adjust)
     if daily_table is None:
         return "获取股票日线数据失败"
     if daily_table.empty:
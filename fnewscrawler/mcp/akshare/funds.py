@@ -1,6 +1,8 @@
-import akshare as ak
-
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+ak = lazy_import("akshare")
 
 
 @mcp_server.tool(title="akshare南北向资金流向查询工具")
@@ -31,7 +33,7 @@ async def north_south_bound_fund_flow_em_tool(symbol: str = "北向资金") -> s
 
         # 调用akshare获取资金流向数据
         try:
-            fund_flow_data = ak.stock_hsgt_fund_min_em(symbol=symbol)
+            fund_flow_data = await data_provider.akshare(ak.stock_hsgt_fund_min_em, symbol=symbol)
         except Exception as e:
             return f"错误：获取资金流向数据失败: {str(e)}"
 
@@ -1,10 +1,13 @@
-from fnewscrawler.spiders.akshare import ak_stock_zh_a_disclosure_report_cninfo
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+ak_stock_zh_a_disclosure_report_cninfo = lazy_import("fnewscrawler.spiders.akshare", "ak_stock_zh_a_disclosure_report_cninfo")
 
 
 
 @mcp_server.tool(title="从akshare获取股票信息披露公告数据")
-def get_ak_stock_zh_a_disclosure_report_cninfo(stock_code: str, start_date: str = "20250829")->str:
+async def get_ak_stock_zh_a_disclosure_report_cninfo(stock_code: str, start_date: str = "20250829")->str:
     """从akshare获取股票信息披露公告数据
 
     来源： 巨潮资讯-首页-公告查询-信息披露公告-沪深京股票
@@ -16,7 +19,7 @@ def get_ak_stock_zh_a_disclosure_report_cninfo(stock_code: str, start_date: str
     Returns:
         包含股票信息披露公告数据的markdown表格，列名包括：代码、公告标题、公告时间、公告链接
     """
-    df = ak_stock_zh_a_disclosure_report_cninfo(stock_code, start_date)
+    df = await data_provider.akshare(ak_stock_zh_a_disclosure_report_cninfo, stock_code, start_date)
     markdown_table = df.to_markdown(index=False)
     return markdown_table
 
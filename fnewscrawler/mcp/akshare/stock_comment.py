@@ -1,10 +1,13 @@
-from fnewscrawler.spiders.akshare import ak_stock_comment_detail
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+ak_stock_comment_detail = lazy_import("fnewscrawler.spiders.akshare", "ak_stock_comment_detail")
 
 
 
 @mcp_server.tool(title="从akshare获取股票机构参与度数据")
-def get_ak_stock_comment_detail(stock_code: str)->str:
+async def get_ak_stock_comment_detail(stock_code: str)->str:
     """从akshare获取股票机构参与度数据
     大约最近的44个交易日的数据
 
@@ -14,5 +17,5 @@ def get_ak_stock_comment_detail(stock_code: str)->str:
     Returns:
         包含股票机构参与度数据的markdown表格，列名包括：日期、机构参与度(%)
     """
-    markdown_table = ak_stock_comment_detail(stock_code)
+    markdown_table = await data_provider.akshare(ak_stock_comment_detail, stock_code)
     return markdown_table
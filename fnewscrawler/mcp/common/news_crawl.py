@@ -1,9 +1,13 @@
 import os
 
+from fnewscrawler.core.crawl_scheduler import PRIORITY_BATCH, crawl_priority
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.core.news_crawl import news_crawl_from_url
 import asyncio
-from fnewscrawler.utils import parse_params2list
+from fnewscrawler.utils import lazy_import, parse_params2list
+
+news_crawl_from_url = lazy_import("fnewscrawler.core.news_crawl", "news_crawl_from_url")
+get_recent_failure = lazy_import("fnewscrawler.core.crawl_failures", "get_recent_failure")
+describe_failure = lazy_import("fnewscrawler.core.crawl_failures", "describe_failure")
 
 @mcp_server.tool(title="通用新闻内容提取工具")
 async def news_crawl(url: str) -> str:
@@ -30,8 +34,13 @@ async def news_crawl(url: str) -> str:
         - 仅适用于标准的新闻类网页，对于论坛、博客等非标准页面可能效果不佳
         - 返回内容已自动去除HTML标签、JavaScript代码等非文本内容
         - 对于需要登录才能查看的新闻页面无法抓取
+        - 最近抓取失败的链接会直接返回失败原因和可重试的时间
     """
     _, news_content = await news_crawl_from_url(url)
+    if not news_content:
+        failure = get_recent_failure(url)
+        if failure:
+            return describe_failure(failure)
     return news_content
 
 
@@ -53,7 +62,7 @@ async def news_crawl_batch(urls: list[str]) -> list[dict]:
         list[dict]: 返回结果列表，每个元素为包含以下键的字典:
             - url (str): 原始请求URL
             - content (str): 提取的新闻正文纯文本
-            (对于失败的请求会返回错误信息)
+            - error (str): 仅在抓取失败时提供，说明失败原因和可重试的时间
 
     Raises:
         ValueError: 当输入不是列表或包含无效URL时
@@ -84,10 +93,17 @@ async def news_crawl_batch(urls: list[str]) -> list[dict]:
         async with semaphore:
             return await news_crawl_from_url(url)
 
-    # 使用信号量控制并发抓取所有URL内容
-    tasks = [fetch_with_semaphore(url) for url in urls]
-    results = await asyncio.gather(*tasks)
-
-    # 将结果和URL组合成字典列表
-    return [{"url": url, "content": content}
-            for (url, (_, content)) in zip(urls, results)]
\ No newline at end of file
+    # 使用信号量控制并发抓取所有URL内容，按批量任务排队，避免挤占交互式调用的页面
+    with crawl_priority(PRIORITY_BATCH):
+        tasks = [fetch_with_semaphore(url) for url in urls]
+        results = await asyncio.gather(*tasks)
+
+    # 将结果和URL组合成字典列表，失败的URL附带失败原因
+    items = []
+    for url, (_, content) in zip(urls, results):
+        item = {"url": url, "content": content}
+        failure = None if content else get_recent_failure(url)
+        if failure:
+            item["error"] = describe_failure(failure)
+        items.append(item)
+    return items
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.eastmoney import eastmoney_stock_base_info
+from fnewscrawler.utils import lazy_import
+
+eastmoney_stock_base_info = lazy_import("fnewscrawler.spiders.eastmoney", "eastmoney_stock_base_info")
 
 
 @mcp_server.tool(title="获取股票基本信息", enabled=False)
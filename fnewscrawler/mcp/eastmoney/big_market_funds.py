@@ -1,5 +1,7 @@
-from fnewscrawler.spiders.eastmoney import eastmoney_market_history_funds_flow
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+eastmoney_market_history_funds_flow = lazy_import("fnewscrawler.spiders.eastmoney", "eastmoney_market_history_funds_flow")
 
 
 @mcp_server.tool(title="获取大盘资金流数据")
@@ -1,5 +1,7 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.eastmoney import eastmoney_block_trade_detail
+from fnewscrawler.utils import lazy_import
+
+eastmoney_block_trade_detail = lazy_import("fnewscrawler.spiders.eastmoney", "eastmoney_block_trade_detail")
 
 
 @mcp_server.tool(title="获取股票大宗交易每日明细")
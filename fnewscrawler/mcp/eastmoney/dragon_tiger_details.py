@@ -1,5 +1,8 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.eastmoney import eastmoney_dragon_tiger_detail, eastmoney_stock_dragon_tiger_detail
+from fnewscrawler.utils import lazy_import
+
+eastmoney_dragon_tiger_detail = lazy_import("fnewscrawler.spiders.eastmoney", "eastmoney_dragon_tiger_detail")
+eastmoney_stock_dragon_tiger_detail = lazy_import("fnewscrawler.spiders.eastmoney", "eastmoney_stock_dragon_tiger_detail")
 
 
 @mcp_server.tool(title="获取龙虎榜明细")
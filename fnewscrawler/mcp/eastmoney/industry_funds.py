@@ -1,5 +1,8 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.eastmoney import get_industry_stock_funds_flow, get_industry_history_funds_flow
+from fnewscrawler.utils import lazy_import
+
+get_industry_stock_funds_flow = lazy_import("fnewscrawler.spiders.eastmoney", "get_industry_stock_funds_flow")
+get_industry_history_funds_flow = lazy_import("fnewscrawler.spiders.eastmoney", "get_industry_history_funds_flow")
 
 
 @mcp_server.tool(title="获取行业历史资金流")
@@ -1,11 +1,13 @@
-from fnewscrawler.core import TushareDataProvider
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+TushareDataProvider = lazy_import("fnewscrawler.core.tushare_data_provider", "TushareDataProvider")
 
 
 @mcp_server.tool(
     title="获取指定股票指定日期范围的日线数据"
 )
-def stock_daily(
+async def stock_daily(
         stock_code: str,
         start_date: str,
         end_date: str
@@ -23,7 +25,7 @@ def stock_daily(
     """
     ts_data_provider = TushareDataProvider()
     ts_code = ts_data_provider.code2tscode(stock_code)
-    data = ts_data_provider.get_stock_daily(ts_code, start_date, end_date)
+    data = await ts_data_provider.get_stock_daily_async(ts_code, start_date, end_date)
     if data.empty:
         return "获取股票数据失败"
 
@@ -1,12 +1,13 @@
-from fnewscrawler.core import TushareDataProvider
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.utils import format_param
+from fnewscrawler.utils import lazy_import, format_param
+
+TushareDataProvider = lazy_import("fnewscrawler.core.tushare_data_provider", "TushareDataProvider")
 
 
 @mcp_server.tool(
     title="获取指定股票的KDJ技术指标"
 )
-def stock_kdj(
+async def stock_kdj(
         stock_code: str,
         start_date: str,
         end_date: str,
@@ -30,7 +31,7 @@ def stock_kdj(
     """
     ts_data_provider = TushareDataProvider()
     ts_code = ts_data_provider.code2tscode(stock_code)
-    data = ts_data_provider.get_stock_daily(ts_code, start_date, end_date)
+    data = await ts_data_provider.get_stock_daily_async(ts_code, start_date, end_date)
     fastk_period = format_param(fastk_period, int)
     slowk_period = format_param(slowk_period, int)
     slowd_period = format_param(slowd_period, int)
@@ -1,15 +1,15 @@
-import numpy as np
-import pandas as pd
-
-from fnewscrawler.core import TushareDataProvider
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.utils import format_param
+from fnewscrawler.utils import lazy_import, format_param
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+TushareDataProvider = lazy_import("fnewscrawler.core.tushare_data_provider", "TushareDataProvider")
 
 
 @mcp_server.tool(
     title="获取指定股票的MACD技术指标"
 )
-def stock_macd(
+async def stock_macd(
         stock_code: str,
         start_date: str,
         end_date: str,
@@ -33,7 +33,7 @@ def stock_macd(
     """
     ts_data_provider = TushareDataProvider()
     ts_code = ts_data_provider.code2tscode(stock_code)
-    data = ts_data_provider.get_stock_daily(ts_code, start_date, end_date, adjfactor=True)
+    data = await ts_data_provider.get_stock_daily_async(ts_code, start_date, end_date, adjfactor=True)
 
     if data.empty:
         return "获取股票数据失败"
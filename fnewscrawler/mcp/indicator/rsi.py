@@ -1,15 +1,15 @@
-import pandas as pd
-import talib as ta
-
-from fnewscrawler.core import TushareDataProvider
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.utils import parse_params2list
+from fnewscrawler.utils import lazy_import, parse_params2list
+
+pd = lazy_import("pandas")
+ta = lazy_import("talib")
+TushareDataProvider = lazy_import("fnewscrawler.core.tushare_data_provider", "TushareDataProvider")
 
 
 @mcp_server.tool(
     title="获取股票的RSI技术指标"
 )
-def stock_rsi(
+async def stock_rsi(
         stock_code: str,
         start_date: str,
         end_date: str,
@@ -29,7 +29,7 @@ def stock_rsi(
     """
     ts_data_provider = TushareDataProvider()
     ts_code = ts_data_provider.code2tscode(stock_code)
-    data = ts_data_provider.get_stock_daily(ts_code, start_date, end_date)
+    data = await ts_data_provider.get_stock_daily_async(ts_code, start_date, end_date)
     if data.empty:
         return "获取股票数据失败"
 
@@ -1,5 +1,7 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.iwencai import iwencai_A_stock_selection
+from fnewscrawler.utils import lazy_import
+
+iwencai_A_stock_selection = lazy_import("fnewscrawler.spiders.iwencai", "iwencai_A_stock_selection")
 
 
 @mcp_server.tool(title="智能A股股票筛选工具")
@@ -1,7 +1,9 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.iwencai import iwencai_concept_funds
+from fnewscrawler.utils import lazy_import
 from typing import Literal
 
+iwencai_concept_funds = lazy_import("fnewscrawler.spiders.iwencai", "iwencai_concept_funds")
+
 
 @mcp_server.tool(
     title="同花顺问财概念板块资金流向查询"
@@ -1,5 +1,8 @@
+from fnewscrawler.core.crawl_scheduler import PRIORITY_BATCH, crawl_priority
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.iwencai import iwencai_crawl_from_query
+from fnewscrawler.utils import lazy_import
+
+iwencai_crawl_from_query = lazy_import("fnewscrawler.spiders.iwencai", "iwencai_crawl_from_query")
 
 
 
@@ -70,7 +73,9 @@ async def iwencai_news_query(query: str, page_no: int = 1):
         # 查询宏观经济政策新闻
         result = await iwencai_news_query("央行降息")
     """
-    news_list = await iwencai_crawl_from_query(query, page_no)
+    # 一次查询会并发抓取十几条新闻正文，按批量任务排队，避免挤占交互式调用的页面
+    with crawl_priority(PRIORITY_BATCH):
+        news_list = await iwencai_crawl_from_query(query, page_no)
     news_info = {
         "data": news_list,
         "total": len(news_list),
@@ -1,5 +1,7 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.iwencai import get_history_funds_flow
+from fnewscrawler.utils import lazy_import
+
+get_history_funds_flow = lazy_import("fnewscrawler.spiders.iwencai", "get_history_funds_flow")
 
 
 @mcp_server.tool(title="获取个股历史资金流工具")
@@ -1,7 +1,9 @@
-from fnewscrawler.spiders.iwencai import iwencai_industry_funds
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
 from typing import Literal
 
+iwencai_industry_funds = lazy_import("fnewscrawler.spiders.iwencai", "iwencai_industry_funds")
+
 
 @mcp_server.tool(
     title="同花顺问财行业资金流向查询"
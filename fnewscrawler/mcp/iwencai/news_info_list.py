@@ -1,15 +1,23 @@
-from fnewscrawler.spiders.iwencai import (
-    financial_quick_news_info,
-    financial_people_news_info,
-    financial_market_news_info,
-    comment_news_info,
-    macro_economic_news_info,
-    product_economic_news_info,
-    international_economic_news_info,
-    region_news_info,
-    company_news_info
-)
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+financial_quick_news_info = lazy_import("fnewscrawler.spiders.iwencai", "financial_quick_news_info")
+financial_people_news_info = lazy_import("fnewscrawler.spiders.iwencai", "financial_people_news_info")
+financial_market_news_info = lazy_import("fnewscrawler.spiders.iwencai", "financial_market_news_info")
+comment_news_info = lazy_import("fnewscrawler.spiders.iwencai", "comment_news_info")
+macro_economic_news_info = lazy_import("fnewscrawler.spiders.iwencai", "macro_economic_news_info")
+product_economic_news_info = lazy_import("fnewscrawler.spiders.iwencai", "product_economic_news_info")
+international_economic_news_info = lazy_import("fnewscrawler.spiders.iwencai", "international_economic_news_info")
+region_news_info = lazy_import("fnewscrawler.spiders.iwencai", "region_news_info")
+company_news_info = lazy_import("fnewscrawler.spiders.iwencai", "company_news_info")
+prefetch_scheduler = lazy_import("fnewscrawler.core.prefetch", "prefetch_scheduler")
+
+
+async def _serve_news_list(tool_name: str, spider, page: int) -> dict:
+    """第1页在开启后台预取时直接返回足够新的快照，其他页现场抓取"""
+    if page == 1:
+        return await prefetch_scheduler.serve(tool_name, lambda: spider(page))
+    return await spider(page)
 
 
 @mcp_server.tool(title="同花顺财经快讯获取工具")
@@ -45,7 +53,7 @@ async def iwencai_financial_quick_news(page: int = 1) -> dict:
         2. 每页默认返回20条左右新闻
         3. 时间格式为YYYY-MM-DD HH:MM:SS
     """
-    return await financial_quick_news_info(page)
+    return await _serve_news_list("iwencai_financial_quick_news", financial_quick_news_info, page)
 
 
 @mcp_server.tool(title="同花顺财经人物新闻获取工具", enabled=False)
@@ -79,7 +87,7 @@ async def iwencai_financial_people_news(page: int = 1) -> dict:
         1. 人物新闻通常包含专访、观点评论等内容
         2. 可结合news_crawl工具获取完整采访内容
     """
-    return await financial_people_news_info(page)
+    return await _serve_news_list("iwencai_financial_people_news", financial_people_news_info, page)
 
 
 @mcp_server.tool(title="同花顺金融市场新闻获取工具")
@@ -113,7 +121,7 @@ async def iwencai_financial_market_news(page: int = 1) -> dict:
         1. 包含市场行情、政策解读等专业内容
         2. 适合金融分析场景使用
     """
-    return await financial_market_news_info(page)
+    return await _serve_news_list("iwencai_financial_market_news", financial_market_news_info, page)
 
 
 @mcp_server.tool(title="同花顺财经评论获取工具",
@@ -148,7 +156,7 @@ async def iwencai_comment_news(page: int = 1) -> dict:
         1. 评论类文章通常包含深度分析和独特见解
         2. 文章篇幅一般较长，建议使用news_crawl获取全文
     """
-    return await comment_news_info(page)
+    return await _serve_news_list("iwencai_comment_news", comment_news_info, page)
 
 
 @mcp_server.tool(title="同花顺宏观经济新闻获取工具")
@@ -182,7 +190,7 @@ async def iwencai_macro_economic_news(page: int = 1) -> dict:
         1. 包含国家级经济数据和政策解读
         2. 适合宏观经济研究使用
     """
-    return await macro_economic_news_info(page)
+    return await _serve_news_list("iwencai_macro_economic_news", macro_economic_news_info, page)
 
 
 @mcp_server.tool(title="同花顺产经新闻获取工具", enabled=False)
@@ -216,7 +224,7 @@ async def iwencai_product_economic_news(page: int = 1) -> dict:
         1. 可按行业筛选关注的领域
         2. 包含行业数据和趋势分析
     """
-    return await product_economic_news_info(page)
+    return await _serve_news_list("iwencai_product_economic_news", product_economic_news_info, page)
 
 
 @mcp_server.tool(title="同花顺国际经济新闻获取工具", enabled=False)
@@ -250,7 +258,7 @@ async def iwencai_international_economic_news(page: int = 1) -> dict:
         1. 包含国际贸易、汇率变动等国际财经新闻
         2. 适合跨境业务分析使用
     """
-    return await international_economic_news_info(page)
+    return await _serve_news_list("iwencai_international_economic_news", international_economic_news_info, page)
 
 
 @mcp_server.tool(title="同花顺区域经济新闻获取工具", enabled=False)
@@ -284,7 +292,7 @@ async def iwencai_region_news(page: int = 1) -> dict:
         1. 包含地方经济政策和区域发展动态
         2. 适合区域经济研究使用
     """
-    return await region_news_info(page)
+    return await _serve_news_list("iwencai_region_news", region_news_info, page)
 
 
 @mcp_server.tool(title="同花顺企业新闻获取工具", enabled=False)
@@ -318,4 +326,4 @@ async def iwencai_company_news(page: int = 1) -> dict:
         1. 包含企业财报、并购等商业新闻
         2. 可结合公司名称筛选特定企业新闻
     """
-    return await company_news_info(page)
\ No newline at end of file
+    return await _serve_news_list("iwencai_company_news", company_news_info, page)
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.iwencai import get_secu_margin_trading_info
+from fnewscrawler.utils import lazy_import
+
+get_secu_margin_trading_info = lazy_import("fnewscrawler.spiders.iwencai", "get_secu_margin_trading_info")
 
 
 @mcp_server.tool(title="获取个股融资融券信息")
@@ -1,10 +1,20 @@
+import asyncio
+import json
 import time
+import uuid
+
+import redis.asyncio as aioredis
 
 from fnewscrawler.mcp import mcp_server
 from fnewscrawler.core.redis_manager import  get_redis
 from fnewscrawler.utils import LOGGER
 import os
 import threading
+
+# 状态订阅断线重连的最大退避时间（秒）
+STATUS_LISTENER_MAX_BACKOFF = 60
+
+
 class MCPManager:
     _instance = None
     _lock = threading.Lock()
@@ -26,6 +36,13 @@ class MCPManager:
                     self.redis = get_redis()
                     #该环境变量用于区分多实例部署时，每个实例的mcp状态的记忆，方便恢复
                     self.deploy_node_name = os.getenv("DEPLOY_NODE_NAME", "FNewsCrawlerNode")
+                    # 每个节点的全部工具状态保存在一个哈希中，字段为工具名
+                    self.status_key = f"fnewscrawler:{self.deploy_node_name}:mcp:status"
+                    # 同一节点多个实例之间通过该频道同步工具状态变更
+                    self.status_channel = f"fnewscrawler:{self.deploy_node_name}:mcp:status_events"
+                    # 区分消息来源，忽略自己发出的变更
+                    self.instance_id = uuid.uuid4().hex
+                    self._listener_task = None
                     self._initialized = True
     async def get_all_tools_info(self)->list:
         """
@@ -76,57 +93,140 @@ class MCPManager:
         :param tool_name: 工具名称
         :return: 启用成功返回True，失败返回False
         """
-        try:
-            tool = await self.mcp_server.get_tool(tool_name)
-            tool.enable()
-            #主要针对有些mcp工具定义时就是关闭的，状态改变则需要记录
-            self.redis.set(f"fnewscrawler:{self.deploy_node_name}:mcp:status:{tool_name}", True)
-            return True
-        except Exception as e:
-            self.redis.delete(f"fnewscrawler:{self.deploy_node_name}:mcp:status:{tool_name}")
-            return False
-    
+        return await self._set_tool_status(tool_name, True)
 
-    
     async def disable_tool(self, tool_name:str)->bool:
         """
         禁用工具
         :param tool_name: 工具名称
         :return: 禁用成功返回True，失败返回False
         """
+        return await self._set_tool_status(tool_name, False)
+
+    async def _set_tool_status(self, tool_name: str, enabled: bool) -> bool:
+        """修改本实例的工具状态，并在一次往返中写入状态哈希、通知同节点的其他实例"""
         try:
             tool = await self.mcp_server.get_tool(tool_name)
-            tool.disable()
-            self.redis.set(f"fnewscrawler:{self.deploy_node_name}:mcp:status:{tool_name}", False)
-            return True
+            tool.enable() if enabled else tool.disable()
         except Exception as e:
-            self.redis.delete(f"fnewscrawler:{self.deploy_node_name}:mcp:status:{tool_name}")
+            self.redis.hdel(self.status_key, tool_name)
             return False
+        try:
+            #主要针对有些mcp工具定义时就是关闭的，状态改变则需要记录
+            pipe = self.redis.get_client().pipeline()
+            pipe.hset(self.status_key, tool_name, json.dumps(enabled))
+            pipe.publish(self.status_channel, json.dumps(
+                {"tool": tool_name, "enabled": enabled, "origin": self.instance_id}))
+            pipe.execute()
+        except Exception as e:
+            LOGGER.error(f"保存mcp工具{tool_name}状态失败: {e}")
+        return True
+
+    def _migrate_legacy_status(self) -> dict:
+        """把旧版本每个工具一个键的状态迁移到状态哈希中，只在哈希为空时执行一次"""
+        legacy_keys = self.redis.scan_iter(f"{self.status_key}:*")
+        if not legacy_keys:
+            return {}
+        client = self.redis.get_client()
+        values = client.mget(legacy_keys)
+        status = {}
+        for key, value in zip(legacy_keys, values):
+            if value is None:
+                continue
+            tool_name = (key.decode() if isinstance(key, bytes) else key).split(":")[-1]
+            status[tool_name] = bool(json.loads(value))
+        pipe = client.pipeline()
+        if status:
+            pipe.hset(self.status_key, mapping={k: json.dumps(v) for k, v in status.items()})
+        pipe.delete(*legacy_keys)
+        pipe.execute()
+        LOGGER.info(f"已将{len(status)}个mcp工具状态迁移到 {self.status_key}")
+        return status
+
+    async def _apply_status(self, status: dict) -> tuple:
+        """只在内存中应用工具状态，不再写回Redis"""
+        tools = await self.mcp_server.get_tools()
+        enable_count = 0
+        disable_count = 0
+        for tool_name, is_enabled in status.items():
+            tool = tools.get(tool_name)
+            if tool is None:
+                continue
+            if is_enabled:
+                tool.enable()
+                enable_count += 1
+            else:
+                tool.disable()
+                disable_count += 1
+        return enable_count, disable_count
 
     async def init_tools_status(self):
         """
-        数据库里面保存着用户修改的mcp工具的信息，需要在启动时恢复这些工具的状态
+        数据库里面保存着用户修改的mcp工具的信息，需要在启动时恢复这些工具的状态。
+        每个节点的工具状态保存在一个哈希中，一次HGETALL读取后在内存中应用，并订阅其他实例的状态变更
         :return:
         """
-        keys = self.redis.scan_iter(f"fnewscrawler:{self.deploy_node_name}:mcp:status:*")
-        disable_count = 0
-        enable_count = 0
         start_time = time.time()
-        for key in keys:
-            is_enabled = self.redis.get(key)
-            # key可能是字符串或字节，需要处理
-            if isinstance(key, bytes):
-                tool_name = key.decode().split(":")[-1]
-            else:
-                tool_name = key.split(":")[-1]
-            if not is_enabled:
-                await self.disable_tool(tool_name)
-                disable_count += 1
-            else:
-                await self.enable_tool(tool_name)
-                enable_count += 1
+        status = self.redis.hgetall(self.status_key)
+        if not status:
+            status = self._migrate_legacy_status()
+        enable_count, disable_count = await self._apply_status(status)
+
+        LOGGER.info(f"init_tools_status: 初始化mcp工具状态完成，耗时{time.time()-start_time}秒，启用{enable_count}个、禁用{disable_count}个工具")
+        self.start_status_listener()
+
+    def start_status_listener(self):
+        """启动后台订阅任务，同一节点的其他实例启用/禁用工具时实时同步，无需轮询"""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_status_changes())
+
+    async def _listen_status_changes(self):
+        """订阅状态变更，Redis 重启或网络中断后按指数退避重连，重连后重新读取完整状态补上断线期间错过的变更"""
+        client = aioredis.Redis(connection_pool=aioredis.ConnectionPool(**self.redis.pool.connection_kwargs))
+        backoff = 1
+        reconnecting = False
+        try:
+            while True:
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(self.status_channel)
+                    if reconnecting:
+                        status = await client.hgetall(self.status_key)
+                        await self._apply_status({k.decode("utf-8"): bool(json.loads(v)) for k, v in status.items()})
+                    LOGGER.info(f"已订阅mcp工具状态变更: {self.status_channel}")
+                    backoff = 1
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            event = json.loads(message["data"])
+                            if event.get("origin") == self.instance_id:
+                                continue
+                            await self._apply_status({event["tool"]: bool(event["enabled"])})
+                            LOGGER.info(f"同步mcp工具状态: {event['tool']} -> {'启用' if event['enabled'] else '禁用'}")
+                        except Exception as e:
+                            LOGGER.warning(f"处理mcp工具状态变更消息失败: {e}")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    LOGGER.error(f"mcp工具状态订阅中断，{backoff}秒后重连: {e}")
+                finally:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, STATUS_LISTENER_MAX_BACKOFF)
+                reconnecting = True
+        finally:
+            await client.aclose()
 
-        LOGGER.info(f"init_tools_status: 初始化mcp工具状态完成，耗时{time.time()-start_time}秒，禁用{disable_count}个工具")
+    async def stop_status_listener(self):
+        """停止状态订阅任务"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
 
     async def call_tool(self, tool_name:str, **kwargs)->dict:
         """
@@ -1,5 +1,8 @@
-from fnewscrawler.spiders.tushare import stock_cyq_perf, stock_cyq_chips
 from fnewscrawler.mcp import mcp_server
+from fnewscrawler.utils import lazy_import
+
+stock_cyq_perf = lazy_import("fnewscrawler.spiders.tushare", "stock_cyq_perf")
+stock_cyq_chips = lazy_import("fnewscrawler.spiders.tushare", "stock_cyq_chips")
 
 @mcp_server.tool(title="获取A股每日筹码平均成本和胜率情况", enabled=False)
 async def get_stock_cyq_perf(stock_code: str, start_date: str, end_date: str)->str:
@@ -2,14 +2,16 @@
 华尔街见闻新闻 MCP 工具
 """
 
+import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from fnewscrawler.mcp import mcp_server
-from fnewscrawler.spiders.wallstreetcn.news import (
-    wallstreetcn_crawl_news,
-    wallstreetcn_crawl_all_categories,
-    get_important_news
-)
+from fnewscrawler.spiders.wallstreetcn.news import wallstreetcn_crawl_news
+from fnewscrawler.spiders.wallstreetcn.live_poller import wallstreetcn_live_poller, LIVE_BUFFER_SIZE
+
+# 快讯时间按北京时间解析，不依赖服务器所在时区
+BEIJING_TZ = timezone(timedelta(hours=8))
 
 
 @mcp_server.tool(title="获取华尔街见闻快讯新闻", enabled=False)
@@ -34,7 +36,11 @@ async def get_wallstreetcn_news(
               data字段为新闻列表，每条新闻包含time、content、importance、category字段
     """
     try:
-        news_list = await wallstreetcn_crawl_news(category, limit)
+        # 后台轮询的内存缓冲区能满足时直接从内存返回，超出缓冲区时直接请求接口
+        if 0 < limit <= LIVE_BUFFER_SIZE:
+            news_list = await wallstreetcn_live_poller.latest(category, limit)
+        else:
+            news_list = await wallstreetcn_crawl_news(category, limit)
 
         return {
             "success": True,
@@ -68,7 +74,9 @@ async def get_wallstreetcn_all_news(
               data字段为各类别新闻的字典，key为类别名称，value为新闻列表
     """
     try:
-        all_news = await wallstreetcn_crawl_all_categories(limit)
+        categories = ["global", "a-stock", "us-stock", "hk-stock", "commodity"]
+        news_lists = await asyncio.gather(*[wallstreetcn_live_poller.latest(cat, limit) for cat in categories])
+        all_news = dict(zip(categories, news_lists))
 
         total_count = sum(len(news) for news in all_news.values())
 
@@ -111,7 +119,8 @@ async def get_wallstreetcn_important_news(
               data字段为重要新闻列表
     """
     try:
-        important_news = await get_important_news(category, limit)
+        # 直接在内存缓冲区中筛选重要快讯，不再额外请求两倍数量再过滤
+        important_news = await wallstreetcn_live_poller.latest(category, limit, important_only=True)
 
         return {
             "success": True,
@@ -128,3 +137,49 @@ async def get_wallstreetcn_important_news(
             "category": category,
             "total": 0
         }
+
+
+@mcp_server.tool(enabled=False, title="获取华尔街见闻指定时间之后的快讯新闻")
+async def get_wallstreetcn_news_since(
+        since_time: str,
+        category: str = "global",
+        important_only: bool = False
+) -> Dict[str, Any]:
+    """
+    获取华尔街见闻指定时间之后发布的快讯新闻，适合定时增量获取
+
+    Args:
+        since_time: 起始时间（北京时间），格式为 YYYY-MM-DD HH:MM 或 YYYY-MM-DD HH:MM:SS，只返回晚于该时间的快讯
+        category: 新闻类别，支持 global、a-stock、us-stock、hk-stock、commodity
+        important_only: 是否只返回重要快讯
+
+    Returns:
+        Dict: 包含success、data、message等字段的响应
+              data字段为新闻列表，按时间从新到旧排列
+              内存中只保留最近的快讯，起始时间早于保留的最早一条时结果不完整，truncated 字段为 True
+    """
+    try:
+        fmt = "%Y-%m-%d %H:%M:%S" if since_time.count(":") == 2 else "%Y-%m-%d %H:%M"
+        timestamp = int(datetime.strptime(since_time.strip(), fmt).replace(tzinfo=BEIJING_TZ).timestamp())
+        news_list = await wallstreetcn_live_poller.since(category, timestamp, important_only)
+        truncated = not await wallstreetcn_live_poller.covers(category, timestamp)
+
+        message = f"成功获取{since_time}之后的{len(news_list)}条{category}类别新闻"
+        if truncated:
+            message += f"，仅保留最近{LIVE_BUFFER_SIZE}条快讯，更早的快讯未包含在结果中"
+        return {
+            "success": True,
+            "data": news_list,
+            "message": message,
+            "category": category,
+            "total": len(news_list),
+            "truncated": truncated
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "data": [],
+            "message": f"获取新闻失败: {str(e)}",
+            "category": category,
+            "total": 0
+        }
@@ -0,0 +1,154 @@
+"""
+东方财富数据接口客户端
+
+东方财富数据中心的页面表格背后都是 push2 / datacenter 的 JSON 接口，直接调用接口可以省去
+打开页面、点击翻页、等待渲染的过程。首页请求拿到总数后，其余页限制并发数获取，每页尽量取最大条数。
+接口调用失败时由各爬虫回退到 Playwright 页面抓取。
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List
+
+from fnewscrawler.core.http_client import http_client_manager
+
+PUSH2_CLIST_URL = "https://push2.eastmoney.com/api/qt/clist/get"
+DATACENTER_URL = "https://datacenter-web.eastmoney.com/api/data/v1/get"
+
+# push2 接口单页最多返回100条
+PUSH2_MAX_PAGE_SIZE = 100
+# datacenter 接口单页最多返回500条
+DATACENTER_MAX_PAGE_SIZE = 500
+# 获取其余页时同时发出的请求数
+PAGE_CONCURRENCY = int(os.getenv("EASTMONEY_API_PAGE_CONCURRENCY", 4))
+
+PUSH2_UT = "b2884a393a59ad64002292a3e90d46a5"
+
+EASTMONEY_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Referer": "https://data.eastmoney.com/",
+    "Accept": "application/json, text/plain, */*",
+}
+
+
+class EastMoneyAPIError(Exception):
+    """东方财富接口返回异常数据"""
+
+
+async def _fetch_pages(fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+                       page_count: int) -> List[Dict[str, Any]]:
+    """按页码顺序获取第2页到第 page_count 页，同时进行的请求不超过 PAGE_CONCURRENCY"""
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def fetch(page_no: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_page(page_no)
+
+    return await asyncio.gather(*[fetch(i) for i in range(2, page_count + 1)])
+
+
+class EastMoneyDataClient:
+    """
+    东方财富数据接口客户端，请求通过应用共享的 http_client_manager 发出，复用其连接池
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self._timeout = timeout
+
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await http_client_manager.get(url, params=params, headers=EASTMONEY_HEADERS,
+                                                 timeout=self._timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_clist(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        获取 push2 clist 列表接口的全部数据
+
+        Args:
+            params: 接口参数（fs、fid、fields 等），分页参数由本方法填充
+
+        Returns:
+            List[Dict]: 按接口排序返回的全部行
+        """
+        base_params = {"po": 1, "np": 1, "fltt": 2, "invt": 2, "ut": PUSH2_UT, **params,
+                       "pz": PUSH2_MAX_PAGE_SIZE}
+
+        async def fetch_page(page_no: int) -> Dict[str, Any]:
+            data = await self._get_json(PUSH2_CLIST_URL, {**base_params, "pn": page_no})
+            return data.get("data") or {}
+
+        first = await fetch_page(1)
+        if not first:
+            raise EastMoneyAPIError(f"push2接口没有返回数据: {params.get('fs')}")
+
+        rows = list(first.get("diff") or [])
+        total = int(first.get("total") or 0)
+        page_count = (total + PUSH2_MAX_PAGE_SIZE - 1) // PUSH2_MAX_PAGE_SIZE
+        if page_count > 1:
+            pages = await _fetch_pages(fetch_page, page_count)
+            for page in pages:
+                rows.extend(page.get("diff") or [])
+        return rows
+
+    async def fetch_datacenter(self, report_name: str, columns: str, filter_str: str = "",
+                               sort_columns: str = "", sort_types: str = "") -> List[Dict[str, Any]]:
+        """
+        获取 datacenter 报表接口的全部数据
+
+        Args:
+            report_name: 报表名称，如 RPT_DAILYBILLBOARD_DETAILSNEW
+            columns: 需要返回的字段，逗号分隔
+            filter_str: 过滤条件，如 (TRADE_DATE>='2025-01-01')
+            sort_columns: 排序字段，逗号分隔
+            sort_types: 排序方向，1升序，-1降序，逗号分隔
+
+        Returns:
+            List[Dict]: 全部行
+        """
+        base_params = {
+            "reportName": report_name,
+            "columns": columns,
+            "filter": filter_str,
+            "sortColumns": sort_columns,
+            "sortTypes": sort_types,
+            "pageSize": DATACENTER_MAX_PAGE_SIZE,
+            "source": "WEB",
+            "client": "WEB",
+        }
+
+        async def fetch_page(page_no: int) -> Dict[str, Any]:
+            data = await self._get_json(DATACENTER_URL, {**base_params, "pageNumber": page_no})
+            if not data.get("success"):
+                raise EastMoneyAPIError(f"datacenter接口返回错误: {data.get('message')}")
+            return data.get("result") or {}
+
+        first = await fetch_page(1)
+        rows = list(first.get("data") or [])
+        page_count = int(first.get("pages") or 1)
+        if page_count > 1:
+            pages = await _fetch_pages(fetch_page, page_count)
+            for page in pages:
+                rows.extend(page.get("data") or [])
+        return rows
+
+
+def format_amount(value: Any) -> Any:
+    """把以元为单位的金额格式化为页面上展示的 亿/万 形式"""
+    if not isinstance(value, (int, float)):
+        return value
+    if abs(value) >= 1e8:
+        return f"{value / 1e8:.2f}亿"
+    if abs(value) >= 1e4:
+        return f"{value / 1e4:.2f}万"
+    return f"{value:.2f}"
+
+
+def format_percent(value: Any) -> Any:
+    """格式化百分比数值"""
+    if not isinstance(value, (int, float)):
+        return value
+    return f"{value:.2f}%"
+
+
+# 模块级实例，方便各爬虫复用
+eastmoney_api_client = EastMoneyDataClient()
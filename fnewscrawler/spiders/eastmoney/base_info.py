@@ -1,9 +1,7 @@
-from io import StringIO
-
-import pandas as pd
-
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.core import get_redis
+from fnewscrawler.core.cache_policy import cache_policy
 
 
 async def eastmoney_stock_base_info(stock_code: str)-> str | dict[str, str]:
@@ -42,7 +40,7 @@ async def eastmoney_stock_base_info(stock_code: str)-> str | dict[str, str]:
         "company_compare_info": ""
     }
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
@@ -63,11 +61,10 @@ async def eastmoney_stock_base_info(stock_code: str)-> str | dict[str, str]:
         company_core_info = await page.locator("div.quotecore").inner_text()
         base_info["company_core_info"] = company_core_info
 
-        table_html = await page.locator(".finance4.afinance4").inner_html()
-        table_content = pd.read_html(StringIO(table_html))[0]
+        table_content = await extract_table(page.locator(".finance4.afinance4"))
         base_info["company_compare_info"] = table_content.to_markdown(index=False)
-        #一天后过期
-        redis_client.set(url, base_info, ex=24*60*60)
+        #包含实时行情，盘中短时间过期，收盘后缓存到下一个交易日
+        redis_client.set(url, base_info, ex=cache_policy.ttl("stock_quote"))
 
         return base_info
 
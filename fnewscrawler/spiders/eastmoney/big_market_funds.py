@@ -1,8 +1,5 @@
-from io import StringIO
-
-import pandas as pd
-
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 
 
 
@@ -44,7 +41,7 @@ async def eastmoney_market_history_funds_flow(market_type: str= "沪深两市",
     context = await context_manager.get_context("eastmoney")
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
@@ -56,10 +53,8 @@ async def eastmoney_market_history_funds_flow(market_type: str= "沪深两市",
         await page.wait_for_load_state("domcontentloaded")
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator("#table_ls.dataview").wait_for(state="visible")
-            # 提取表格的 HTML 字符串
-            # await page.locator(".dataview-body").wait_for(state="visible")
-        table_html = await page.locator("#table_ls.dataview").inner_html()
-        current_df = pd.read_html(StringIO(table_html))[0]
+        # 在浏览器内一次性提取表格数据
+        current_df = await extract_table(page.locator("#table_ls.dataview"))
 
         if not current_df.empty:
             # 手动设置列名
@@ -1,9 +1,6 @@
 
-from io import StringIO
-
-import pandas as pd
-
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 
 
 async def eastmoney_block_trade_detail(stock_code: str)-> str:
@@ -19,7 +16,7 @@ async def eastmoney_block_trade_detail(stock_code: str)-> str:
     context = await context_manager.get_context("eastmoney")
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
@@ -29,28 +26,12 @@ async def eastmoney_block_trade_detail(stock_code: str)-> str:
 
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator(".dataview-body").wait_for(state="visible")
-            # 提取表格的 HTML 字符串
-            # await page.locator(".dataview-body").wait_for(state="visible")
-        table_html = await page.locator(".dataview-body").inner_html()
-        table_content = await page.locator(".dataview-body table tbody tr").all()
-        buyer_list = []
-        seller_list = []
-        for item in table_content:
-            #处理买方营业部从title中获取完整的名称
-            buyer_title = await item.locator("td:nth-child(10)").locator("a").get_attribute("title")
-            #处理卖方营业部从title中获取完整的名称
-            seller_title = await item.locator("td:nth-child(11)").locator("a").get_attribute("title")
-            buyer_list.append(buyer_title)
-            seller_list.append(seller_title)
-
-        current_df = pd.read_html(StringIO(table_html))[0]
-
+        # 在浏览器内一次性提取表格数据，买方/卖方营业部从a标签的title中获取完整的名称
+        current_df = await extract_table(page.locator(".dataview-body"), attr_columns={9: "title", 10: "title"})
 
         if not current_df.empty:
             # 手动设置列名
             current_df.columns = column_names
-            current_df["买方营业部"] = buyer_list
-            current_df["卖方营业部"] = seller_list
             final_df = current_df.drop_duplicates()
             # 使用 pandas 的 to_markdown 方法转换为 Markdown 格式
             markdown_table = final_df.to_markdown(index=False)
@@ -1,14 +1,66 @@
-import asyncio
-from io import StringIO
+from datetime import datetime, timedelta
 
 import pandas as pd
 
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.page_waits import click_and_wait_for_change, wait_for_row_count, timed
+from fnewscrawler.utils import LOGGER
+from .api_client import eastmoney_api_client
 
+# 龙虎榜页面每页展示的条数，接口模式下按此条数切分页码，保持与页面分页一致
+DRAGON_TIGER_PAGE_SIZE = 50
 
+_DRAGON_TIGER_COLUMNS = ("SECURITY_CODE,SECURITY_NAME_ABBR,TRADE_DATE,EXPLAIN,CLOSE_PRICE,CHANGE_RATE,"
+                         "BILLBOARD_NET_AMT,BILLBOARD_BUY_AMT,BILLBOARD_SELL_AMT,BILLBOARD_DEAL_AMT,ACCUM_AMOUNT,"
+                         "DEAL_NET_RATIO,DEAL_AMOUNT_RATIO,TURNOVERRATE,FREE_MARKET_CAP,EXPLANATION")
+# 向前查询的自然日天数，覆盖长假后的第一个交易日
+_LATEST_TRADE_DATE_LOOKBACK = 15
+
+
+def _to_unit(value, unit: float):
+    """把以元为单位的金额换算为页面展示的 万/亿 单位"""
+    if isinstance(value, (int, float)):
+        return round(value / unit, 2)
+    return value
+
+
+async def _dragon_tiger_detail_from_api(columns_name: list) -> pd.DataFrame:
+    """
+    直接调用datacenter接口获取最近一个交易日的龙虎榜明细
+
+    只用于单日排行：页面上的近N日排行是按股票汇总后的排名，与接口按日返回的上榜明细含义不同，仍然抓取页面
+    """
+    start_date = (datetime.now() - timedelta(days=_LATEST_TRADE_DATE_LOOKBACK)).strftime("%Y-%m-%d")
+    rows = await eastmoney_api_client.fetch_datacenter(
+        report_name="RPT_DAILYBILLBOARD_DETAILSNEW",
+        columns=_DRAGON_TIGER_COLUMNS,
+        filter_str=f"(TRADE_DATE>='{start_date}')",
+        sort_columns="TRADE_DATE,SECURITY_CODE",
+        sort_types="-1,1",
+    )
+    latest_date = max((row["TRADE_DATE"] for row in rows), default=None)
+
+    records = []
+    for row in rows:
+        if row["TRADE_DATE"] != latest_date:
+            continue
+        records.append([
+            len(records) + 1, row.get("SECURITY_CODE"), row.get("SECURITY_NAME_ABBR"),
+            row.get("EXPLAIN"), row.get("CLOSE_PRICE"), row.get("CHANGE_RATE"),
+            _to_unit(row.get("BILLBOARD_NET_AMT"), 1e4), _to_unit(row.get("BILLBOARD_BUY_AMT"), 1e4),
+            _to_unit(row.get("BILLBOARD_SELL_AMT"), 1e4), _to_unit(row.get("BILLBOARD_DEAL_AMT"), 1e4),
+            _to_unit(row.get("ACCUM_AMOUNT"), 1e4), row.get("DEAL_NET_RATIO"), row.get("DEAL_AMOUNT_RATIO"),
+            row.get("TURNOVERRATE"), _to_unit(row.get("FREE_MARKET_CAP"), 1e8), row.get("EXPLANATION"),
+        ])
+    # 接口数据没有页面上的"相关"列
+    return pd.DataFrame(records, columns=[c for c in columns_name if c != "相关"])
+
+
+@timed("eastmoney_dragon_tiger_detail")
 async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
     """
-    获取龙虎榜信息
+    获取龙虎榜信息，单日排行优先直接调用东方财富数据接口，失败时回退到页面抓取，近N日排行抓取页面
     :param rank_type: 排行类型，1day, 3day, 5day, 10day, 30day
     :param page_num: 页码
     :return: 龙虎榜信息
@@ -17,7 +69,6 @@ async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
     if rank_type not in ["1day", "3day","5day", "10day", "30day"]:
         return "rank_type参数错误,仅支持：1day, 3day, 5day, 10day, 30day"
 
-    context = await context_manager.get_context("eastmoney")
     columns_name = ["序号", "代码", "名称", "相关","解读", "收盘价", "涨跌幅",
                    "龙虎榜净买额(万)", "龙虎榜买入额(万)", "龙虎榜卖入额(万)", "龙虎榜成交额(万)", "市场总成交额(万)", "净买额占总成交比", "成交额占总成交比", "换手率",
             "流通市值(亿)", "上榜原因"]
@@ -26,33 +77,51 @@ async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
                    "龙虎榜净买额(万)", "龙虎榜买入额(万)", "龙虎榜卖入额(万)", "龙虎榜成交额(万)", "市场总成交额(万)", "净买额占总成交比", "成交额占总成交比", "换手率",
             "流通市值(亿)", "上榜原因", "上榜后1日", "上榜后2日", "上榜后5日", "上榜后10日"]
 
+    try:
+        api_df = await _dragon_tiger_detail_from_api(columns_name) if rank_type == "1day" else pd.DataFrame()
+        if not api_df.empty:
+            page_count = (len(api_df) + DRAGON_TIGER_PAGE_SIZE - 1) // DRAGON_TIGER_PAGE_SIZE
+            if page_num > 1 and page_count == 1:
+                return "没有更多数据了，只有一页的数据"
+            if page_num > page_count:
+                return f"切换到{page_num}页失败,没有更多数据了，只有{page_count}页的数据"
+            start = (page_num - 1) * DRAGON_TIGER_PAGE_SIZE
+            final_df = api_df.iloc[start:start + DRAGON_TIGER_PAGE_SIZE].copy()
+            final_df['代码'] = final_df['代码'].astype(str).str.zfill(6)
+            return final_df.drop_duplicates().to_markdown(index=False)
+        if rank_type == "1day":
+            LOGGER.warning("东方财富接口未返回龙虎榜数据，回退到页面抓取")
+    except Exception as e:
+        LOGGER.warning(f"东方财富接口获取龙虎榜数据失败，回退到页面抓取: {e}")
 
+    context = await context_manager.get_context("eastmoney")
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
         #刷新页面是为了把弹窗去掉
         await page.reload()
         await page.wait_for_load_state("domcontentloaded")
-        await asyncio.sleep(1.2)
+        # 等待默认排行的表格数据渲染出来
+        await wait_for_row_count(page, ".dataview-body table tbody tr")
 
+        # 切换排行后等待表格内容刷新，替代固定的sleep
         if rank_type == "3day":
-            await page.locator("text=近3日").click()
+            await click_and_wait_for_change(page, page.locator("text=近3日"), ".dataview-body")
             #控制页面下滑
             await page.mouse.wheel(0, 1000)
         elif rank_type == "5day":
-            await page.locator("text=近5日").click()
+            await click_and_wait_for_change(page, page.locator("text=近5日"), ".dataview-body")
             await page.mouse.wheel(0, 1300)
         elif rank_type == "10day":
-            await page.locator("text=近10日").click()
+            await click_and_wait_for_change(page, page.locator("text=近10日"), ".dataview-body")
             await page.mouse.wheel(0, 900)
         elif rank_type == "30day":
-            await page.locator("text=近30日").click()
+            await click_and_wait_for_change(page, page.locator("text=近30日"), ".dataview-body")
             await page.mouse.wheel(0, 1100)
 
-        await asyncio.sleep(1)
         # 增加分页逻辑
         if page_num > 1:
             page_text = await page.locator(".dataview-pagination.tablepager").inner_text()
@@ -62,33 +131,15 @@ async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
             if page_num > len(page_box)-1:
                 return f"切换到{page_num}页失败,没有更多数据了，只有{len(page_box)-1}页的数据"
 
-            #填写跳转页码
+            #填写跳转页码，点击确定后等待表格内容刷新
             await page.locator("#gotopageindex").fill(str(page_num))
-            # await page.locator(".btn").click()
-            await asyncio.sleep(0.5)
-            await page.get_by_role("button", name="确定").click()
-            await page.wait_for_load_state("domcontentloaded")
-            # await asyncio.sleep(2)
-
-        #增加sleep，不然实在无法保证排行的表格会加载完成
-        await asyncio.sleep(1)
+            await click_and_wait_for_change(page, page.get_by_role("button", name="确定"), ".dataview-body")
+
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator(".dataview-body").wait_for(state="visible")
-        # 提取表格的 HTML 字符串
-        # await page.locator(".dataview-body").wait_for(state="visible")
-        table_html = await page.locator(".dataview-body").inner_html()
-        current_df = pd.read_html(StringIO(table_html))[0]
-
-        #获取完整的上榜原因文字
-        reason_list = []
-        table_content = await page.locator(".dataview-body table tbody tr").all()
-        for item in table_content:
-            if rank_type == "1day":
-                reason_title = await item.locator("td:nth-child(17)").locator("a").get_attribute("title")
-                reason_list.append(reason_title)
-            else:
-                reason_title = await item.locator("td:nth-child(18)").locator("a").get_attribute("title")
-                reason_list.append(reason_title)
+        # 在浏览器内一次性提取表格数据，完整的上榜原因文字从a标签的title中获取
+        reason_column = 16 if rank_type == "1day" else 17
+        current_df = await extract_table(page.locator(".dataview-body"), attr_columns={reason_column: "title"})
 
         if not current_df.empty:
                 # 手动设置列名
@@ -97,7 +148,6 @@ async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
                 current_df['代码'] = current_df['代码'].astype(str)
                 # 使用 str.zfill() 方法补全前导零，例如，补到6位
                 current_df['代码'] = current_df['代码'].str.zfill(6)
-                current_df["上榜原因"] = reason_list
                 final_df = current_df.drop(columns=["相关"])
 
                 final_df = final_df.drop_duplicates()
@@ -115,6 +165,7 @@ async def eastmoney_dragon_tiger_detail(rank_type="1day", page_num=1)-> str:
             await page.close()
 
 
+@timed("eastmoney_stock_dragon_tiger_detail")
 async def eastmoney_stock_dragon_tiger_detail(stock_code: str)-> str:
     """
     获取龙虎榜信息
@@ -130,7 +181,7 @@ async def eastmoney_stock_dragon_tiger_detail(stock_code: str)-> str:
 
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
@@ -138,29 +189,19 @@ async def eastmoney_stock_dragon_tiger_detail(stock_code: str)-> str:
         await page.reload()
         await page.wait_for_load_state("domcontentloaded")
 
-        #增加sleep，不然实在无法保证排行的表格会加载完成
-        await asyncio.sleep(1)
+        # 等待表格数据渲染出来（没有数据时也会有一行"暂无数据"），替代固定的sleep
+        await wait_for_row_count(page, ".dataview-body table tbody tr")
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator(".dataview-body").wait_for(state="visible")
-        # 提取表格的 HTML 字符串
-        # await page.locator(".dataview-body").wait_for(state="visible")
-        table_html = await page.locator(".dataview-body").inner_html()
-        current_df = pd.read_html(StringIO(table_html))[0]
-
         table_flag = await page.locator(".dataview-body table tbody").inner_text()
         if "暂无数据" in table_flag:
             return f"最近一年没有对应股票代码为：{stock_code}的龙虎榜上榜信息"
 
-        #获取完整的上榜原因文字
-        reason_list = []
-        table_content = await page.locator(".dataview-body table tbody tr").all()
-        for item in table_content:
-            reason_title = await item.locator("td:nth-child(16)").locator("a").get_attribute("title")
-            reason_list.append(reason_title)
+        # 在浏览器内一次性提取表格数据，完整的上榜原因文字从a标签的title中获取
+        current_df = await extract_table(page.locator(".dataview-body"), attr_columns={15: "title"})
 
         # 手动设置列名
         current_df.columns = columns_name
-        current_df["上榜原因"] = reason_list
         final_df = current_df.drop(columns=["相关"])
         final_df = final_df.drop_duplicates()
         # 使用 pandas 的 to_markdown 方法转换为 Markdown 格式
@@ -1,15 +1,47 @@
-import asyncio
-from io import StringIO
-
 import pandas as pd
 
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.page_waits import click_and_wait_for_change, wait_for_row_count, timed
+from fnewscrawler.utils import LOGGER
+from .api_client import eastmoney_api_client, format_amount, format_percent
 from .utils import eastmoney_industry_map
 
-
+# 页面表格翻页时请求的push2列表接口
+PUSH2_CLIST_PATH = "api/qt/clist/get"
+
+# push2接口中各排行类型对应的排序字段和数据字段，字段顺序与页面表格列顺序一致：
+# 最新价、涨跌幅、主力/超大单/大单/中单/小单的净额和净占比
+_STOCK_FUNDS_FLOW_FIELDS = {
+    "1day": ("f62", ["f2", "f3", "f62", "f184", "f66", "f69", "f72", "f75", "f78", "f81", "f84", "f87"]),
+    "5day": ("f164", ["f2", "f109", "f164", "f165", "f166", "f167", "f168", "f169", "f170", "f171", "f172", "f173"]),
+    "10day": ("f174", ["f2", "f160", "f174", "f175", "f176", "f177", "f178", "f179", "f180", "f181", "f182", "f183"]),
+}
+
+
+async def _industry_stock_funds_flow_from_api(industry_code: str, rank_type: str, columns_name: list) -> pd.DataFrame:
+    """直接调用push2接口获取行业个股资金流，按主力净流入降序排列，与页面排行一致"""
+    sort_field, value_fields = _STOCK_FUNDS_FLOW_FIELDS[rank_type]
+    rows = await eastmoney_api_client.fetch_clist({
+        "fs": f"b:{industry_code}",
+        "fid": sort_field,
+        "fields": ",".join(["f12", "f14"] + value_fields),
+    })
+    records = []
+    for index, row in enumerate(rows, start=1):
+        values = [row.get(field) for field in value_fields]
+        # 最新价、涨跌幅保持数值，净额格式化为亿/万，净占比格式化为百分比
+        price, change = values[0], format_percent(values[1])
+        flows = [format_amount(v) if i % 2 == 0 else format_percent(v) for i, v in enumerate(values[2:])]
+        records.append([index, row.get("f12"), row.get("f14"), price, change, *flows])
+    # 接口数据没有页面上的"相关"列
+    return pd.DataFrame(records, columns=[c for c in columns_name if c != "相关"])
+
+
+@timed("eastmoney_industry_stock_funds_flow")
 async def get_industry_stock_funds_flow(industry_name: str,rank_type="1day")-> str:
     """
-    获取股票行业个股资金流信息
+    获取股票行业个股资金流信息，优先直接调用东方财富数据接口，失败时回退到页面抓取
     :return: 行业个股资金流信息
     """
     industry_code = eastmoney_industry_map.get(industry_name)
@@ -24,38 +56,44 @@ async def get_industry_stock_funds_flow(industry_name: str,rank_type="1day")-> s
         head_key = "5日"
     elif rank_type == "10day":
         head_key = "10日"
-    context = await context_manager.get_context("eastmoney")
     clumns_name = ["序号", "代码", "名称", "相关","最新价", f"{head_key}涨跌幅", f"{head_key}主力净流入净额", f"{head_key}主力净流入净占比", f"{head_key}超大单净流入净额", f"{head_key}超大单净流入净占比", f"{head_key}大单净流入净额", f"{head_key}大单净流入净占比", f"{head_key}中单净流入净额", f"{head_key}中单净流入净占比", f"{head_key}小单净流入净额", f"{head_key}小单净流入净占比"]
+
+    try:
+        final_df = await _industry_stock_funds_flow_from_api(industry_code, rank_type, clumns_name)
+        if not final_df.empty:
+            final_df['代码'] = final_df['代码'].astype(str).str.zfill(6)
+            return final_df.drop_duplicates().to_markdown(index=False)
+        LOGGER.warning(f"东方财富接口未返回{industry_name}的个股资金流数据，回退到页面抓取")
+    except Exception as e:
+        LOGGER.warning(f"东方财富接口获取{industry_name}个股资金流失败，回退到页面抓取: {e}")
+
+    context = await context_manager.get_context("eastmoney")
     page = None
     dfs =[]
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
         #刷新页面是为了把弹窗去掉
         await page.reload()
         await page.wait_for_load_state("domcontentloaded")
-        await asyncio.sleep(1.2)
         await page.locator("text=今日排行").click()
         #控制页面下滑
         await page.mouse.wheel(0, 1000)
+        # 等待今日排行的表格数据渲染出来
+        await wait_for_row_count(page, ".dataview-body table tbody tr")
+        # 切换排行后等待表格内容刷新，替代固定的sleep
         if rank_type == "5day":
-            await page.locator("text=5日排行").click()
+            await click_and_wait_for_change(page, page.locator("text=5日排行"), ".dataview-body")
             await page.wait_for_selector("li.at:has-text('5日排行')")
         elif rank_type == "10day":
-            await page.locator("text=10日排行").click()
-            # await page.wait_for_selector("li.at:has-text('10日排行')")
-            # print("10日排行")
-        #增加sleep，不然实在无法保证排行的表格会加载完成
-        await asyncio.sleep(2)
+            await click_and_wait_for_change(page, page.locator("text=10日排行"), ".dataview-body")
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator(".dataview-body").wait_for(state="visible")
         while True:
-            # 提取表格的 HTML 字符串
-            # await page.locator(".dataview-body").wait_for(state="visible")
-            table_html = await page.locator(".dataview-body").inner_html()
-            current_df = pd.read_html(StringIO(table_html))[0]
+            # 在浏览器内一次性提取表格数据
+            current_df = await extract_table(page.locator(".dataview-body"))
 
             if not current_df.empty:
                     # 手动设置列名
@@ -71,11 +109,11 @@ async def get_industry_stock_funds_flow(industry_name: str,rank_type="1day")-> s
             if "下一页" not in page_text:
                 break
 
-            if "下一页" in page_text:
-                await page.locator("text=下一页").click()
-                await page.wait_for_load_state("domcontentloaded")
-                #不加这个一定会有莫名其妙的问题，选择1秒还是比较激进了，后期如果有问题，考虑增大，这条语句的位置不要该，domcontentloaded不要改，换成networkidle会卡死
-                await asyncio.sleep(1)
+            # 点击下一页后等待列表接口返回、表格内容刷新，替代原来固定的1秒sleep，没有刷新时停止，避免重复读取同一页
+            if not await click_and_wait_for_change(page, page.locator("text=下一页"), ".dataview-body",
+                                                   response_url=PUSH2_CLIST_PATH):
+                LOGGER.warning(f"{industry_name}个股资金流翻到第{len(dfs) + 1}页后表格没有刷新，停止翻页")
+                break
 
         if len(dfs) ==0:
             return "没有行业资金流信息"
@@ -115,7 +153,7 @@ async def get_industry_history_funds_flow(industry_name: str)-> str:
                    "中单净流入净额", "中单净流入净占比", "小单净流入净额", "小单净流入净占比"]
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
@@ -127,10 +165,8 @@ async def get_industry_history_funds_flow(industry_name: str)-> str:
         await page.wait_for_load_state("domcontentloaded")
         # 确保表格主体可见，避免在数据加载前抓取
         await page.locator("#table_ls.dataview").wait_for(state="visible")
-            # 提取表格的 HTML 字符串
-            # await page.locator(".dataview-body").wait_for(state="visible")
-        table_html = await page.locator("#table_ls.dataview").inner_html()
-        current_df = pd.read_html(StringIO(table_html))[0]
+        # 在浏览器内一次性提取表格数据
+        current_df = await extract_table(page.locator("#table_ls.dataview"))
 
         if not current_df.empty:
             # 手动设置列名
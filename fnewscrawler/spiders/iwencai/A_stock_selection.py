@@ -21,39 +21,209 @@
 
 注意事项:
     - 需要确保网络连接正常
-    - 大量数据抓取时会自动处理分页
+    - 大量数据抓取时会自动处理分页：只执行一次查询，第2页起复用第1页结果数据接口的请求（同一个查询令牌）
+      只修改页码并发获取，各页来自同一份结果；接口数据无法与页面表格对应时在结果页面上逐页翻页
     - 返回数据会自动去重
     - 对于同一个查询条件，不同时间查询，其结果也会不同所以不考虑加上redis缓存
 """
 
 import asyncio
-from io import StringIO
+import json
+import os
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import pandas as pd
 
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.page_waits import (click_and_wait_for_change, get_inner_text, wait_for_network_quiet,
+                                          wait_for_response, wait_for_text_change, timed)
 from fnewscrawler.utils import LOGGER
 
-
+BASE_URL = "https://www.iwencai.com/unifiedwap/home/stock"
+
+# 每页显示的条数，页面最大支持100条/页
+PAGE_SIZE = 100
+
+# 结果表格切换每页条数、翻页时请求的数据接口
+RESULT_DATA_PATH = "landing/getDataList"
+
+# 并发获取结果页时同时发出的请求数
+MAX_PAGE_CONCURRENCY = int(os.getenv("IWENCAI_SELECTION_PAGE_CONCURRENCY", 4))
+# 重放请求时不能沿用的请求头，由请求上下文重新生成
+_REPLAY_SKIP_HEADERS = {"content-length", "host", "cookie"}
+
+
+async def _run_selection_query(page, select_condition: str) -> None:
+    """打开问财选股首页并执行选股条件查询"""
+    await page.goto(BASE_URL)
+    await page.wait_for_load_state("domcontentloaded")
+    await page.locator(".input-base-text").fill(select_condition)
+    #点击搜索
+    await page.locator(".other-btns").click()
+    await page.wait_for_load_state("networkidle")
+
+
+async def _switch_to_max_page_size(page):
+    """切换成每页显示100条，返回第1页结果数据接口的响应，没有等到时返回None"""
+    await page.locator(".drop-down-box").click()
+    # 等待下拉列表的选项可见
+    await page.wait_for_selector("text=显示100条/页", state="visible")
+    # 使用 text 定位器可以精确找到包含该文本的元素，点击后等待结果数据接口返回、表格内容刷新，替代原来固定的1秒sleep
+    old_text = await get_inner_text(page, ".iwc-table-container")
+    response = await wait_for_response(page, RESULT_DATA_PATH,
+                                       action=page.locator("li:has-text('显示100条/页')").click)
+    await wait_for_text_change(page, ".iwc-table-container", old_text)
+    # 表格可能分批渲染，再等待网络空闲，但最多只等2秒，不会因为长连接卡住
+    await wait_for_network_quiet(page, timeout=2000)
+    return response
+
+
+async def _extract_result_table(page, headers: list) -> pd.DataFrame:
+    """提取当前结果页的表格，并使用预先解析好的表头"""
+    await page.wait_for_selector(".iwc-table-container", state="visible")
+    # 在浏览器内一次性提取表格数据
+    current_df = await extract_table(page.locator(".iwc-table-container"))
+    if not current_df.empty:
+        # 手动设置列名
+        current_df.columns = headers
+    return current_df
+
+
+async def _fetch_result_pages(page, headers: list) -> list:
+    """从当前页开始循环点击下一页直到无法点击为止，返回每一页的 DataFrame"""
+    all_dfs = []
+    while True:
+        current_df = await _extract_result_table(page, headers)
+        if not current_df.empty:
+            all_dfs.append(current_df)
+        # 定位 '下一页' 的 a 标签，它是可点击的元素
+        next_page_link = page.locator("a:has-text('下页')")
+
+        # 检查他的父标签是否可用
+        parent_element = next_page_link.locator("xpath=..")
+
+        class_value = await parent_element.get_attribute("class")
+        is_disable = class_value == "disabled"
+
+        if  is_disable:
+            LOGGER.info("已到达最后一页，停止点击。")
+            break  # 如果按钮不可用，则退出循环
+
+        # 点击下一页按钮，等待表格内容刷新，没有刷新时停止，避免重复读取同一页
+        if not await click_and_wait_for_change(page, next_page_link, ".iwc-table-container",
+                                               response_url=RESULT_DATA_PATH):
+            LOGGER.warning(f"问财选股翻到第{len(all_dfs) + 1}页后表格没有刷新，停止翻页")
+            break
+    return all_dfs
+
+
+def _result_rows(payload: Dict) -> List[Dict]:
+    """从结果数据接口的响应中取出当前页的数据行"""
+    return payload["answer"]["components"][0]["data"]["datas"]
+
+
+def _with_page(text: str, page_no: int) -> str:
+    """把请求参数（表单或JSON）中的页码替换为 page_no"""
+    if text.lstrip().startswith("{"):
+        params = json.loads(text)
+        params["page"] = page_no
+        return json.dumps(params, ensure_ascii=False)
+    params = dict(parse_qsl(text, keep_blank_values=True))
+    params["page"] = str(page_no)
+    return urlencode(params)
+
+
+def _normalize_cell(value):
+    """统一页面文本和接口数值的格式，用于按值对应列"""
+    text = str(value).strip().replace(",", "").rstrip("%")
+    try:
+        return round(float(text), 2)
+    except ValueError:
+        return text
+
+
+def _map_columns(first_df: pd.DataFrame, first_rows: List[Dict]) -> Optional[Dict[str, str]]:
+    """
+    按第1页的数据把页面表格的每一列对应到接口数据的字段，页面表头带单位、日期等，与字段名不一定相同。
+    序号、复选框列不需要对应，其余有任何一列对应不上时返回None
+    """
+    if len(first_df) != len(first_rows):
+        return None
+    keys = list(dict.fromkeys(key for row in first_rows for key in row))
+    column_map = {}
+    for column in first_df.columns:
+        if column in ("序号", "check_box"):
+            continue
+        page_values = [_normalize_cell(v) for v in first_df[column]]
+        for key in keys:
+            if key not in column_map.values() and \
+                    [_normalize_cell(row.get(key, "")) for row in first_rows] == page_values:
+                column_map[column] = key
+                break
+        else:
+            return None
+    return column_map
+
+
+async def _fetch_pages_by_api(context, response, first_df: pd.DataFrame, page_count: int) -> Optional[List[pd.DataFrame]]:
+    """
+    复用第1页结果数据接口的请求，只修改页码，并发获取第2页到第 page_count 页，结果按页码顺序排列。
+    请求带着同一个查询令牌，各页来自同一份结果。接口数据无法与页面表格对应时返回None
+    """
+    first_rows = _result_rows(await response.json())
+    column_map = _map_columns(first_df, first_rows)
+    if column_map is None:
+        LOGGER.warning("问财选股结果接口的数据与页面表格对应不上，改为逐页翻页获取")
+        return None
+
+    request = response.request
+    headers = {k: v for k, v in (await request.all_headers()).items()
+               if k.lower() not in _REPLAY_SKIP_HEADERS and not k.startswith(":")}
+    semaphore = asyncio.Semaphore(MAX_PAGE_CONCURRENCY)
+
+    async def fetch(page_no: int) -> List[Dict]:
+        async with semaphore:
+            if request.method == "GET":
+                parts = urlsplit(request.url)
+                url = urlunsplit(parts._replace(query=_with_page(parts.query, page_no)))
+                api_response = await context.request.get(url, headers=headers)
+            else:
+                api_response = await context.request.post(request.url, headers=headers,
+                                                          data=_with_page(request.post_data or "", page_no))
+            if not api_response.ok:
+                raise RuntimeError(f"第{page_no}页结果接口返回 {api_response.status}")
+            return _result_rows(await api_response.json())
+
+    other_rows = await asyncio.gather(*[fetch(page_no) for page_no in range(2, page_count + 1)])
+
+    all_dfs = [first_df]
+    offset = len(first_df)
+    for rows in other_rows:
+        if not rows:
+            continue
+        df = pd.DataFrame({column: [row.get(key) for row in rows] for column, key in column_map.items()})
+        if "序号" in first_df.columns:
+            df["序号"] = range(offset + 1, offset + len(rows) + 1)
+        if "check_box" in first_df.columns:
+            df["check_box"] = None
+        all_dfs.append(df[list(first_df.columns)])
+        offset += len(rows)
+    return all_dfs
+
+
+@timed("iwencai_A_stock_selection")
 async def iwencai_A_stock_selection(select_condition:str):
 
-    base_url = "https://www.iwencai.com/unifiedwap/home/stock"
-
     context  = await  context_manager.get_context("iwencai")
     page = None
-    all_dfs = []  # 用于存储每一页的 DataFrame
 
     try:
-        page = await context.new_page()
-        await page.goto(base_url)
-        await page.wait_for_load_state("domcontentloaded")
-        await page.locator(".input-base-text").fill(select_condition)
-        #点击搜索
-        await page.locator(".other-btns").click()
-        await page.wait_for_load_state("networkidle")
+        page = await crawl_scheduler.new_page(context)
+        await _run_selection_query(page, select_condition)
 
-
-        # 在循环之前先提取一次表头，因为表头不会改变，问财的表头有点特殊，由固定表头和变化表头组成
+        # 在分页之前先提取一次表头，因为表头不会改变，之后每页都复用，问财的表头有点特殊，由固定表头和变化表头组成
         fixed_header_locator = page.locator(".iwc-table-fixed .iwc-table-header ul li")
         header_locator = page.locator(".iwc-table-header-ul.clearfix li")
         fixed_headers = await fixed_header_locator.all_inner_texts()
@@ -72,85 +242,41 @@ async def iwencai_A_stock_selection(select_condition:str):
         if stock_count == 0:
             return f"在{select_condition}条件下没有选出任何股票"
 
-        # print("stock_count========",stock_count)
-
         #因为超过10支股票后会有分页的按钮
+        first_response = None
         if stock_count >10:
-            #切换成显示100页
-            await page.locator(".drop-down-box").click()
-            # 2. 等待下拉列表的选项可见
-            # 这行代码不是必须的，但能增加脚本的健壮性
-            await page.wait_for_selector("text=显示100条/页", state="visible")
-
-            # 3. 点击包含 "显示100条/页" 文本的 li 元素
-            # 使用 text 定位器可以精确找到包含该文本的元素
-            await page.locator("li:has-text('显示100条/页')").click()
-
-            # 等待页面重新加载
-            await page.wait_for_load_state("networkidle")
-
-        #加一秒延迟吧，不然数据可能多一点或者少一点的情况出现
-        await asyncio.sleep(1)
-        if stock_count <= 100:
-            await page.wait_for_selector(".iwc-table-container", state="visible")
-            table_container = page.locator(".iwc-table-container")
-
-            # 获取表格的 HTML 字符串
-            table_html = await table_container.inner_html()
-
-            # 使用 pandas.read_html 解析 HTML 表格
-            # io.StringIO 将字符串伪装成文件，以便 pandas 读取
-            current_df = pd.read_html(StringIO(table_html))[0]
-
-            if not current_df.empty:
-                # 手动设置列名
-                current_df.columns = headers
-                final_df = current_df.drop(columns=["check_box"])
+            first_response = await _switch_to_max_page_size(page)
+        else:
+            # 不超过10支时没有分页，等待结果表格的数据请求结束即可
+            await wait_for_network_quiet(page, timeout=2000)
+
+        if stock_count <= PAGE_SIZE:
+            first_df = await _extract_result_table(page, headers)
+            if not first_df.empty:
+                final_df = first_df.drop(columns=["check_box"])
                 final_df = final_df.drop_duplicates()
                 # 使用 pandas 的 to_markdown 方法转换为 Markdown 格式
                 markdown_table = final_df.to_markdown(index=False)
                 return markdown_table
+            return "无法找到表格数据。"
 
-        # 循环点击下一页直到无法点击为止
-        while True:
-            # 数据抓取逻辑
-            # 定位整个表格容器，包含表头和数据
-            await page.wait_for_selector(".iwc-table-container", state="visible")
-            table_container = page.locator(".iwc-table-container")
-
-            # 获取表格的 HTML 字符串
-            table_html = await table_container.inner_html()
-
-            # 使用 pandas.read_html 解析 HTML 表格
-            # io.StringIO 将字符串伪装成文件，以便 pandas 读取
-            current_df = pd.read_html(StringIO(table_html))[0]
-
-            if not current_df.empty:
-                # 手动设置列名
-                current_df.columns = headers
-                all_dfs.append(current_df)
-            # 定位 '下一页' 的 a 标签，它是可点击的元素
-            next_page_link = page.locator("a:has-text('下页')")
-
-            # 使用 Playwright 的 is_enabled() 方法来判断链接是否可用
-            # 这个方法会等待元素出现，并检查它是否可点击
-            # 检查他的父标签是否可见
-            parent_element = next_page_link.locator("xpath=..")
-
-            class_value = await parent_element.get_attribute("class")
-            is_disable = class_value == "disabled"
-
-            if  is_disable:
-                print("已到达最后一页，停止点击。")
-                break  # 如果按钮不可用，则退出循环
-
-            # 点击下一页按钮
-            await next_page_link.click()
-            # 等待页面加载完成
-            await page.wait_for_load_state("domcontentloaded")
+        # 各页必须来自同一次查询的结果，重新查询再跳页会得到不同时刻的结果，导致跨页重复或遗漏
+        page_count = (stock_count + PAGE_SIZE - 1) // PAGE_SIZE
+        all_dfs = None
+        if first_response is not None:
+            try:
+                all_dfs = await _fetch_pages_by_api(context, first_response, await _extract_result_table(page, headers),
+                                                    page_count)
+                if all_dfs is not None:
+                    LOGGER.info(f"问财选股共 {stock_count} 支股票，并发获取 {page_count} 页")
+            except Exception as e:
+                LOGGER.warning(f"问财选股并发获取分页失败，改为逐页翻页获取: {e!r}")
+        if all_dfs is None:
+            all_dfs = await _fetch_result_pages(page, headers)
+            LOGGER.info(f"问财选股共 {stock_count} 支股票，逐页获取 {len(all_dfs)} 页")
+        all_dfs = [df for df in all_dfs if not df.empty]
 
         # 将所有 DataFrame 合并成一个
-        # print("len(all_dfs)============",len(all_dfs))
         if all_dfs:
             final_df = pd.concat(all_dfs, ignore_index=True)
             #删除check_box列
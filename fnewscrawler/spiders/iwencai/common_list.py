@@ -1,4 +1,5 @@
 from fnewscrawler.core import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.utils import LOGGER
 async def base_news_list(base_url: str, page_no: int) -> list:
     """
@@ -10,7 +11,7 @@ async def base_news_list(base_url: str, page_no: int) -> list:
     context = await context_manager.get_context("iwencai")
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(base_url)
 
         await page.locator(".list-con").wait_for(state="visible")
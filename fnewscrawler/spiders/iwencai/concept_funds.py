@@ -1,10 +1,11 @@
 import asyncio
-import io
 
 import pandas as pd
 
-from fnewscrawler.core import get_redis
+from fnewscrawler.core import get_redis, extract_table
+from fnewscrawler.core.cache_policy import cache_policy
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.utils import LOGGER
 
 
@@ -18,20 +19,16 @@ async def fetch_page_data(context, url, rank_type):
 
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url, wait_until="networkidle")
         await page.wait_for_selector("table", timeout=5000)
         
-        # 获取表格的HTML内容
-        html_content = await page.locator("table").inner_html()
-        html_content = f"<table>{html_content}</table>"  # 添加完整的table标签
-        
-        # 使用pandas解析HTML表格
-        df = pd.read_html(io.StringIO(html_content))[0]
+        # 在浏览器内一次性提取表格数据
+        df = await extract_table(page.locator("table"))
 
-        # 缓存数据，半天后过期
+        # 缓存多日排名，盘中短时间过期，收盘后缓存到下一个交易日
         if rank_type.lower() in ["3day", "5day", "10day", "20day"]:
-            redis.set(redis_key, df, ex=43200, serializer="pickle")
+            redis.set(redis_key, df, ex=cache_policy.ttl("fund_rank"), serializer="pickle")
 
         return df
     except Exception as e:
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.utils.logger import LOGGER
 import asyncio
 from fnewscrawler.core.news_crawl import news_crawl_from_url
@@ -139,7 +140,7 @@ async def iwencai_crawl_from_query(query: str, pageno: int = 1) -> List[Dict[str
         List[Dict]: 新闻列表，每个元素包含url、title、time、source等字段
     """
     context = await context_manager.get_context("iwencai")
-    page = await context.new_page()
+    page = await crawl_scheduler.new_page(context)
     base_url = "https://www.iwencai.com/unifiedwap/info/news"
     try:
         # 访问问财新闻页面
@@ -1,8 +1,6 @@
-from io import StringIO
-
-import pandas as pd
-
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table, get_redis
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.cache_policy import cache_policy
 
 
 async def get_history_funds_flow(stock_code)-> str:
@@ -11,26 +9,29 @@ async def get_history_funds_flow(stock_code)-> str:
     :return: 历史资金流信息
     """
     url = f"https://stockpage.10jqka.com.cn/{stock_code}/funds/"
+    redis = get_redis()
+    redis_key = f"iwencai_history_funds_flow_{stock_code}"
+    cached = redis.get(redis_key, serializer="str")
+    if cached:
+        return cached
 
     context = await context_manager.get_context("iwencai")
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         await page.goto(url)
         await page.wait_for_load_state("domcontentloaded")
 
-        # 提取表格的 HTML 字符串
-        table_html = await page.locator("#history_table .m_table_3").inner_html()
-        html_content = f"<table>{table_html}</table>"  # 添加完整的table标签
-        # 使用 pandas.read_html 解析 HTML 表格
-        # io.StringIO 将字符串伪装成文件，以便 pandas 读取
-        current_df = pd.read_html(StringIO(html_content))[0]
+        # 在浏览器内一次性提取表格数据
+        current_df = await extract_table(page.locator("#history_table .m_table_3"))
         if not current_df.empty:
             # 手动设置列名
             current_df.columns = ["日期","收盘价", "涨跌幅", "资金净流入", "5日主力净额", "大单(主力)净额","大单(主力)净占比", "中单净额", "中单净占比", "小单净额", "小单净占比"]
             final_df = current_df.drop_duplicates()
             # 使用 pandas 的 to_markdown 方法转换为 Markdown 格式
             markdown_table = final_df.to_markdown(index=False)
+            # 当日资金流盘中实时变化，盘中短时间过期，收盘后缓存到下一个交易日
+            redis.set(redis_key, markdown_table, ex=cache_policy.ttl("fund_flow"), serializer="str")
             return markdown_table
         else:
             return "没有历史资金流信息"
@@ -1,11 +1,12 @@
 import asyncio
 import re
-from io import StringIO
 
 import pandas as pd
 
-from fnewscrawler.core import get_redis
+from fnewscrawler.core import get_redis, extract_table
+from fnewscrawler.core.cache_policy import cache_policy
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.utils import LOGGER
 
 
@@ -18,29 +19,22 @@ async def fetch_page_data(context, url: str, rank_type: str) -> pd.DataFrame:
 
     page = None
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
 
         await page.goto(url)
         await page.wait_for_selector('table')
 
-        # 获取表格HTML内容
-        table_html = await page.evaluate('() => document.querySelector("table").outerHTML')
-
-        # 使用StringIO包装HTML字符串，避免deprecation警告
-        html_io = StringIO(table_html)
-        df = pd.read_html(html_io)[0]
-
-        # 清理列名，移除可能的多级表头
-        df.columns = [col[1] if isinstance(col, tuple) else col for col in df.columns]
+        # 在浏览器内一次性提取表格数据，多级表头取最后一级作为列名
+        df = await extract_table(page.locator("table").first)
 
         # 清理数据中的特殊字符
         for col in df.columns:
             if df[col].dtype == object:
                 df[col] = df[col].apply(lambda x: re.sub(r'[\s%]+', '', str(x)) if pd.notnull(x) else x)
 
-        # 缓存数据，半天后过期
+        # 缓存多日排名，盘中短时间过期，收盘后缓存到下一个交易日
         if rank_type.lower() in ["3day", "5day", "10day", "20day"]:
-            redis.set(redis_key, df, ex=43200, serializer="pickle")
+            redis.set(redis_key, df, ex=cache_policy.ttl("fund_rank"), serializer="pickle")
 
         return df
     except Exception:
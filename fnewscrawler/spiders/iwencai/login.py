@@ -5,9 +5,9 @@
 
 处理问财网站的登录逻辑，支持多种登录方式  
 """
-import asyncio
 from typing import Tuple, List
 
+from fnewscrawler.core.page_waits import wait_for_network_quiet
 from fnewscrawler.core.qr_login_base import QRLoginBase
 from fnewscrawler.utils.logger import LOGGER
 
@@ -223,7 +223,8 @@ class IwencaiLogin(QRLoginBase):
 
             # 5. 设置弹窗监听并点击同花顺登录
             await qr_login_button.click()
-            await asyncio.sleep(2)
+            # 等待二维码请求完成，最多等2秒，替代固定的sleep
+            await wait_for_network_quiet(self.login_page, timeout=2000)
 
             # 7. 获取二维码图片URL
             qr_code_selector = ".code-box img"
@@ -1,8 +1,7 @@
-from io import StringIO
-
 import pandas as pd
 
-from fnewscrawler.core import context_manager
+from fnewscrawler.core import context_manager, extract_table
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 
 
 async def get_secu_margin_trading_info(stock_code, data_num=40)-> str:
@@ -20,16 +19,12 @@ async def get_secu_margin_trading_info(stock_code, data_num=40)-> str:
     columns_name =  ["序号","交易时间", "融资余额(元)", "融资买入额(元)", "融资偿还额(元)", "融资净买入(元)", "融券余量(万股)", "融券卖出量(万股)", "融券偿还额(万股)", "融券净卖出(万股)", "融资融券余额(元)"]
     all_dfs = []
     try:
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
         for url in urls:
             await page.goto(url)
             await page.wait_for_load_state("domcontentloaded")
-            # 提取表格的 HTML 字符串
-            table_html = await page.locator(".m-table").inner_html()
-            html_content = f"<table>{table_html}</table>"  # 添加完整的table标签
-            # 使用 pandas.read_html 解析 HTML 表格
-            # io.StringIO 将字符串伪装成文件，以便 pandas 读取
-            current_df = pd.read_html(StringIO(html_content))[0]
+            # 在浏览器内一次性提取表格数据
+            current_df = await extract_table(page.locator(".m-table"))
 
             if not current_df.empty:
                 # 手动设置列名
@@ -4,6 +4,7 @@ from typing import Dict, Any, List, Optional, Union
 import pandas as pd
 
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
 from fnewscrawler.utils.logger import LOGGER
 
 
@@ -52,7 +53,7 @@ async def extract_structured_data(
 
         # 获取或创建浏览器上下文
         context = await context_manager.get_context(context_name)
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
 
         # 设置用户代理
         await page.set_extra_http_headers({
@@ -398,7 +399,7 @@ async def extract_table_data(
 
         # 获取浏览器上下文
         context = await context_manager.get_context(context_name)
-        page = await context.new_page()
+        page = await crawl_scheduler.new_page(context)
 
         result_data = {
             "success": False,
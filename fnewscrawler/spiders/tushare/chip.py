@@ -1,4 +1,5 @@
 from fnewscrawler.core import TushareDataProvider
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.utils import LOGGER
 
 
@@ -30,10 +31,11 @@ async def stock_cyq_perf(stock_code: str, start_date: str, end_date: str):
         return df
 
     ts_code = tushare_data_provider.code2tscode(stock_code)
-    pro = tushare_data_provider.pro
-    df = pro.cyq_perf(ts_code=ts_code, start_date=start_date, end_date=end_date)
+    # 限流调用，区间超过单次行数上限时自动翻页
+    df = await data_provider.tushare(tushare_data_provider.query, "cyq_perf", ts_code=ts_code,
+                                     start_date=start_date, end_date=end_date)
     if not df.empty:
-        tushare_data_provider.cache_dataframe(query_key, df)
+        tushare_data_provider.cache_dataframe(query_key, df, dataset="cyq", end_date=end_date)
     return df
 
 
@@ -65,10 +67,11 @@ async def stock_cyq_chips(stock_code: str, start_date: str, end_date: str):
         return df
 
     ts_code = tushare_data_provider.code2tscode(stock_code)
-    pro = tushare_data_provider.pro
-    df = pro.cyq_chips(ts_code=ts_code, start_date=start_date, end_date=end_date)
+    # 限流调用，区间超过单次行数上限时自动翻页
+    df = await data_provider.tushare(tushare_data_provider.query, "cyq_chips", ts_code=ts_code,
+                                     start_date=start_date, end_date=end_date)
     if not df.empty:
-        tushare_data_provider.cache_dataframe(query_key, df)
+        tushare_data_provider.cache_dataframe(query_key, df, dataset="cyq", end_date=end_date)
 
     return df
 
@@ -4,11 +4,13 @@ from fnewscrawler.spiders.wallstreetcn.news import (
     wallstreetcn_crawl_all_categories,
     get_important_news
 )
+from fnewscrawler.spiders.wallstreetcn.live_poller import wallstreetcn_live_poller
 
 
 
 __all__ = [
     "wallstreetcn_crawl_news",
     "wallstreetcn_crawl_all_categories",
-    "get_important_news"
+    "get_important_news",
+    "wallstreetcn_live_poller"
 ]
@@ -0,0 +1,236 @@
+"""
+华尔街见闻快讯增量轮询
+
+每个频道一个后台轮询任务，记录已获取的最新快讯 id 和 display_time，每次只请求一小页第一页数据，
+遇到已知快讯即停止解析；两次轮询之间新增超过一页时沿 cursor 向后翻页补齐，
+补齐页数用完仍没有衔接上已知快讯时记录缺口边界，缺口之前的时间段不再视为完整覆盖。
+新快讯写入有界的内存环形缓冲区，同时写入 Redis 有序集合（score 为 display_time），
+服务重启后从 Redis 预热。MCP 工具的"最新N条"、"某时间之后"查询直接从内存返回。
+"""
+import asyncio
+import json
+import os
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set
+
+from fnewscrawler.core.redis_manager import get_redis
+from fnewscrawler.utils.logger import LOGGER
+from .news import API_CATEGORY_MAP, fetch_news_from_api, parse_api_response
+
+# 每个频道在内存中保留的快讯条数
+LIVE_BUFFER_SIZE = int(os.getenv("WALLSTREETCN_LIVE_BUFFER_SIZE", 500))
+# 轮询间隔（秒）
+LIVE_POLL_INTERVAL = float(os.getenv("WALLSTREETCN_POLL_INTERVAL", 15))
+# 每次轮询请求的条数，正常情况下一页就能覆盖两次轮询之间的新增快讯
+LIVE_POLL_PAGE_SIZE = 20
+# 缓冲区为空时第一次拉取的条数（接口单页上限）
+LIVE_INITIAL_PAGE_SIZE = 100
+# 新增快讯超过一页时最多向后补齐的页数
+LIVE_MAX_CATCHUP_PAGES = 5
+
+REDIS_KEY_PREFIX = "wallstreetcn:live:"
+
+
+class ChannelPoller:
+    """单个频道的增量轮询器"""
+
+    def __init__(self, category: str, buffer_size: int = LIVE_BUFFER_SIZE):
+        self.category = category
+        self.redis_key = f"{REDIS_KEY_PREFIX}{category}"
+        # 按 display_time 从旧到新排列
+        self.buffer: Deque[Dict] = deque(maxlen=buffer_size)
+        self._ids: Set = set()
+        self.newest_id = None
+        self.newest_time = 0
+        self.last_poll_at: Optional[datetime] = None
+        # 缺口边界：早于它的快讯可能有遗漏，0 表示没有缺口
+        self.gap_before = 0
+        self._lock = asyncio.Lock()
+
+    def _append(self, items: List[Dict]) -> None:
+        """按时间从旧到新追加到环形缓冲区"""
+        for item in items:
+            if len(self.buffer) == self.buffer.maxlen:
+                self._ids.discard(self.buffer[0]["id"])
+            self.buffer.append(item)
+            self._ids.add(item["id"])
+        if self.buffer:
+            self.newest_id = self.buffer[-1]["id"]
+            self.newest_time = self.buffer[-1]["display_time"]
+
+    def _is_new(self, item: Dict) -> bool:
+        return item["id"] not in self._ids and item["display_time"] >= self.newest_time
+
+    def load_from_redis(self) -> None:
+        """服务启动时从 Redis 有序集合中恢复最近的快讯"""
+        try:
+            client = get_redis().get_client()
+            members = client.zrange(self.redis_key, -self.buffer.maxlen, -1)
+            self._append([json.loads(member) for member in members])
+            self.gap_before = int(client.get(f"{self.redis_key}:gap") or 0)
+            if members:
+                LOGGER.info(f"华尔街见闻({self.category})：从Redis恢复{len(members)}条快讯")
+        except Exception as e:
+            LOGGER.warning(f"华尔街见闻({self.category})：从Redis恢复快讯失败: {e}")
+
+    def _save_to_redis(self, items: List[Dict]) -> None:
+        try:
+            client = get_redis().get_client()
+            pipe = client.pipeline()
+            pipe.zadd(self.redis_key, {json.dumps(item, ensure_ascii=False): item["display_time"] for item in items})
+            # 只保留与内存缓冲区相同数量的快讯
+            pipe.zremrangebyrank(self.redis_key, 0, -self.buffer.maxlen - 1)
+            pipe.execute()
+        except Exception as e:
+            LOGGER.warning(f"华尔街见闻({self.category})：快讯写入Redis失败: {e}")
+
+    def _mark_gap(self, boundary: int) -> None:
+        """记录缺口边界，同时写入 Redis，重启恢复后仍然生效"""
+        self.gap_before = max(self.gap_before, boundary)
+        LOGGER.warning(f"华尔街见闻({self.category})：新增快讯超过{LIVE_MAX_CATCHUP_PAGES}页，"
+                       f"{boundary}之前的快讯可能有遗漏")
+        try:
+            get_redis().get_client().set(f"{self.redis_key}:gap", self.gap_before)
+        except Exception as e:
+            LOGGER.warning(f"华尔街见闻({self.category})：缺口边界写入Redis失败: {e}")
+
+    async def poll_once(self) -> int:
+        """
+        拉取一次新快讯
+
+        Returns:
+            int: 本次新增的快讯条数
+        """
+        async with self._lock:
+            new_items: List[Dict] = []
+            cursor = None
+            page_size = LIVE_POLL_PAGE_SIZE if self.buffer else LIVE_INITIAL_PAGE_SIZE
+            connected = False
+            for _ in range(LIVE_MAX_CATCHUP_PAGES):
+                data = await fetch_news_from_api(self.category, page_size, cursor)
+                page_items = parse_api_response(data, self.category)
+                fresh = [item for item in page_items if self._is_new(item)]
+                new_items.extend(fresh)
+                cursor = data.get("data", {}).get("next_cursor")
+                # 本页出现已知快讯，或者是第一次轮询，说明已经衔接上，不再向后翻页
+                if len(fresh) < len(page_items) or not self.buffer or not cursor:
+                    connected = True
+                    break
+
+            self.last_poll_at = datetime.now()
+            if not new_items:
+                return 0
+            new_items.sort(key=lambda item: item["display_time"])
+            if not connected:
+                # 最早拉到的快讯和已有快讯之间可能还有没拉到的
+                self._mark_gap(new_items[0]["display_time"])
+            self._append(new_items)
+            self._save_to_redis(new_items)
+            return len(new_items)
+
+    def latest(self, limit: int = 50, important_only: bool = False) -> List[Dict]:
+        """最新的 limit 条快讯，按时间从新到旧"""
+        result = []
+        for item in reversed(self.buffer):
+            if important_only and item.get("importance") != "important":
+                continue
+            result.append(item)
+            if 0 < limit <= len(result):
+                break
+        return result
+
+    def covers(self, timestamp: int) -> bool:
+        """
+        缓冲区是否包含 timestamp 之后的全部快讯，最早一条仍晚于 timestamp 时更早的快讯已被淘汰或从未拉取；
+        timestamp 早于缺口边界时，缺口里的快讯可能遗漏，同样不算覆盖
+        """
+        return bool(self.buffer) and self.buffer[0]["display_time"] <= timestamp and timestamp >= self.gap_before
+
+    def since(self, timestamp: int, important_only: bool = False) -> List[Dict]:
+        """display_time 晚于 timestamp 的快讯，按时间从新到旧"""
+        result = []
+        for item in reversed(self.buffer):
+            if item["display_time"] <= timestamp:
+                break
+            if important_only and item.get("importance") != "important":
+                continue
+            result.append(item)
+        return result
+
+
+class WallstreetcnLivePoller:
+    """
+    管理各频道的后台轮询任务，第一次查询时自动启动
+    """
+
+    def __init__(self, interval: float = LIVE_POLL_INTERVAL):
+        self.interval = interval
+        self.channels: Dict[str, ChannelPoller] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get_channel(self, category: str) -> ChannelPoller:
+        if category not in API_CATEGORY_MAP:
+            raise ValueError(f"不支持的类别: {category}，支持的类别: {list(API_CATEGORY_MAP.keys())}")
+        channel = self.channels.get(category)
+        if channel is None:
+            channel = ChannelPoller(category)
+            channel.load_from_redis()
+            self.channels[category] = channel
+        return channel
+
+    async def _run(self, channel: ChannelPoller) -> None:
+        # 启动前已经同步拉取过一次，先等待一个间隔
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                count = await channel.poll_once()
+                if count:
+                    LOGGER.debug(f"华尔街见闻({channel.category})：新增{count}条快讯")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.warning(f"华尔街见闻({channel.category})：轮询快讯失败: {e}")
+
+    async def ensure_started(self, category: str) -> ChannelPoller:
+        """确保频道的后台轮询已启动，缓冲区为空时先同步拉取一次"""
+        channel = self.get_channel(category)
+        task = self._tasks.get(category)
+        if task is None or task.done():
+            if channel.last_poll_at is None:
+                await channel.poll_once()
+            # 并发调用时可能已经被其他协程启动
+            task = self._tasks.get(category)
+            if task is not None and not task.done():
+                return channel
+            self._tasks[category] = asyncio.create_task(self._run(channel))
+            LOGGER.info(f"华尔街见闻({category})：后台快讯轮询已启动，间隔{self.interval}秒")
+        return channel
+
+    async def latest(self, category: str = "global", limit: int = 50,
+                     important_only: bool = False) -> List[Dict]:
+        """获取最新的 limit 条快讯"""
+        channel = await self.ensure_started(category)
+        return channel.latest(limit, important_only)
+
+    async def since(self, category: str, timestamp: int, important_only: bool = False) -> List[Dict]:
+        """获取 timestamp 之后的快讯"""
+        channel = await self.ensure_started(category)
+        return channel.since(timestamp, important_only)
+
+    async def covers(self, category: str, timestamp: int) -> bool:
+        """内存中的快讯是否完整覆盖 timestamp 之后的时间段，见 ChannelPoller.covers"""
+        channel = await self.ensure_started(category)
+        return channel.covers(timestamp)
+
+    async def stop(self) -> None:
+        """停止所有后台轮询任务"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        LOGGER.info("华尔街见闻快讯轮询已停止")
+
+
+# 模块级实例，MCP 工具共用
+wallstreetcn_live_poller = WallstreetcnLivePoller()
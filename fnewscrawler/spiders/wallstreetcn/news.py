@@ -4,12 +4,13 @@
 """
 
 import re
+import html
 import asyncio
 import httpx
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
-from urllib.parse import urlencode
 
+from fnewscrawler.core.http_client import http_client_manager
 from fnewscrawler.utils.logger import LOGGER
 
 
@@ -34,6 +35,10 @@ API_CATEGORY_MAP = {
 # API基础URL
 API_BASE_URL = "https://api-one-wscn.awtmt.com/apiv1/content/lives"
 
+# 预编译的HTML标签和空白匹配
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def get_default_headers() -> Dict[str, str]:
     """获取默认的请求头"""
@@ -41,7 +46,6 @@ def get_default_headers() -> Dict[str, str]:
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
         "Accept": "application/json, text/plain, */*",
         "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-        "Accept-Encoding": "gzip, deflate, br",
         "Cache-Control": "no-cache",
         "Pragma": "no-cache",
         "Sec-Ch-Ua": '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
@@ -56,22 +60,16 @@ def get_default_headers() -> Dict[str, str]:
 
 
 def extract_text_from_html(html_content: str) -> str:
-    """从HTML内容中提取纯文本"""
-    # 简单的HTML标签清理
-    # 移除<p>标签
-    text = re.sub(r'</?p>', '', html_content)
-    # 移除其他HTML标签
-    text = re.sub(r'<[^>]+>', '', text)
-    # 清理多余空白
-    text = re.sub(r'\s+', ' ', text).strip()
-    # 处理特殊字符
-    text = text.replace('&nbsp;', ' ')
-    text = text.replace('&lt;', '<')
-    text = text.replace('&gt;', '>')
-    text = text.replace('&amp;', '&')
-    text = text.replace('&quot;', '"')
-
-    return text
+    """从HTML内容中提取纯文本：去掉标签、还原实体字符、合并空白"""
+    if not html_content:
+        return ""
+    text = html_content
+    if "<" in text:
+        text = _HTML_TAG_RE.sub('', text)
+    if "&" in text:
+        # &nbsp; 会被还原为 \xa0，下面的空白合并会把它替换成普通空格
+        text = html.unescape(text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
 
 
 def format_timestamp(timestamp: int) -> str:
@@ -110,36 +108,36 @@ async def fetch_news_from_api(category: str, limit: int = 20, cursor: Optional[s
     if cursor:
         params["cursor"] = cursor
 
-    url = f"{API_BASE_URL}?{urlencode(params)}"
     headers = get_default_headers()
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
+    # 复用应用共享的连接池，避免每次请求都重新建立连接
+    try:
+        response = await http_client_manager.get(API_BASE_URL, params=params, headers=headers)
+        response.raise_for_status()
 
-            data = response.json()
+        data = response.json()
 
-            if data.get("code") != 20000:
-                raise Exception(f"API返回错误: {data.get('message', 'Unknown error')}")
+        if data.get("code") != 20000:
+            raise Exception(f"API返回错误: {data.get('message', 'Unknown error')}")
 
-            return data
+        return data
 
-        except httpx.HTTPError as e:
-            LOGGER.error(f"HTTP请求失败: {e}")
-            raise
-        except Exception as e:
-            LOGGER.error(f"获取API数据失败: {e}")
-            raise
+    except httpx.HTTPError as e:
+        LOGGER.error(f"HTTP请求失败: {e}")
+        raise
+    except Exception as e:
+        LOGGER.error(f"获取API数据失败: {e}")
+        raise
 
 
-def parse_api_response(data: Dict, category: str) -> List[Dict[str, str]]:
+def parse_api_response(data: Dict, category: str, include_html: bool = False) -> List[Dict[str, str]]:
     """
     解析API响应数据
 
     Args:
         data: API响应数据
         category: 新闻类别
+        include_html: 是否保留原始HTML内容(content_html字段)，默认不保留以减小返回数据量
 
     Returns:
         解析后的新闻列表
@@ -173,7 +171,6 @@ def parse_api_response(data: Dict, category: str) -> List[Dict[str, str]]:
                 "id": item.get("id", ""),
                 "time": time_str,
                 "content": content_text,
-                "content_html": content_html,
                 "importance": importance,
                 "category": category,
                 "author": item.get("author", {}).get("display_name", ""),
@@ -184,6 +181,9 @@ def parse_api_response(data: Dict, category: str) -> List[Dict[str, str]]:
                 "channels": channels
             }
 
+            if include_html:
+                news_info["content_html"] = content_html
+
             news_list.append(news_info)
 
         except Exception as e:
@@ -193,13 +193,15 @@ def parse_api_response(data: Dict, category: str) -> List[Dict[str, str]]:
     return news_list
 
 
-async def wallstreetcn_crawl_news(category: str = "global", limit: int = 50) -> List[Dict[str, str]]:
+async def wallstreetcn_crawl_news(category: str = "global", limit: int = 50,
+                                  include_html: bool = False) -> List[Dict[str, str]]:
     """
     爬取华尔街见闻快讯新闻（API方式）
 
     Args:
         category: 新闻类别，支持 global(要闻)、a-stock(A股)、us-stock(美股)、hk-stock(港股)、commodity(商品)
         limit: 最大爬取数量，默认50条
+        include_html: 是否在结果中保留原始HTML内容(content_html字段)
 
     Returns:
         List[Dict]: 新闻列表，每个元素包含id、time、content、importance、category等字段
@@ -214,7 +216,7 @@ async def wallstreetcn_crawl_news(category: str = "global", limit: int = 50) ->
         response_data = await fetch_news_from_api(category, min(limit, 100))
 
         # 解析响应
-        news_list = parse_api_response(response_data, category)
+        news_list = parse_api_response(response_data, category, include_html)
 
         # 限制返回数量
         if limit > 0 and len(news_list) > limit:
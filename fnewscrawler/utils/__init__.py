@@ -1,9 +1,19 @@
 from .logger import LOGGER
 from .path import get_project_root
 from .user_agent import get_random_user_agent
-from .url import extract_second_level_domain
+from .url import extract_second_level_domain, canonicalize_url
 from .params import format_param,parse_params2list
-from .text_duplicate import deduplicate_text_df,deduplicate_chinese_texts
+from .lazy import lazy_import, lazy_package_getattr
 
-__all__ = ['LOGGER', 'get_project_root', "get_random_user_agent", "extract_second_level_domain","format_param","parse_params2list",
-           "deduplicate_text_df","deduplicate_chinese_texts"]
+# 文本去重依赖 pandas/numpy，访问时才导入
+__getattr__ = lazy_package_getattr(__name__, {
+    "deduplicate_text_df": ".text_duplicate",
+    "deduplicate_chinese_texts": ".text_duplicate",
+    "IncrementalDeduplicator": ".text_duplicate",
+    "AnnDeduplicator": ".text_duplicate",
+    "encode_texts": ".text_duplicate",
+})
+
+__all__ = ['LOGGER', 'get_project_root', "get_random_user_agent", "extract_second_level_domain","canonicalize_url","format_param","parse_params2list",
+           "deduplicate_text_df","deduplicate_chinese_texts","IncrementalDeduplicator","AnnDeduplicator","encode_texts",
+           "lazy_import","lazy_package_getattr"]
@@ -0,0 +1,191 @@
+"""
+近似最近邻向量索引
+
+用于大规模新闻去重：向量需先做 L2 归一化，相似度为内积（即余弦相似度）。
+安装了 hnswlib 时使用 HNSW 图索引，否则使用 NumPy 实现的倒排文件（IVF）索引：
+数据量较小时直接暴力计算，超过阈值后用球面 k-means 聚出中心，查询时只扫描最近的若干个簇。
+两种实现都支持流式插入、按阈值查询和保存到磁盘。
+"""
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from fnewscrawler.utils.logger import LOGGER
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+class HnswVectorIndex:
+    """基于 hnswlib 的向量索引"""
+
+    backend = "hnsw"
+
+    def __init__(self, dim: int, capacity: int = 10000, m: int = 16, ef_construction: int = 200, ef: int = 64):
+        self.dim = dim
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(max_elements=capacity, M=m, ef_construction=ef_construction)
+        self._index.set_ef(ef)
+
+    def __len__(self) -> int:
+        return self._index.get_current_count()
+
+    def add(self, embs: np.ndarray) -> None:
+        count = len(self)
+        needed = count + len(embs)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, self._index.get_max_elements() * 2))
+        self._index.add_items(embs, np.arange(count, needed))
+
+    def search(self, emb: np.ndarray, threshold: float, k: int = 10) -> List[Tuple[int, float]]:
+        if len(self) == 0:
+            return []
+        labels, distances = self._index.knn_query(emb, k=min(k, len(self)))
+        # ip 空间的距离为 1 - 内积
+        return [(int(label), 1.0 - float(dist)) for label, dist in zip(labels[0], distances[0])
+                if 1.0 - float(dist) >= threshold]
+
+    def save(self, path: Path) -> None:
+        self._index.save_index(str(path.with_suffix(".hnsw")))
+
+    @classmethod
+    def load(cls, path: Path, dim: int) -> "HnswVectorIndex":
+        index = cls.__new__(cls)
+        index.dim = dim
+        index._index = hnswlib.Index(space="ip", dim=dim)
+        index._index.load_index(str(path.with_suffix(".hnsw")))
+        index._index.set_ef(64)
+        return index
+
+
+class NumpyIVFIndex:
+    """NumPy 实现的 IVF 向量索引，hnswlib 不可用时的兜底方案"""
+
+    backend = "ivf"
+
+    # 向量数超过该值后才建立倒排，之前直接暴力计算
+    TRAIN_THRESHOLD = 4096
+
+    def __init__(self, dim: int, nprobe: int = 8):
+        self.dim = dim
+        self.nprobe = nprobe
+        # 预分配并按倍数扩容，避免流式插入时每次都复制全部向量
+        self._buffer = np.zeros((1024, dim), dtype=np.float32)
+        self._size = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        # 上次训练时的向量数，数据量翻倍后重新训练
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def _vectors(self) -> np.ndarray:
+        return self._buffer[:self._size]
+
+    def _train(self, iterations: int = 10) -> None:
+        """球面 k-means 聚类，簇数取 sqrt(N)"""
+        n = len(self._vectors)
+        k = max(int(np.sqrt(n)), 1)
+        rng = np.random.default_rng(0)
+        centroids = self._vectors[rng.choice(n, k, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(self._vectors @ centroids.T, axis=1)
+            for c in range(k):
+                members = self._vectors[assign == c]
+                if len(members):
+                    center = members.sum(axis=0)
+                    centroids[c] = center / (np.linalg.norm(center) or 1.0)
+        assign = np.argmax(self._vectors @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [np.flatnonzero(assign == c).tolist() for c in range(k)]
+        self._trained_size = n
+        LOGGER.debug(f"IVF索引训练完成，向量数 {n}，簇数 {k}")
+
+    def add(self, embs: np.ndarray) -> None:
+        start = self._size
+        end = start + len(embs)
+        if end > len(self._buffer):
+            buffer = np.zeros((max(end, len(self._buffer) * 2), self.dim), dtype=np.float32)
+            buffer[:start] = self._buffer[:start]
+            self._buffer = buffer
+        self._buffer[start:end] = embs
+        self._size = end
+        if self._centroids is None:
+            if len(self._vectors) >= self.TRAIN_THRESHOLD:
+                self._train()
+            return
+        if len(self._vectors) >= self._trained_size * 2:
+            self._train()
+            return
+        assign = np.argmax(embs @ self._centroids.T, axis=1)
+        for offset, c in enumerate(assign):
+            self._lists[c].append(start + offset)
+
+    def search(self, emb: np.ndarray, threshold: float, k: int = 10) -> List[Tuple[int, float]]:
+        if self._size == 0:
+            return []
+        if self._centroids is None:
+            ids = np.arange(self._size)
+        else:
+            probes = np.argsort(-(self._centroids @ emb))[:self.nprobe]
+            ids = np.array([i for c in probes for i in self._lists[c]], dtype=np.int64)
+            if len(ids) == 0:
+                return []
+        sims = self._vectors[ids] @ emb
+        order = np.argsort(-sims)[:k]
+        return [(int(ids[i]), float(sims[i])) for i in order if sims[i] >= threshold]
+
+    def save(self, path: Path) -> None:
+        np.save(path.with_suffix(".npy"), self._vectors)
+
+    @classmethod
+    def load(cls, path: Path, dim: int) -> "NumpyIVFIndex":
+        index = cls(dim)
+        vectors = np.load(path.with_suffix(".npy"))
+        if len(vectors):
+            index.add(vectors)
+        return index
+
+
+def create_vector_index(dim: int, backend: str = "auto"):
+    """
+    创建向量索引
+
+    参数
+    ----
+    dim : int
+        向量维度
+    backend : str
+        auto（优先 hnsw）、hnsw、ivf
+    """
+    if backend == "hnsw" or (backend == "auto" and hnswlib is not None):
+        if hnswlib is None:
+            raise ImportError("使用hnsw索引需要安装hnswlib: pip install hnswlib")
+        return HnswVectorIndex(dim)
+    return NumpyIVFIndex(dim)
+
+
+def save_vector_index(index, path: str) -> None:
+    """把索引及其元数据保存到磁盘，path 不含扩展名"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    path.with_suffix(".json").write_text(json.dumps({"backend": index.backend, "dim": index.dim}), encoding="utf-8")
+
+
+def load_vector_index(path: str):
+    """从磁盘加载索引，文件不存在时返回 None"""
+    path = Path(path)
+    meta_path = path.with_suffix(".json")
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta["backend"] == "hnsw":
+        return HnswVectorIndex.load(path, meta["dim"])
+    return NumpyIVFIndex.load(path, meta["dim"])
@@ -0,0 +1,70 @@
+"""
+延迟导入工具
+
+akshare、tushare、talib、torch 等依赖导入很慢，MCP 工具模块在启动时只需要完成工具注册，
+这些依赖改为第一次真正调用时再导入，缩短启动时间并降低每个 worker 的内存占用。
+"""
+import importlib
+from typing import Any, Callable, Dict, Optional
+
+
+class LazyImport:
+    """模块或模块属性的代理对象，第一次访问属性或调用时才执行导入"""
+
+    def __init__(self, module: str, attr: Optional[str] = None):
+        self._module = module
+        self._attr = attr
+        self._obj = None
+
+    def _load(self) -> Any:
+        if self._obj is None:
+            module = importlib.import_module(self._module)
+            self._obj = getattr(module, self._attr) if self._attr else module
+        return self._obj
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._load()(*args, **kwargs)
+
+    @property
+    def target(self) -> str:
+        """被代理对象的完整路径，访问时不触发导入"""
+        return f"{self._module}.{self._attr}" if self._attr else self._module
+
+    def __repr__(self) -> str:
+        return f"<LazyImport {self.target} {'loaded' if self._obj is not None else 'not loaded'}>"
+
+
+def lazy_import(module: str, attr: Optional[str] = None) -> Any:
+    """
+    延迟导入模块或模块中的属性
+
+    Args:
+        module: 模块路径，如 "talib"、"fnewscrawler.spiders.akshare"
+        attr: 模块中的属性名，为空时代理整个模块
+
+    Returns:
+        代理对象，用法与原对象一致，如 ta.RSI(...)、stock_cyq_em(...)
+    """
+    return LazyImport(module, attr)
+
+
+def lazy_package_getattr(package: str, attr_modules: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    生成包级别的 __getattr__（PEP 562），访问包导出的名称时才导入对应的子模块
+
+    Args:
+        package: 包名，即包 __init__ 中的 __name__
+        attr_modules: 导出名称到相对子模块的映射，如 {"TushareDataProvider": ".tushare_data_provider"}
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = attr_modules.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 缓存到包的命名空间，之后不再经过 __getattr__
+        setattr(importlib.import_module(package), name, value)
+        return value
+    return __getattr__
@@ -5,8 +5,8 @@ from loguru import logger
 
 class Logger:
     def __init__(self):
-        # 只允许INFO、WARNING、ERROR三种日志等级
-        allowed_levels = {"INFO", "WARNING", "ERROR"}
+        # 只允许DEBUG、INFO、WARNING、ERROR四种日志等级
+        allowed_levels = {"DEBUG", "INFO", "WARNING", "ERROR"}
         env_level = os.getenv("LOGGING_LEVEL", "INFO").upper()
         self.level = env_level if env_level in allowed_levels else "INFO"
         self.logger = logger
@@ -20,8 +20,12 @@ class Logger:
             level=self.level
         )
 
+    def debug(self, msg):
+        if self.level == "DEBUG":
+            self.logger.debug(msg)
+
     def info(self, msg):
-        if self.level == "INFO":
+        if self.level in ["DEBUG", "INFO"]:
             self.logger.info(msg)
         elif self.level == "WARNING":
             # 只输出WARNING及以上
@@ -31,7 +35,7 @@ class Logger:
             pass
 
     def warning(self, msg):
-        if self.level in ["INFO", "WARNING"]:
+        if self.level in ["DEBUG", "INFO", "WARNING"]:
             self.logger.warning(msg)
         elif self.level == "ERROR":
             pass
@@ -39,5 +43,9 @@ class Logger:
     def error(self, msg):
         self.logger.error(msg)
 
+    def exception(self, msg):
+        # 输出ERROR并附带当前异常堆栈
+        self.logger.exception(msg)
+
 # 实例化logger对象供外部使用
 LOGGER = Logger()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+基于字符 n-gram 的 SimHash 文本指纹
+
+用于在语义去重之前做一轮廉价的字面去重：完全相同（忽略空白和标点）的文本直接按哈希去掉，
+近似相同的文本用 64 位 SimHash 的汉明距离判断。按鸽巢原理把指纹切成若干段，
+汉明距离不超过 max_distance 的两条指纹至少有一段完全相同，只需比较同段桶里的候选，整体接近线性时间。
+"""
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SIMHASH_BITS = 64
+_MASK = (1 << SIMHASH_BITS) - 1
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+# 去掉空白和常见中英文标点，转发稿常见的差异只在这些字符上；保留 . % + - 等数字相关的符号，避免 1.5% 与 15% 被当成相同
+_NORMALIZE_RE = re.compile(r"[\s　-〿，！？；：“”‘’（）【】《》、…—·,!?;:\"'()\[\]{}<>|~`*#]+")
+
+
+def normalize_text(text: str) -> str:
+    """去掉空白和标点并转小写"""
+    return _NORMALIZE_RE.sub("", text).lower()
+
+
+def simhash(text: str, ngram: int = 3) -> int:
+    """计算文本的 64 位 SimHash，文本需先经过 normalize_text"""
+    if len(text) <= ngram:
+        grams = [text]
+    else:
+        grams = [text[i:i + ngram] for i in range(len(text) - ngram + 1)]
+    # 进程内 hash 结果稳定，指纹只在同一进程中比较
+    hashes = np.array([hash(g) & _MASK for g in grams], dtype=np.uint64)
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    votes = bits.sum(axis=0) * 2 > len(grams)
+    value = 0
+    for i in np.flatnonzero(votes):
+        value |= 1 << int(i)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def near_duplicate_keep_indices(texts: List[str], max_distance: int = 3, ngram: int = 3) -> List[int]:
+    """
+    字面去重，返回保留的下标（保留第一条）
+
+    参数
+    ----
+    texts : List[str]
+    max_distance : int
+        SimHash 汉明距离不超过该值视为近似重复，为 0 时只去掉完全相同的文本
+    ngram : int
+        字符 n-gram 长度
+
+    返回
+    ----
+    List[int]
+        按原顺序排列的保留下标
+    """
+    bands = max_distance + 1
+    band_width = SIMHASH_BITS // bands
+    band_mask = (1 << band_width) - 1
+
+    seen_exact = set()
+    buckets: Dict[Tuple[int, int], List[int]] = {}
+    kept_fingerprints: List[int] = []
+    keep_indices: List[int] = []
+
+    for i, text in enumerate(texts):
+        normalized = normalize_text(text)
+        if normalized in seen_exact:
+            continue
+        seen_exact.add(normalized)
+        if max_distance == 0 or not normalized:
+            keep_indices.append(i)
+            continue
+
+        fp = simhash(normalized, ngram)
+        band_keys = [(b, (fp >> (b * band_width)) & band_mask) for b in range(bands)]
+        is_duplicate = False
+        for key in band_keys:
+            for k in buckets.get(key, ()):
+                if hamming_distance(fp, kept_fingerprints[k]) <= max_distance:
+                    is_duplicate = True
+                    break
+            if is_duplicate:
+                break
+        if is_duplicate:
+            continue
+
+        k = len(kept_fingerprints)
+        kept_fingerprints.append(fp)
+        for key in band_keys:
+            buckets.setdefault(key, []).append(k)
+        keep_indices.append(i)
+    return keep_indices
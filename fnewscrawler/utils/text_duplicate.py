@@ -1,12 +1,33 @@
+"""
+新闻文本语义去重
+
+torch 和 sentence_transformers 导入很慢，这里都在第一次真正用到模型时才导入，
+fnewscrawler.utils 被导入时不会拖慢进程启动。
+"""
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+import numpy as np
 import pandas as pd
-from huggingface_hub import snapshot_download
-from sentence_transformers import SentenceTransformer, util
 
 from fnewscrawler.utils import LOGGER
+from fnewscrawler.utils.ann_index import create_vector_index, load_vector_index, save_vector_index
+from fnewscrawler.utils.simhash import near_duplicate_keep_indices
+
+# 内存中最多缓存的文本向量数量
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 20000))
+# Redis 中文本向量的过期时间（秒），默认7天
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", 7 * 24 * 3600))
+EMBEDDING_REDIS_PREFIX = "text_embedding:"
+# 语义去重前 SimHash 字面去重的默认汉明距离，3 以内基本只合并转载稿（标点、来源前缀不同）
+DEDUP_SIMHASH_DISTANCE = 3
+# 去重使用的模型
+DEDUP_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 
 
 def download_sentence_transformer_model(
@@ -51,8 +72,9 @@ def download_sentence_transformer_model(
 
     LOGGER.info(f"正在下载模型 '{model_name}' (revision: {revision}) 到: {cache_path}")
 
-    # 设置镜像站
+    # 设置镜像站，需要在导入 huggingface_hub 之前设置
     os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
+    from huggingface_hub import snapshot_download
 
     # === 文件过滤规则 ===
     if only_required_files:
@@ -109,25 +131,219 @@ def download_sentence_transformer_model(
             shutil.rmtree(cache_path)
         raise
 
+# 模型推理方式：fp32（默认）、int8（动态量化，CPU 上更快）、onnx（需要安装 onnxruntime 和 optimum）
+DEDUP_MODEL_MODE = os.getenv("DEDUP_MODEL_MODE", "fp32").lower()
+
 # 全局缓存模型，避免重复加载
 _MODEL = None
+_MODEL_LOCK = threading.Lock()
+
+
+def _default_model_dir() -> Path:
+    safe_model_name = DEDUP_MODEL_NAME.replace("/", "_")
+    return Path.home() / "sentence-transformers" / safe_model_name
+
+
+def load_model(cache_dir=None, mode: str = DEDUP_MODEL_MODE):
+    """
+    加载去重模型，每次调用都会重新加载，业务代码请使用 _get_model 获取共享实例
+
+    参数
+    ----
+    cache_dir : 模型目录，默认 ~/sentence-transformers/ 下的多语言 MiniLM
+    mode : str
+        fp32、int8、onnx
+    """
+    from sentence_transformers import SentenceTransformer
+
+    cache_dir = str(cache_dir or _default_model_dir())
+    if mode == "onnx":
+        try:
+            return SentenceTransformer(cache_dir, backend="onnx")
+        except Exception as e:
+            LOGGER.warning(f"ONNX Runtime加载去重模型失败，改用fp32模型: {e}")
+            mode = "fp32"
+
+    # 中文通用轻量模型
+    model = SentenceTransformer(cache_dir, device="cpu" if mode == "int8" else None)
+    if mode == "int8":
+        import torch
+        # 只量化全连接层，权重转为int8，激活在推理时动态量化
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
 
 def _get_model(cache_dir=None):
     global _MODEL
-    if cache_dir is None:
-        home = Path.home()
-        model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-        safe_model_name = model_name.replace("/", "_")
-        cache_dir = home / "sentence-transformers" / safe_model_name
     if _MODEL is None:
-        # 中文通用轻量模型
-        _MODEL = SentenceTransformer(str(cache_dir))
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                start = time.perf_counter()
+                _MODEL = load_model(cache_dir)
+                LOGGER.info(f"新闻去重模型加载完成({DEDUP_MODEL_MODE})，耗时 {time.perf_counter() - start:.2f} 秒")
     return _MODEL
 
 
+def preload_model_in_background() -> threading.Thread:
+    """在后台线程中预先加载去重模型，避免第一次去重的请求被模型加载阻塞"""
+    thread = threading.Thread(target=_get_model, name="dedup-model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+# ==================== 文本向量缓存 ====================
+
+# 文本哈希 -> 归一化后的 float32 向量，按最近使用顺序淘汰
+_EMBEDDING_CACHE: "OrderedDict[str, np.ndarray]" = OrderedDict()
+# Redis 不可用后暂停使用的时间（秒），期间只使用内存缓存，到期后再尝试连接
+REDIS_RETRY_INTERVAL = 60
+_redis_disabled_until = 0.0
+
+
+# 不同模型、不同推理方式得到的向量不能放在同一个相似度矩阵中比较，Redis 键带上模型和推理方式
+_EMBEDDING_KEY_PREFIX = f"{EMBEDDING_REDIS_PREFIX}{DEDUP_MODEL_NAME.replace('/', '_')}:{DEDUP_MODEL_MODE}:"
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_redis_client():
+    """获取 Redis 客户端，不可用时返回 None，只使用内存缓存"""
+    if time.time() < _redis_disabled_until:
+        return None
+    try:
+        # 延迟导入，避免 utils 与 core 之间的循环导入
+        from fnewscrawler.core.redis_manager import get_redis
+        return get_redis().get_client()
+    except Exception as e:
+        _disable_redis(e)
+        return None
+
+
+def _disable_redis(error: Exception) -> None:
+    """Redis 出错后暂停使用 REDIS_RETRY_INTERVAL 秒，避免每批文本都等待连接超时"""
+    global _redis_disabled_until
+    _redis_disabled_until = time.time() + REDIS_RETRY_INTERVAL
+    LOGGER.warning(f"文本向量缓存无法使用Redis，{REDIS_RETRY_INTERVAL}秒内仅使用内存缓存: {error}")
+
+
+def _remember(key: str, emb: np.ndarray) -> None:
+    _EMBEDDING_CACHE[key] = emb
+    _EMBEDDING_CACHE.move_to_end(key)
+    while len(_EMBEDDING_CACHE) > EMBEDDING_CACHE_SIZE:
+        _EMBEDDING_CACHE.popitem(last=False)
+
+
+def encode_texts(texts: List[str]) -> np.ndarray:
+    """
+    获取文本的归一化向量，优先从内存和 Redis 缓存中读取，只对未缓存的文本调用模型编码。
+    Redis 中以 float16 字节存储，节省一半空间。
+
+    参数
+    ----
+    texts : List[str]
+
+    返回
+    ----
+    np.ndarray
+        形状为 (len(texts), dim) 的 float32 向量，已做 L2 归一化，点积即余弦相似度
+    """
+    keys = [_text_hash(t) for t in texts]
+    embs: List[Optional[np.ndarray]] = [None] * len(texts)
+
+    missing = []
+    for i, key in enumerate(keys):
+        emb = _EMBEDDING_CACHE.get(key)
+        if emb is not None:
+            _EMBEDDING_CACHE.move_to_end(key)
+            embs[i] = emb
+        else:
+            missing.append(i)
+
+    redis_client = _get_redis_client() if missing else None
+    if redis_client is not None:
+        try:
+            values = redis_client.mget([_EMBEDDING_KEY_PREFIX + keys[i] for i in missing])
+            still_missing = []
+            for i, value in zip(missing, values):
+                if value is None:
+                    still_missing.append(i)
+                    continue
+                embs[i] = np.frombuffer(value, dtype=np.float16).astype(np.float32)
+                _remember(keys[i], embs[i])
+            missing = still_missing
+        except Exception as e:
+            _disable_redis(e)
+            redis_client = None
+
+    if missing:
+        # 同一批中重复的文本只编码一次
+        unique_keys = list(dict.fromkeys(keys[i] for i in missing))
+        first_index = {}
+        for i in missing:
+            first_index.setdefault(keys[i], i)
+        new_embs = _get_model().encode([texts[first_index[k]] for k in unique_keys], convert_to_numpy=True,
+                                       normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+        encoded = dict(zip(unique_keys, new_embs))
+        for key, emb in encoded.items():
+            _remember(key, emb)
+        for i in missing:
+            embs[i] = encoded[keys[i]]
+
+        if redis_client is not None:
+            try:
+                pipe = redis_client.pipeline()
+                for key, emb in encoded.items():
+                    pipe.set(_EMBEDDING_KEY_PREFIX + key, emb.astype(np.float16).tobytes(), ex=EMBEDDING_CACHE_TTL)
+                pipe.execute()
+            except Exception as e:
+                LOGGER.warning(f"文本向量写入Redis失败: {e}")
+
+    if not embs:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(embs)
+
+
+def _dedup_keep_indices(texts: List[str], threshold: float, simhash_distance: Optional[int] = DEDUP_SIMHASH_DISTANCE,
+                        method: str = "cluster") -> List[int]:
+    """
+    对一批文本去重，返回保留的下标。
+    simhash_distance 不为 None 时先用 SimHash 在线性时间内去掉完全相同和近似相同的文本（保留第一条），
+    只把剩下的文本交给模型做语义去重，转载稿多时速度快很多。
+    代价是保留的代表文本可能与只做语义去重时不同，极少数字面相近、语义不同的文本（如只差一个数字）也可能被合并，
+    需要与只做语义去重完全一致的结果时传 None。
+    method 为 cluster 时做社区聚类，每个簇保留第一条；为 ann 时逐条查询近似最近邻索引，适合上万条的数据量。
+    """
+    if simhash_distance is None:
+        candidates = list(range(len(texts)))
+    else:
+        candidates = near_duplicate_keep_indices(texts, max_distance=simhash_distance)
+    if len(candidates) < 2:
+        return candidates
+
+    if method == "ann":
+        keep_mask = AnnDeduplicator(threshold=threshold).add([texts[i] for i in candidates])
+        return [i for i, keep in zip(candidates, keep_mask) if keep]
+
+    import torch
+    from sentence_transformers import util
+
+    embs = torch.from_numpy(encode_texts([texts[i] for i in candidates]))
+    clusters = util.community_detection(embs, threshold=threshold, min_community_size=2)
+    keep_indices = set()
+    for c in clusters:
+        keep_indices.add(c[0])
+    # 单篇未聚类也算保留
+    keep_indices.update(set(range(len(candidates))) - {i for c in clusters for i in c})
+    return [candidates[i] for i in sorted(keep_indices)]
+
+
 def deduplicate_text_df(df: pd.DataFrame,
                         text_col: str,
-                        threshold: float = 0.8) -> pd.DataFrame:
+                        threshold: float = 0.8,
+                        simhash_distance: Optional[int] = DEDUP_SIMHASH_DISTANCE,
+                        method: str = "cluster") -> pd.DataFrame:
     """
     语义去重 DataFrame 指定列，返回去重后的 DataFrame（保留第一条）。
 
@@ -138,6 +354,10 @@ def deduplicate_text_df(df: pd.DataFrame,
         要去重的列名
     threshold : float
         语义相似度阈值（0~1）
+    simhash_distance : Optional[int]
+        语义去重前字面去重的 SimHash 汉明距离，默认 3；0 只去掉完全相同的文本，None 不做字面去重，结果与只做语义去重一致
+    method : str
+        cluster 社区聚类（O(n²)，适合几千条以内）；ann 近似最近邻索引，适合上万条
 
     返回
     ----
@@ -148,21 +368,14 @@ def deduplicate_text_df(df: pd.DataFrame,
         return df
 
     texts = df[text_col].astype(str).tolist()
-    model = _get_model()
-    embs = model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
-
-    clusters = util.community_detection(embs, threshold=threshold, min_community_size=2)
-    keep_indices = set()
-    for c in clusters:
-        keep_indices.add(c[0])
-    # 单篇未聚类也算保留
-    keep_indices.update(set(range(len(texts))) - {i for c in clusters for i in c})
-
-    return df.iloc[sorted(keep_indices)].reset_index(drop=True)
+    keep_indices = _dedup_keep_indices(texts, threshold, simhash_distance, method)
+    return df.iloc[keep_indices].reset_index(drop=True)
 
 
 def deduplicate_chinese_texts(texts: List[str],
-                              threshold: float = 0.8) -> List[str]:
+                              threshold: float = 0.8,
+                              simhash_distance: Optional[int] = DEDUP_SIMHASH_DISTANCE,
+                              method: str = "cluster") -> List[str]:
     """
     语义去重中文新闻文本 list，返回去重后的 list（保留第一条）。
 
@@ -170,6 +383,10 @@ def deduplicate_chinese_texts(texts: List[str],
     ----
     texts : List[str]
     threshold : float
+    simhash_distance : Optional[int]
+        语义去重前字面去重的 SimHash 汉明距离，默认 3；0 只去掉完全相同的文本，None 不做字面去重，结果与只做语义去重一致
+    method : str
+        cluster 社区聚类（O(n²)，适合几千条以内）；ann 近似最近邻索引，适合上万条
 
     返回
     ----
@@ -179,13 +396,138 @@ def deduplicate_chinese_texts(texts: List[str],
     if not texts:
         return []
 
-    model = _get_model()
-    embs = model.encode(texts, convert_to_tensor=True, show_progress_bar=False)
+    return [texts[i] for i in _dedup_keep_indices(texts, threshold, simhash_distance, method)]
 
-    clusters = util.community_detection(embs, threshold=threshold, min_community_size=2)
-    keep_indices = set()
-    for c in clusters:
-        keep_indices.add(c[0])
-    keep_indices.update(set(range(len(texts))) - {i for c in clusters for i in c})
 
-    return [texts[i] for i in sorted(keep_indices)]
+class IncrementalDeduplicator:
+    """
+    增量语义去重索引，适用于轮询抓取的场景：每次只把新到的文本与最近保留的 window_size 条文本比较，
+    不再对整批文本重新做 O(n²) 的聚类。与已有文本或同批中更早的文本相似度达到阈值的视为重复（保留第一条）。
+    """
+
+    def __init__(self, threshold: float = 0.8, window_size: int = 2000):
+        self.threshold = threshold
+        self.window_size = window_size
+        # 环形缓冲区保存最近保留文本的向量
+        self._window: Optional[np.ndarray] = None
+        self._count = 0
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _append(self, emb: np.ndarray) -> None:
+        if self._window is None:
+            self._window = np.zeros((self.window_size, emb.shape[0]), dtype=np.float32)
+        self._window[self._pos] = emb
+        self._pos = (self._pos + 1) % self.window_size
+        self._count = min(self._count + 1, self.window_size)
+
+    def add(self, texts: List[str]) -> List[bool]:
+        """
+        把新文本加入索引
+
+        参数
+        ----
+        texts : List[str]
+
+        返回
+        ----
+        List[bool]
+            每条文本是否为新内容（非重复），新内容会加入窗口
+        """
+        if not texts:
+            return []
+        embs = encode_texts(texts)
+        is_new = []
+        for emb in embs:
+            if self._count and float((self._window[:self._count] @ emb).max()) >= self.threshold:
+                is_new.append(False)
+                continue
+            self._append(emb)
+            is_new.append(True)
+        return is_new
+
+    def filter(self, texts: List[str]) -> List[str]:
+        """返回新文本中不重复的部分，并加入索引"""
+        return [t for t, keep in zip(texts, self.add(texts)) if keep]
+
+    def filter_df(self, df: pd.DataFrame, text_col: str) -> pd.DataFrame:
+        """返回 DataFrame 中不重复的行（索引重置），并加入索引"""
+        if df.empty:
+            return df
+        mask = self.add(df[text_col].astype(str).tolist())
+        return df[mask].reset_index(drop=True)
+
+    def clear(self) -> None:
+        self._window = None
+        self._count = 0
+        self._pos = 0
+
+
+class AnnDeduplicator:
+    """
+    基于近似最近邻索引的语义去重，支持流式插入和持久化，适合一整天上万条新闻的去重。
+    新文本与索引中已有文本（以及同批中更早的文本）相似度达到阈值即视为重复，重复文本不加入索引（保留第一条）。
+    安装了 hnswlib 时使用 HNSW，否则使用 NumPy IVF 索引。
+    """
+
+    def __init__(self, threshold: float = 0.8, path: Optional[str] = None, backend: str = "auto"):
+        """
+        参数
+        ----
+        threshold : float
+            语义相似度阈值（0~1）
+        path : Optional[str]
+            索引在磁盘上的路径（不含扩展名），存在时自动加载
+        backend : str
+            auto、hnsw、ivf
+        """
+        self.threshold = threshold
+        self.path = path
+        self.backend = backend
+        self._index = load_vector_index(path) if path else None
+        if self._index is not None:
+            LOGGER.info(f"已加载去重索引 {path}，向量数 {len(self._index)}")
+
+    def __len__(self) -> int:
+        return len(self._index) if self._index is not None else 0
+
+    def add_embeddings(self, embs: np.ndarray) -> List[bool]:
+        """插入已归一化的向量，返回每条是否为新内容"""
+        if len(embs) == 0:
+            return []
+        if self._index is None:
+            self._index = create_vector_index(embs.shape[1], self.backend)
+        is_new = []
+        for emb in embs:
+            if self._index.search(emb, self.threshold, k=1):
+                is_new.append(False)
+                continue
+            self._index.add(emb[None, :])
+            is_new.append(True)
+        return is_new
+
+    def add(self, texts: List[str]) -> List[bool]:
+        """插入文本，返回每条是否为新内容"""
+        if not texts:
+            return []
+        return self.add_embeddings(encode_texts(texts))
+
+    def query(self, text: str, threshold: Optional[float] = None, k: int = 10) -> List[tuple]:
+        """查询与文本相似度不低于阈值的已有向量，返回 [(向量编号, 相似度)]，按相似度从高到低"""
+        if self._index is None:
+            return []
+        return self._index.search(encode_texts([text])[0], self.threshold if threshold is None else threshold, k)
+
+    def filter(self, texts: List[str]) -> List[str]:
+        """返回新文本中不重复的部分，并加入索引"""
+        return [t for t, keep in zip(texts, self.add(texts)) if keep]
+
+    def save(self, path: Optional[str] = None) -> None:
+        """保存索引到磁盘"""
+        path = path or self.path
+        if not path:
+            raise ValueError("没有指定索引保存路径")
+        if self._index is not None:
+            save_vector_index(self._index, path)
@@ -1,4 +1,4 @@
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 def extract_second_level_domain(url: str) -> str | None:
     """
@@ -64,4 +64,50 @@ def extract_second_level_domain(url: str) -> str | None:
     except Exception as e:
         # 捕获解析过程中的异常
         print(f"Error parsing URL '{url}': {e}")
-        return None
\ No newline at end of file
+        return None
+
+# 只用于统计来源、与页面内容无关的查询参数
+TRACKING_PARAMS = {
+    "spm", "from", "isappinstalled", "scene", "ascene", "clicktime", "enterid", "wfr", "chksm", "sessionid",
+    "exportkey", "pass_ticket", "share_token", "share_from", "sharetype", "share_source", "wxshare", "_wv",
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    把URL规范化为用作缓存键的形式：统一为 https、小写域名、去掉默认端口和锚点、
+    去掉统计来源用的查询参数并按名称排序、去掉路径末尾的斜杠。
+
+    只用于比较和缓存，规范化后的URL不一定能直接访问。
+
+    Example:
+        >>> canonicalize_url("HTTP://News.10jqka.com.cn/20250810/c670260043.shtml?utm_source=wx&b=2&a=1#top")
+        'https://news.10jqka.com.cn/20250810/c670260043.shtml?a=1&b=2'
+    """
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://', '//')):
+        url = '//' + url
+    try:
+        parsed = urlsplit(url)
+    except ValueError:
+        return url
+
+    try:
+        port = parsed.port
+    except ValueError:
+        # 端口不是合法数字（如 example.com:abc），保留原始的域名部分，只转成小写
+        netloc = parsed.netloc.lower()
+    else:
+        host = (parsed.hostname or "").lower()
+        netloc = f"{host}:{port}" if port not in (None, 80, 443) else host
+
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit(("https", netloc, path, urlencode(query), ""))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from fnewscrawler.core.cache_policy import cache_policy
+
+
+def test_cache_policy():
+    # 2025-08-11 是周一
+    cases = [
+        ("daily", datetime(2025, 8, 11, 10, 0), "20250811"),   # 盘中查询当天日线，缓存到16点
+        ("daily", datetime(2025, 8, 11, 16, 30), "20250811"),  # 刚过更新时间，上游可能还没入库，短 TTL
+        ("daily", datetime(2025, 8, 15, 19, 0), "20250815"),   # 周五收盘后，缓存到下周一16点
+        ("daily", datetime(2025, 8, 11, 10, 0), "20250801"),   # 纯历史区间，长期缓存
+        ("daily_qfq", datetime(2025, 8, 11, 10, 0), "20250801"),  # 前复权数据不按历史长期缓存
+        ("cyq", datetime(2025, 8, 11, 17, 0), "20250811"),     # 筹码数据18点更新
+        ("fund_rank", datetime(2025, 8, 11, 10, 0), None),     # 盘中资金流排名
+        ("fund_rank", datetime(2025, 8, 11, 20, 0), None),     # 收盘后资金流排名
+        ("trade_cal", datetime(2025, 8, 11, 10, 0), None),
+    ]
+    for dataset, moment, end_date in cases:
+        ttl = cache_policy.ttl(dataset, end_date, moment)
+        print(f"{dataset} {moment} end_date={end_date}: {ttl} 秒（{ttl / 3600:.2f} 小时）")
+
+    print(cache_policy.is_trading_session(datetime(2025, 10, 1, 10, 0)))  # 国庆休市，False
+    print(cache_policy.next_update_at("daily", datetime(2025, 9, 30, 17, 0)))  # 节后第一个交易日16点
+
+
+if __name__ == '__main__':
+    test_cache_policy()
@@ -0,0 +1,28 @@
+from fnewscrawler.core.content_extract import extract_main_content, get_learned_selector
+from fnewscrawler.core.context import context_manager
+from fnewscrawler.utils import extract_second_level_domain
+
+
+async def test_extract_main_content():
+    # 选择器映射中没有配置的站点
+    url = "https://www.cls.cn/detail/2123456"
+    context = await context_manager.get_context("common")
+    page = await context.new_page()
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+        body_length = len(await page.locator("body").inner_text())
+        result = await extract_main_content(page)
+        print(f"整页文本长度: {body_length}")
+        if result:
+            print(f"正文长度: {result['textLength']}，选择器: {result['selector']}，"
+                  f"链接密度: {result['linkDensity']:.2f}，置信度: {result['score']:.2f}")
+            print(result["text"][:300])
+        print(f"已学习的选择器: {get_learned_selector(extract_second_level_domain(url))}")
+    finally:
+        await page.close()
+        await context_manager.close_all()
+
+
+if __name__ == '__main__':
+    import asyncio
+    asyncio.run(test_extract_main_content())
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from fnewscrawler.core.browser import browser_manager
+from fnewscrawler.core.context import context_manager
+
+# 模拟一次突发的并发爬取请求数量
+CONCURRENCY = 50
+SITE_NAME = "stress_test"
+
+
+def count_creations():
+    """包装 _create_new_context，统计实际创建上下文的次数"""
+    counter = {"created": 0}
+    original = context_manager._create_new_context
+
+    async def wrapped(site_name):
+        counter["created"] += 1
+        return await original(site_name)
+
+    context_manager._create_new_context = wrapped
+    return counter
+
+
+async def burst(label: str):
+    start = time.perf_counter()
+    contexts = await asyncio.gather(*[context_manager.get_context(SITE_NAME) for _ in range(CONCURRENCY)])
+    cost = time.perf_counter() - start
+    print(f"{label}: {CONCURRENCY} 个并发请求耗时 {cost:.3f} 秒，得到 {len({id(c) for c in contexts})} 个不同的上下文")
+
+
+async def test_context_concurrency():
+    counter = count_creations()
+
+    # 冷启动：浏览器和上下文都不存在，所有请求同时到达
+    await burst("冷启动")
+    print(f"创建次数: {counter['created']}（期望为1）")
+
+    # 上下文失效后再次突发：只应关闭和重建一次
+    stale = context_manager._contexts[SITE_NAME]
+    original_health = context_manager._is_context_healthy
+
+    async def health(context):
+        return context is not stale and await original_health(context)
+
+    context_manager._is_context_healthy = health
+    counter["created"] = 0
+    await burst("上下文失效后")
+    print(f"创建次数: {counter['created']}（期望为1）")
+
+    # 热路径：上下文已存在
+    await burst("热路径")
+
+    print(await context_manager.get_context_stats())
+    await context_manager.close_all()
+    await browser_manager.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_context_concurrency())
@@ -0,0 +1,23 @@
+import time
+
+from fnewscrawler.core.crawl_failures import describe_failure, get_recent_failure, clear_failure
+from fnewscrawler.core.news_crawl import news_crawl_from_url
+
+
+async def test_negative_cache():
+    # 不存在的页面，第一次会真实访问并记录失败，第二次应直接返回
+    url = "https://www.cls.cn/detail/not-exist-000000"
+    clear_failure(url)
+    for i in range(2):
+        start = time.perf_counter()
+        _, content = await news_crawl_from_url(url)
+        print(f"第{i + 1}次耗时 {time.perf_counter() - start:.3f} 秒，内容长度 {len(content)}")
+        failure = get_recent_failure(url)
+        if failure:
+            print(failure)
+            print(describe_failure(failure))
+
+
+if __name__ == '__main__':
+    import asyncio
+    asyncio.run(test_negative_cache())
@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+from fnewscrawler.core.crawl_scheduler import PRIORITY_BATCH, crawl_priority, crawl_scheduler
+from fnewscrawler.core.news_crawl import news_crawl_from_url
+
+BATCH_URLS = [f"https://www.cls.cn/detail/{2100000 + i}" for i in range(30)]
+INTERACTIVE_URL = "http://news.10jqka.com.cn/20250810/c670260043.shtml"
+
+
+async def test_interactive_latency_under_batch_load():
+    # 先提交一批批量抓取，再发起一次交互式抓取，观察交互式请求的等待时间
+    with crawl_priority(PRIORITY_BATCH):
+        batch = asyncio.gather(*[news_crawl_from_url(url) for url in BATCH_URLS])
+    await asyncio.sleep(0.5)
+
+    start = time.perf_counter()
+    await news_crawl_from_url(INTERACTIVE_URL, "iwencai")
+    print(f"批量任务进行中，交互式抓取耗时 {time.perf_counter() - start:.2f} 秒")
+
+    await batch
+    print(crawl_scheduler.get_stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(test_interactive_latency_under_batch_load())
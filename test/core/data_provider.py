@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from fnewscrawler.core.data_provider import data_provider
+from fnewscrawler.spiders.akshare import ak_stock_news_em
+from fnewscrawler.spiders.tushare import stock_cyq_perf
+
+
+async def heartbeat(stop: asyncio.Event):
+    """统计调用期间事件循环的最大卡顿时间"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        max_lag = max(max_lag, time.perf_counter() - start - 0.05)
+    return max_lag
+
+
+async def test_data_provider():
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(heartbeat(stop))
+
+    start = time.perf_counter()
+    # 10 个相同的请求只会调用一次 akshare，另外并发调用 tushare
+    results = await asyncio.gather(
+        *[data_provider.akshare(ak_stock_news_em, "600519", "20250801") for _ in range(10)],
+        stock_cyq_perf("600519", "20250101", "20250801"),
+        return_exceptions=True,
+    )
+    print(f"耗时 {time.perf_counter() - start:.2f} 秒，结果类型 {[type(r).__name__ for r in results]}")
+
+    stop.set()
+    print(f"事件循环最大卡顿 {await lag_task * 1000:.1f} 毫秒")
+    print(data_provider.get_stats())
+    data_provider.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(test_data_provider())
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from fnewscrawler.core import context_manager
+from fnewscrawler.core.page_waits import get_latency_report, wait_for_row_count
+from fnewscrawler.spiders.eastmoney.dragon_tiger_details import eastmoney_stock_dragon_tiger_detail
+
+ROUNDS = 5
+ROW_SELECTOR = ".dataview-body table tbody tr"
+
+
+async def fixed_sleep(page):
+    # 优化前：固定等待1秒
+    await asyncio.sleep(1)
+
+
+async def event_driven_wait(page):
+    # 优化后：表格出现数据行后立即继续
+    await wait_for_row_count(page, ROW_SELECTOR)
+
+
+async def measure_table_wait(stock_code: str, wait) -> tuple:
+    """打开个股龙虎榜页面，统计从页面加载完成到表格可以提取的耗时和表格行数"""
+    context = await context_manager.get_context("eastmoney")
+    page = await context.new_page()
+    try:
+        await page.goto(f"https://data.eastmoney.com/stock/lhb/lcsb/{stock_code}.html")
+        await page.wait_for_load_state("domcontentloaded")
+        await page.reload()
+        await page.wait_for_load_state("domcontentloaded")
+
+        start = time.perf_counter()
+        await wait(page)
+        await page.locator(".dataview-body").wait_for(state="visible")
+        cost = time.perf_counter() - start
+        return cost, await page.locator(ROW_SELECTOR).count()
+    finally:
+        await page.close()
+
+
+async def test_page_waits_latency(stock_code="600519"):
+    # 交替执行两种等待方式，避免网络波动只影响其中一种
+    costs = {"fixed_sleep": [], "event_driven_wait": []}
+    for _ in range(ROUNDS):
+        for wait in (fixed_sleep, event_driven_wait):
+            cost, rows = await measure_table_wait(stock_code, wait)
+            costs[wait.__name__].append(cost)
+            print(f"{wait.__name__}: {cost:.2f} 秒，表格 {rows} 行")
+
+    before = sum(costs["fixed_sleep"]) / ROUNDS
+    after = sum(costs["event_driven_wait"]) / ROUNDS
+    print(f"平均等待耗时：优化前 {before:.2f} 秒，优化后 {after:.2f} 秒")
+
+    # 整个爬虫调用的耗时记录在耗时报告中
+    await eastmoney_stock_dragon_tiger_detail(stock_code)
+    print(get_latency_report())
+
+
+if __name__ == '__main__':
+    asyncio.run(test_page_waits_latency())
@@ -0,0 +1,41 @@
+import asyncio
+import time
+from datetime import datetime
+
+from fnewscrawler.core.browser import browser_manager
+from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.prefetch import BEIJING_TZ, CronRule, prefetch_scheduler
+from fnewscrawler.mcp.iwencai.news_info_list import iwencai_financial_quick_news
+
+
+def test_cron_rule():
+    rule = CronRule("*/2 9-11,13-14 * * 1-5")
+    # 2025-08-11 是周一
+    print(rule.matches(datetime(2025, 8, 11, 9, 30, tzinfo=BEIJING_TZ)))  # True
+    print(rule.matches(datetime(2025, 8, 11, 9, 31, tzinfo=BEIJING_TZ)))  # False
+    print(rule.matches(datetime(2025, 8, 11, 12, 0, tzinfo=BEIJING_TZ)))  # False
+    print(rule.matches(datetime(2025, 8, 10, 10, 0, tzinfo=BEIJING_TZ)))  # False，周日
+
+
+async def test_prefetch_snapshot():
+    prefetch_scheduler.register_default_jobs()
+    job = prefetch_scheduler._jobs["iwencai_financial_quick_news"]
+
+    # 执行一次预取：刷新列表快照并预取正文
+    start = time.perf_counter()
+    await prefetch_scheduler.run_job(job)
+    print(f"预取耗时 {time.perf_counter() - start:.2f} 秒")
+
+    # 工具调用直接命中快照
+    start = time.perf_counter()
+    result = await iwencai_financial_quick_news(1)
+    print(f"命中快照耗时 {(time.perf_counter() - start) * 1000:.1f} 毫秒，新闻数 {result['news_count']}")
+    print(prefetch_scheduler.get_stats())
+
+    await context_manager.close_all()
+    await browser_manager.close()
+
+
+if __name__ == '__main__':
+    test_cron_rule()
+    asyncio.run(test_prefetch_snapshot())
@@ -0,0 +1,56 @@
+import time
+from io import StringIO
+
+import pandas as pd
+
+from fnewscrawler.core import browser_manager, extract_table
+
+
+def build_table_html(row_count: int = 3000, col_count: int = 16) -> str:
+    """构造一个与东方财富资金流表格规模相近的表格，包含两级表头"""
+    top_header = "<tr><th rowspan='2'>序号</th><th rowspan='2'>代码</th>" + "".join(
+        f"<th colspan='2'>指标{i}</th>" for i in range((col_count - 2) // 2)) + "</tr>"
+    sub_header = "<tr>" + "<th>净额</th><th>净占比</th>" * ((col_count - 2) // 2) + "</tr>"
+    body = "".join(
+        "<tr>" + f"<td>{r + 1}</td><td>{r:06d}</td>" + "".join(
+            f"<td>{(r * c) % 997 / 7:.2f}亿</td><td>{(r + c) % 100 / 3:.2f}%</td>" for c in range((col_count - 2) // 2)
+        ) + "</tr>"
+        for r in range(row_count)
+    )
+    return f"<html><body><div class='dataview-body'><table><thead>{top_header}{sub_header}</thead><tbody>{body}</tbody></table></div></body></html>"
+
+
+async def test_extract_table_benchmark(rounds: int = 5):
+    html = build_table_html()
+    browser = await browser_manager.get_browser()
+    context = await browser.new_context()
+    page = await context.new_page()
+    try:
+        await page.set_content(html)
+        locator = page.locator(".dataview-body")
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            table_html = await locator.inner_html()
+            read_html_df = pd.read_html(StringIO(table_html))[0]
+        read_html_cost = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract_df = await extract_table(locator)
+        extract_cost = (time.perf_counter() - start) / rounds
+
+        assert read_html_df.shape == extract_df.shape
+        print(f"表格规模: {extract_df.shape}")
+        print(f"inner_html + read_html: {read_html_cost * 1000:.1f} ms/次")
+        print(f"extract_table:          {extract_cost * 1000:.1f} ms/次")
+        print(f"提速: {read_html_cost / extract_cost:.2f} 倍")
+    finally:
+        await page.close()
+        await context.close()
+        await browser_manager.close()
+
+
+if __name__ == '__main__':
+    import asyncio
+    asyncio.run(test_extract_table_benchmark())
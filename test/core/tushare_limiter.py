@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from fnewscrawler.core.tushare_data_provider import TushareDataProvider
+from fnewscrawler.core.tushare_limiter import tushare_batcher, tushare_limiter
+from fnewscrawler.spiders.tushare import stock_cyq_chips
+
+STOCK_CODES = ["000001.SZ", "600000.SH", "600519.SH", "000858.SZ", "300750.SZ"]
+
+
+async def test_batch_daily():
+    # 日期区间相同的多只股票并发请求（指标工具的用法），合并为一次 daily 调用
+    provider = TushareDataProvider()
+    start = time.perf_counter()
+    results = await asyncio.gather(*[provider.get_stock_daily_async(code, "20250701", "20250731")
+                                     for code in STOCK_CODES])
+    print(f"耗时 {time.perf_counter() - start:.2f} 秒，各股票记录数 {[len(df) for df in results]}")
+    print(tushare_batcher.get_stats())
+
+
+async def test_paginate_cyq_chips():
+    # cyq_chips 单次最多返回2000条，一个月的筹码分布会自动翻页
+    df = await stock_cyq_chips("600519", "20250701", "20250731")
+    print(f"筹码分布共 {len(df)} 条记录")
+    print(tushare_limiter.get_stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(test_batch_daily())
+    asyncio.run(test_paginate_cyq_chips())
@@ -0,0 +1,41 @@
+"""
+MCP 启动导入耗时报告
+
+用 python -X importtime 导入 fnewscrawler.mcp，统计总耗时、耗时最多的模块，
+并检查 akshare、tushare、talib、torch 等重依赖没有在启动时被导入
+"""
+import subprocess
+import sys
+
+HEAVY_MODULES = ["akshare", "tushare", "talib", "torch", "sentence_transformers", "crawl4ai"]
+
+
+def importtime_report(target: str = "fnewscrawler.mcp", top: int = 15):
+    code = f"import sys, {target}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    total_ms = sum(self_us for _, self_us, _ in rows) / 1000
+    print(f"导入 {target} 共 {len(rows)} 个模块，总耗时 {total_ms:.0f} ms")
+    print("累计耗时最多的顶层模块:")
+    for cumulative_us, _, name in sorted((r for r in rows if not r[2].startswith(" ")), reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    loaded_heavy = [m for m in result.stdout.strip().split(",") if m]
+    print(f"启动时已加载的重依赖: {loaded_heavy or '无'}")
+    return total_ms, loaded_heavy
+
+
+def test_mcp_startup_importtime():
+    _, loaded_heavy = importtime_report()
+    assert not loaded_heavy
+
+
+if __name__ == '__main__':
+    importtime_report()
@@ -0,0 +1,35 @@
+import time
+
+from fnewscrawler.spiders.eastmoney import get_industry_stock_funds_flow, eastmoney_dragon_tiger_detail
+from fnewscrawler.core.http_client import http_client_manager
+from fnewscrawler.spiders.eastmoney.api_client import eastmoney_api_client
+
+
+async def test_fetch_clist():
+    start = time.perf_counter()
+    rows = await eastmoney_api_client.fetch_clist({
+        "fs": "b:BK0459",
+        "fid": "f62",
+        "fields": "f12,f14,f2,f3,f62,f184",
+    })
+    print(f"电子元件个股资金流: {len(rows)} 条，耗时 {time.perf_counter() - start:.2f} 秒")
+    print(rows[:3])
+
+
+async def test_api_timing():
+    # 对比页面抓取的多秒耗时，接口模式应在1秒内返回
+    start = time.perf_counter()
+    info = await get_industry_stock_funds_flow("电子元件", "5day")
+    print(info[:500])
+    print(f"行业个股资金流耗时 {time.perf_counter() - start:.2f} 秒")
+
+    start = time.perf_counter()
+    info = await eastmoney_dragon_tiger_detail("3day", 2)
+    print(info[:500])
+    print(f"龙虎榜耗时 {time.perf_counter() - start:.2f} 秒")
+    await http_client_manager.close()
+
+
+if __name__ == '__main__':
+    import asyncio
+    asyncio.run(test_api_timing())
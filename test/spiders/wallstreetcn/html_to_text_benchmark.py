@@ -0,0 +1,62 @@
+"""
+华尔街见闻快讯 HTML 转文本微基准测试
+
+第一次运行时请求一次接口并把响应保存到本地，之后都在保存的响应上对比新旧实现的耗时
+"""
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+
+from fnewscrawler.spiders.wallstreetcn.news import extract_text_from_html, fetch_news_from_api, parse_api_response
+
+RECORDED_RESPONSE = Path(__file__).parent / "recorded_lives_response.json"
+
+
+def legacy_extract_text_from_html(html_content: str) -> str:
+    """优化前的实现，用于对比"""
+    text = re.sub(r'</?p>', '', html_content)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&amp;', '&')
+    text = text.replace('&quot;', '"')
+    return text
+
+
+async def load_recorded_response() -> dict:
+    if not RECORDED_RESPONSE.exists():
+        data = await fetch_news_from_api("global", 100)
+        RECORDED_RESPONSE.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return json.loads(RECORDED_RESPONSE.read_text(encoding="utf-8"))
+
+
+async def test_html_to_text_benchmark(rounds: int = 200):
+    data = await load_recorded_response()
+    contents = [item.get("content", "") for item in data.get("data", {}).get("items", [])]
+    print(f"快讯条数: {len(contents)}")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        legacy = [legacy_extract_text_from_html(c) for c in contents]
+    legacy_cost = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        current = [extract_text_from_html(c) for c in contents]
+    current_cost = (time.perf_counter() - start) / rounds
+
+    diff = sum(1 for a, b in zip(legacy, current) if a != b)
+    print(f"旧实现: {legacy_cost * 1000:.3f} ms/次，新实现: {current_cost * 1000:.3f} ms/次，提速 {legacy_cost / current_cost:.2f} 倍")
+    print(f"结果不一致条数: {diff}")
+
+    with_html = json.dumps(parse_api_response(data, "global", include_html=True), ensure_ascii=False)
+    without_html = json.dumps(parse_api_response(data, "global"), ensure_ascii=False)
+    print(f"返回数据大小: 含content_html {len(with_html.encode())} 字节，不含 {len(without_html.encode())} 字节")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_html_to_text_benchmark())
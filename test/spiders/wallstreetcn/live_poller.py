@@ -0,0 +1,33 @@
+"""
+华尔街见闻快讯增量轮询测试
+"""
+import asyncio
+import time
+
+from fnewscrawler.spiders.wallstreetcn.live_poller import wallstreetcn_live_poller
+
+
+async def test_live_poller():
+    # 第一次查询会同步拉取一页并启动后台轮询
+    start = time.perf_counter()
+    news_list = await wallstreetcn_live_poller.latest("global", 10)
+    print(f"首次查询 {len(news_list)} 条，耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # 之后的查询直接从内存返回
+    start = time.perf_counter()
+    news_list = await wallstreetcn_live_poller.latest("global", 10)
+    print(f"内存查询 {len(news_list)} 条，耗时 {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    if news_list:
+        since_news = await wallstreetcn_live_poller.since("global", news_list[-1]["display_time"])
+        print(f"{news_list[-1]['time']} 之后的快讯 {len(since_news)} 条")
+
+    # 等待一次后台轮询，只拉取新增快讯
+    await asyncio.sleep(wallstreetcn_live_poller.interval + 2)
+    channel = wallstreetcn_live_poller.get_channel("global")
+    print(f"缓冲区 {len(channel.buffer)} 条，最新快讯 id={channel.newest_id}")
+    await wallstreetcn_live_poller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(test_live_poller())
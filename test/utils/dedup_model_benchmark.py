@@ -0,0 +1,65 @@
+"""
+去重模型推理方式对比：fp32 与 int8 动态量化 / ONNX 在 CPU 上的吞吐量和结果差异
+"""
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from fnewscrawler.utils.text_duplicate import load_model
+
+SAMPLE_NEWS = [
+    "央行今日开展1000亿元7天期逆回购操作，中标利率1.5%",
+    "央行开展1000亿元逆回购操作，利率维持1.5%不变",
+    "美联储宣布维持联邦基金利率目标区间不变",
+    "美联储按兵不动，利率区间保持不变",
+    "特斯拉第三季度交付量创历史新高",
+    "特斯拉Q3交付量超预期，创下新纪录",
+    "国际油价大幅下跌，布伦特原油跌超3%",
+    "沪指收涨0.5%，半导体板块领涨",
+    "A股三大指数集体收涨，芯片股表现强势",
+    "贵州茅台发布三季报，净利润同比增长15%",
+] * 50
+
+
+def test_import_time():
+    # 导入 fnewscrawler.utils 不应再加载 torch 和 sentence_transformers
+    code = "import time, sys; s = time.perf_counter(); import fnewscrawler.utils; " \
+           "print(f'{(time.perf_counter() - s) * 1000:.0f} ms', 'torch' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    print(f"导入 fnewscrawler.utils 耗时及是否加载torch: {result.stdout.strip()}")
+
+
+def encode(model, texts):
+    return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+
+
+def test_quantized_benchmark(modes=("fp32", "int8", "onnx")):
+    results = {}
+    for mode in modes:
+        start = time.perf_counter()
+        model = load_model(mode=mode)
+        load_cost = time.perf_counter() - start
+        encode(model, SAMPLE_NEWS[:10])
+        start = time.perf_counter()
+        embs = encode(model, SAMPLE_NEWS)
+        cost = time.perf_counter() - start
+        results[mode] = embs
+        print(f"{mode}: 加载 {load_cost:.2f} 秒，吞吐 {len(SAMPLE_NEWS) / cost:.0f} 条/秒")
+
+    base = results["fp32"]
+    base_pairs = base[:10] @ base[:10].T
+    for mode, embs in results.items():
+        if mode == "fp32":
+            continue
+        cos = np.sum(base * embs, axis=1)
+        pairs = embs[:10] @ embs[:10].T
+        print(f"{mode} 与 fp32 向量余弦相似度: 平均 {cos.mean():.4f}，最小 {cos.min():.4f}")
+        print(f"{mode} 两两相似度最大偏差: {np.abs(pairs - base_pairs).max():.4f}，"
+              f"阈值0.8下判定不一致的对数: {int(np.sum((pairs >= 0.8) != (base_pairs >= 0.8)))}")
+
+
+if __name__ == '__main__':
+    test_import_time()
+    test_quantized_benchmark()
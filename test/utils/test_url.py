@@ -1,4 +1,4 @@
-from fnewscrawler.utils import extract_second_level_domain
+from fnewscrawler.utils import extract_second_level_domain, canonicalize_url
 
 
 def test_1():
@@ -19,5 +19,21 @@ def test_1():
     print(
         f"'www.some-domain.com:8080/path?query': {extract_second_level_domain('www.some-domain.com:8080/path?query')}")
 
+
+def test_canonicalize_url():
+    # 统计参数、锚点、大小写、默认端口和末尾斜杠不影响缓存键
+    urls = [
+        "http://News.10jqka.com.cn/20250810/c670260043.shtml?utm_source=wx#comment",
+        "https://news.10jqka.com.cn:443/20250810/c670260043.shtml/",
+        "https://news.10jqka.com.cn/20250810/c670260043.shtml?spm=a.b.c",
+    ]
+    keys = {canonicalize_url(url) for url in urls}
+    print(keys)
+    assert len(keys) == 1
+
+    # 与内容相关的参数保留，并按名称排序
+    print(canonicalize_url("https://mp.weixin.qq.com/s?sn=abc&__biz=MzA&mid=1&idx=1&chksm=xx&scene=21"))
+
 if __name__ == '__main__':
     test_1()
+    test_canonicalize_url()
@@ -1,6 +1,8 @@
+import time
+
 import pandas as pd
 
-from fnewscrawler.utils import deduplicate_text_df, deduplicate_chinese_texts
+from fnewscrawler.utils import deduplicate_text_df, deduplicate_chinese_texts, IncrementalDeduplicator, AnnDeduplicator, encode_texts
 
 
 def test_deduplicate_text_df():
@@ -33,6 +35,58 @@ def test_deduplicate_chinese_texts():
         print(f"  • {t}")
 
 
+def test_embedding_cache():
+    texts = [f"第{i}条快讯：央行开展逆回购操作" for i in range(200)]
+    start = time.perf_counter()
+    encode_texts(texts)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    encode_texts(texts)
+    second = time.perf_counter() - start
+    print(f"首次编码 {first * 1000:.1f} ms，命中缓存 {second * 1000:.1f} ms")
+
+
+def test_incremental_deduplicator():
+    index = IncrementalDeduplicator(threshold=0.8, window_size=100)
+    first = index.filter(["苹果发布了新款iPhone手机！", "谷歌发布了Pixel 8手机"])
+    assert len(first) == 2
+    # 第二轮只与窗口中已有的文本比较
+    second = index.filter(["苹果 发布 了 新款 iPhone", "特斯拉发布了新款电动汽车"])
+    print(second)
+    assert "特斯拉发布了新款电动汽车" in second
+
+def test_simhash_prefilter_benchmark():
+    # 模拟转发稿：少量原文被多次转载，只在标点、来源前缀上有差异
+    base = [f"公司{i}公告：拟以不超过{i + 1}亿元回购股份，用于员工持股计划。" for i in range(300)]
+    texts = []
+    for i in range(10):
+        texts += [t if i % 2 == 0 else f"【财联社】{t.replace('，', ',')}" for t in base]
+
+    start = time.perf_counter()
+    semantic_only = deduplicate_chinese_texts(texts, simhash_distance=None)
+    semantic_cost = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with_prefilter = deduplicate_chinese_texts(texts)
+    prefilter_cost = time.perf_counter() - start
+
+    print(f"文本数 {len(texts)}，仅语义去重保留 {len(semantic_only)} 条，耗时 {semantic_cost:.2f} 秒")
+    print(f"SimHash预过滤后保留 {len(with_prefilter)} 条，耗时 {prefilter_cost:.2f} 秒")
+
+def test_ann_deduplicator(tmp_path="./data/test_news_dedup_index"):
+    texts = [f"第{i}家公司发布{2020 + i % 5}年度业绩预告，净利润同比增长{i % 97}%" for i in range(20000)]
+    start = time.perf_counter()
+    kept = deduplicate_chinese_texts(texts, method="ann")
+    print(f"ANN去重 {len(texts)} 条，保留 {len(kept)} 条，耗时 {time.perf_counter() - start:.2f} 秒")
+
+    # 持久化后重新加载，已经见过的文本会被判定为重复
+    index = AnnDeduplicator(threshold=0.8, path=tmp_path)
+    index.filter(["苹果发布了新款iPhone手机！", "特斯拉发布了新款电动汽车"])
+    index.save()
+    reloaded = AnnDeduplicator(threshold=0.8, path=tmp_path)
+    assert reloaded.filter(["苹果 发布 了 新款 iPhone"]) == []
+    print(reloaded.query("特斯拉发布新款电动车"))
+
 
 if __name__ == '__main__':
     # test_deduplicate_chinese_texts()
@@ -13,6 +13,7 @@ from pydantic import BaseModel
 
 from fnewscrawler.mcp.mcp_manager import MCPManager
 from fnewscrawler.spiders.akshare import ak_super_fun
+from fnewscrawler.core.data_provider import data_provider
 from fnewscrawler.utils.logger import LOGGER
 
 # 创建路由器
@@ -330,7 +331,9 @@ async def call_akshare_tool(fun_name: str, request: Request):
         else:
             ascending = True
 
-        result =  ak_super_fun(
+        # akshare 接口是阻塞调用，放到数据接口线程池中执行
+        result = await data_provider.akshare(
+            ak_super_fun,
             fun_name=fun_name,
             duplicate_key=duplicate_key,
             drop_columns=drop_columns,
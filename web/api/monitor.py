@@ -16,6 +16,10 @@ from datetime import datetime, timedelta
 
 from fnewscrawler.core.browser import BrowserManager
 from fnewscrawler.core.context import context_manager
+from fnewscrawler.core.crawl_scheduler import crawl_scheduler
+from fnewscrawler.core.prefetch import prefetch_scheduler
+from fnewscrawler.core.data_provider import data_provider
+from fnewscrawler.core.page_waits import get_latency_report
 from fnewscrawler.utils.logger import LOGGER
 
 # 创建路由器
@@ -237,6 +241,58 @@ async def get_context_stats():
             }
         )
 
+@router.get("/spider/latency")
+async def get_spider_latency():
+    """获取各页面爬虫的耗时统计（毫秒）"""
+    return ServiceStatusResponse(
+        success=True,
+        message="获取爬虫耗时统计成功",
+        data={
+            "timestamp": datetime.now().isoformat(),
+            "spiders": get_latency_report()
+        }
+    )
+
+@router.get("/crawl/queue")
+async def get_crawl_queue_stats():
+    """获取页面优先级调度的排队和等待统计"""
+    return ServiceStatusResponse(
+        success=True,
+        message="获取页面调度统计成功",
+        data={
+            "timestamp": datetime.now().isoformat(),
+            **crawl_scheduler.get_stats()
+        }
+    )
+
+@router.get("/crawl/prefetch")
+async def get_prefetch_stats():
+    """获取后台预取任务的执行情况和快照命中统计"""
+    return ServiceStatusResponse(
+        success=True,
+        message="获取预取统计成功",
+        data={
+            "timestamp": datetime.now().isoformat(),
+            **prefetch_scheduler.get_stats()
+        }
+    )
+
+@router.get("/data_provider")
+async def get_data_provider_stats():
+    """获取 Tushare、akshare 接口调用的并发、合并、超时统计，以及 Tushare 各接口的限流和合并请求统计"""
+    # 限流模块依赖 pandas，查询统计时才导入
+    from fnewscrawler.core.tushare_limiter import tushare_batcher, tushare_limiter
+    return ServiceStatusResponse(
+        success=True,
+        message="获取数据接口统计成功",
+        data={
+            "timestamp": datetime.now().isoformat(),
+            **data_provider.get_stats(),
+            "tushare_limits": tushare_limiter.get_stats(),
+            "tushare_batches": tushare_batcher.get_stats(),
+        }
+    )
+
 @router.post("/context/cleanup")
 async def context_cleanup():
     """清理过期上下文"""
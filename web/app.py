@@ -31,6 +31,20 @@ async def lifespan(app: FastAPI):
         mcp_manager = MCPManager()
         await mcp_manager.init_tools_status()
         LOGGER.info("MCP工具状态初始化完成")
+
+        # 在后台预先加载交易日历，缓存过期时间的计算不会在事件循环中同步请求Tushare
+        from fnewscrawler.core.cache_policy import cache_policy
+        cache_policy.calendar.refresh_in_background()
+
+        # 按需在后台预加载新闻去重模型
+        if os.getenv("DEDUP_MODEL_PRELOAD", "false").lower() == "true":
+            from fnewscrawler.utils.text_duplicate import preload_model_in_background
+            preload_model_in_background()
+
+        # 按需启动后台预取，定时刷新新闻列表快照并预取正文
+        if os.getenv("PREFETCH_ENABLED", "false").lower() == "true":
+            from fnewscrawler.core.prefetch import prefetch_scheduler
+            await prefetch_scheduler.start()
         
     except Exception as e:
         LOGGER.error(f"应用启动时发生错误: {e}")
@@ -41,10 +55,31 @@ async def lifespan(app: FastAPI):
     try:
         LOGGER.info("FNewsCrawler Web应用正在关闭")
 
-        # 清理浏览器资源
+        # 停止mcp工具状态订阅
+        await MCPManager().stop_status_listener()
+
+        # 先停止后台预取，避免关闭浏览器时仍有预取任务打开页面
+        from fnewscrawler.core.prefetch import prefetch_scheduler
+        await prefetch_scheduler.stop()
+
+        # 清理浏览器资源，先停止上下文的后台清理和健康探测任务
+        from fnewscrawler.core.context import context_manager
+        await context_manager.close_all()
         from fnewscrawler.core.browser import browser_manager
         await browser_manager.close()
 
+        # 停止华尔街见闻快讯后台轮询
+        from fnewscrawler.spiders.wallstreetcn.live_poller import wallstreetcn_live_poller
+        await wallstreetcn_live_poller.stop()
+
+        # 关闭共享的HTTP连接池
+        from fnewscrawler.core.http_client import http_client_manager
+        await http_client_manager.close()
+
+        # 关闭数据接口线程池
+        from fnewscrawler.core.data_provider import data_provider
+        data_provider.close()
+
         # 清理登录实例
         from web.api.login import login_instances
         for platform, instance in login_instances.items():